@@ -55,6 +55,8 @@ _PROTEIN_CHARS: frozenset[str] = frozenset(
     "ACDEFGHIKLMNPQRSTVWYBZX-*"
 )
 
+_WHITESPACE_RE = re.compile(r"\s")
+
 
 # ---------------------------------------------------------------------------
 # Return-type dataclasses
@@ -166,12 +168,16 @@ def _check_alphabet(
         ValueError: When any sequence exceeds the 10% out-of-alphabet
             threshold.
     """
-    ws_re = re.compile(r"\s")
+    # Deleting every allowed character (either case) with str.translate
+    # leaves exactly the out-of-alphabet ones, counted without a Python-level
+    # loop over each residue.
+    chars = "".join(allowed)
+    delete_allowed = str.maketrans("", "", chars + chars.lower())
     for seq_id, seq in sequences.items():
-        stripped = ws_re.sub("", seq)
+        stripped = _WHITESPACE_RE.sub("", seq)
         if not stripped:
             continue
-        out = sum(1 for ch in stripped if ch.upper() not in allowed)
+        out = len(stripped.translate(delete_allowed))
         fraction = out / len(stripped)
         if fraction > 0.10:
             raise ValueError(
@@ -2,10 +2,65 @@
 
 import json
 import os
+from html import escape
+from string import Template
 from typing import Any
 
 from .kb_ws_utils import KBWSUtils
 
+# DataTables page written by KBSDKUtils.build_dataframe_report. Parsed once
+# at import; ``$columns`` receives the JSON column spec, ``$data_source`` the
+# DataTables data option and ``$inline_data`` an optional embedded JSON block
+# (``$$`` is a literal jQuery ``$``).
+# Every CDN tag carries an SRI hash and crossorigin="anonymous"; a preload is
+# only reused by its script when both attributes match, so change them in
+# pairs. DataTables is the download-builder bundle, whose files are fixed
+# per version, so its hashes are stable. jQuery is the full build, not slim:
+# DataTables' "ajax" option, used for large tables, needs $.ajax.
+_DATAFRAME_REPORT_TEMPLATE = Template(
+    """
+<html>
+<head>
+    <link href="https://cdn.datatables.net/v/dt/dt-1.13.4/datatables.min.css" rel="stylesheet"
+          integrity="sha384-qEF0AcixeYh2NiiDV6za/uyrH6sQNFReqIhPfrNRX/E96PzczcftzS6mXwOa8XLo" crossorigin="anonymous">
+    <link rel="preload" href="https://code.jquery.com/jquery-3.6.0.min.js" as="script"
+          integrity="sha256-/xUj+3OJU5yExlq6GSYGSHk7tPXikynS7ogEvDej/m4=" crossorigin="anonymous">
+    <link rel="preload" href="https://cdn.datatables.net/v/dt/dt-1.13.4/datatables.min.js" as="script"
+          integrity="sha384-HZ2drwEwzxv89UF0fnS080W62cgIixgrWS/yPshuXYYtXxHExlNh7B0IzvA+9uhn" crossorigin="anonymous">
+</head>
+<body>
+<table id="example" class="display" style="width:100%"></table>
+$inline_data
+<script src="https://code.jquery.com/jquery-3.6.0.min.js" integrity="sha256-/xUj+3OJU5yExlq6GSYGSHk7tPXikynS7ogEvDej/m4=" crossorigin="anonymous" defer></script>
+<script type="text/javascript" src="https://cdn.datatables.net/v/dt/dt-1.13.4/datatables.min.js" integrity="sha384-HZ2drwEwzxv89UF0fnS080W62cgIixgrWS/yPshuXYYtXxHExlNh7B0IzvA+9uhn" crossorigin="anonymous" defer></script>
+<script>
+    // Deferred scripts run before DOMContentLoaded, so jQuery and
+    // DataTables are guaranteed to be loaded by the time this fires.
+    document.addEventListener("DOMContentLoaded", function() {
+        $$('#example').DataTable( {
+            $data_source,
+            "columns": $columns,
+            // Cell values are data, not markup: escape them on render.
+            "columnDefs": [
+                { "targets": "_all", "render": $$.fn.dataTable.render.text() }
+            ]
+        } );
+    } );
+</script>
+</body>
+</html>
+"""
+)
+
+_AJAX_DATA_SOURCE = '"ajax": { "url": "data.json", "dataSrc": "" }'
+_INLINE_DATA_SOURCE = (
+    '"data": JSON.parse(document.getElementById("tbl-data").textContent)'
+)
+
+# Tables whose JSON is smaller than this are embedded in index.html so the
+# report viewer needs no second request for data.json.
+_INLINE_DATA_LIMIT = 2_000_000
+
 
 class KBSDKUtils(KBWSUtils):
     """Utilities for working with KBase SDK environments and common SDK operations.
@@ -28,44 +83,40 @@ class KBSDKUtils(KBWSUtils):
         super().__init__(**kwargs)
 
     def build_dataframe_report(self, table, column_list):
-        # Convert columns to this format:
-        columns = []
-        for item in column_list:
-            columns.append({"data": item})
-        # for index, row in table.iterrows():
-        #    pass
-        json_str = table.to_json(orient="records")
-        # columns=column_list
-        html_data = (
-            """
-<html>
-<header>
-    <link href="https://cdn.datatables.net/1.11.5/css/jquery.dataTables.min.css" rel="stylesheet">
-</header>
-<body>
-<script src="https://code.jquery.com/jquery-3.6.0.slim.min.js" integrity="sha256-u7e5khyithlIdTpu22PHhENmPcRdFiHRjhAuHcs05RI=" crossorigin="anonymous"></script>
-<script type="text/javascript" src="https://cdn.datatables.net/1.11.5/js/jquery.dataTables.min.js"></script>
-<script>
-    $(document).ready(function() {
-        $('#example').DataTable( {
-            "ajax": {
-                "url": "data.json"
-            },
-            "columns": """
-            + json.dumps(columns, indent=4)
-            + """
-        } );
-    } );
-</script>
-</body>
-</html>
-"""
+        # Rows are written as plain arrays in column_list order, so each
+        # DataTables column reads its cell by position rather than by key.
+        columns = [
+            {"data": index, "title": escape(str(item))}
+            for index, item in enumerate(column_list)
+        ]
+        html_dir = os.path.join(self.working_dir, "html")
+        os.makedirs(html_dir, exist_ok=True)
+        # orient="values" skips repeating every column name in every row,
+        # which roughly halves the payload for numeric tables.
+        json_str = table.reindex(columns=column_list).to_json(
+            orient="values", force_ascii=False
+        )
+        if len(json_str) < _INLINE_DATA_LIMIT:
+            # "</" would close the <script> element early; "<\/" is the same
+            # string to JSON.parse.
+            inline_data = (
+                '<script id="tbl-data" type="application/json">'
+                + json_str.replace("</", "<\\/")
+                + "</script>"
+            )
+            data_source = _INLINE_DATA_SOURCE
+        else:
+            with open(os.path.join(html_dir, "data.json"), "w", encoding="utf-8") as f:
+                f.write(json_str)
+            inline_data = ""
+            data_source = _AJAX_DATA_SOURCE
+        html_data = _DATAFRAME_REPORT_TEMPLATE.substitute(
+            columns=json.dumps(columns, indent=4),
+            data_source=data_source,
+            inline_data=inline_data,
         )
-        os.makedirs(self.working_dir + "/html", exist_ok=True)
-        with open(self.working_dir + "/html/index.html", "w") as f:
+        with open(os.path.join(html_dir, "index.html"), "w", encoding="utf-8") as f:
             f.write(html_data)
-        with open(self.working_dir + "/html/data.json", "w") as f:
-            f.write(json_str)
 
 
 # ── Composition-based implementation ─────────────────────────────────────
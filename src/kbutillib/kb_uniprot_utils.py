@@ -5,13 +5,154 @@ to retrieve protein sequences, annotations, publications, cross-references,
 and UniRef cluster IDs.
 """
 
+import functools
+import gzip
+import json
+import os
+import re
+import threading
 import time
-from typing import Any, Dict, List, Optional, Set, Union
+import warnings
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .base_utils import BaseUtils
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Default fields fetched by get_annotations
+_ANNOTATION_FIELDS = [
+    "protein_name",
+    "gene_names",
+    "organism_name",
+    "cc_function",
+    "cc_catalytic_activity",
+    "ft_domain",
+    "ft_region",
+    "ft_site",
+    "keyword",
+    "go",
+    "ec"
+]
+
+# Fields holding the data parsed by get_publications and get_rhea_ids
+_PUBLICATION_FIELDS = ["lit_pubmed_id", "lit_doi_id", "cc_interaction"]
+_RHEA_FIELDS = ["cc_catalytic_activity", "xref_rhea"]
+
+# Citation cross-reference databases and the publication key they fill
+_CITATION_XREF_KEYS = {"PubMed": "pubmed_id", "DOI": "doi"}
+
+# Maximum number of UniProtKB responses kept in the per-instance LRU cache
+_ENTRY_CACHE_SIZE = 1024
+
+# ID mapping limits: IDs per job (the service caps jobs at 100k IDs),
+# concurrent jobs, and results per page
+_IDMAPPING_CHUNK_SIZE = 10_000
+_IDMAPPING_MAX_JOBS = 4
+_IDMAPPING_PAGE_SIZE = 500
+
+# ID mapping status polling: growth factor of the interval between polls
+# and its upper bound in seconds
+_POLL_BACKOFF = 1.5
+_MAX_POLL_INTERVAL = 4.0
+
+# Lifetime in seconds of responses in the optional on-disk HTTP cache
+_DISK_CACHE_EXPIRE_AFTER = 86400
+
+
+# Separators between values inside one UniProt TSV cell ("1ABC;2DEF;")
+_TSV_VALUE_SEP_RE = re.compile(r"[;\s]+")
+
+
+def _tsv_ids(raw: str) -> List[str]:
+    """Split the data rows of a single-column UniProt TSV response into IDs.
+
+    Args:
+        raw: TSV text including its header line
+
+    Returns:
+        Unique IDs in order of first appearance
+    """
+    ids = []
+    for line in raw.splitlines()[1:]:
+        ids.extend(_TSV_VALUE_SEP_RE.split(line))
+    return list(dict.fromkeys(value for value in ids if value))
+
+
+def _uniref_tsv_rows(content: bytes) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield (UniProt ID, UniRef cluster ID) pairs from a UniRef results page.
+
+    Args:
+        content: Body of a ``format=tsv`` results page, gzip-compressed or not
+
+    Yields:
+        One pair per mapped row, in page order
+    """
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    lines = content.decode("utf-8").splitlines()
+    if not lines:
+        return
+    header = lines[0].split("\t")
+    to_col = header.index("Cluster ID") if "Cluster ID" in header else 1
+    for line in lines[1:]:
+        cells = line.split("\t")
+        if cells[0] and len(cells) > to_col:
+            yield cells[0], cells[to_col] or None
+
+
+@functools.lru_cache(maxsize=256)
+def _join_fields(fields: tuple) -> str:
+    """Return the comma-joined ``fields`` query value for a field tuple."""
+    return ",".join(fields)
+
+
+def _decode_entry(body: Union[bytes, str], format: str) -> Dict[str, Any]:
+    """Build a UniProt entry from a cached response body.
+
+    JSON bodies are decoded with orjson when it is installed. Every call
+    returns a new object, so callers may mutate it freely.
+
+    Args:
+        body: Raw bytes of a JSON response, or the text of any other format
+        format: Response format the body was requested in
+
+    Returns:
+        The decoded entry, or ``{"raw_response": body}`` for non-JSON formats
+    """
+    if format != "json":
+        return {"raw_response": body}
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """Return the delay in seconds a response asks for via Retry-After.
+
+    Args:
+        response: HTTP response, or None
+
+    Returns:
+        The delay, or None when the header is absent or not in seconds
+    """
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
 
 class KBUniProtUtils(BaseUtils):
     """Utilities for retrieving protein information from UniProt.
@@ -28,12 +169,20 @@ class KBUniProtUtils(BaseUtils):
     def __init__(
         self,
         uniprot_api_url: str = "https://rest.uniprot.org",
+        verify_ssl: bool = True,
+        cache_dir: Optional[str] = None,
         **kwargs: Any
     ) -> None:
         """Initialize KBase UniProt utilities.
 
         Args:
             uniprot_api_url: Base URL for the UniProt REST API
+            verify_ssl: Whether to verify SSL certificates against the
+                certifi CA bundle (default: True)
+            cache_dir: Directory for a persistent on-disk HTTP response cache,
+                shared across runs (default: $KBUNIPROT_CACHE_DIR). Requires
+                the optional requests-cache package; without it, or when
+                unset, responses are only cached in memory.
             **kwargs: Additional keyword arguments passed to BaseUtils
         """
         super().__init__(**kwargs)
@@ -47,6 +196,83 @@ class KBUniProtUtils(BaseUtils):
             "Accept": "application/json"
         }
 
+        # One pooled session for all calls, so consecutive requests reuse the
+        # TCP/TLS connection; idempotent requests are retried with backoff on
+        # rate limiting and transient gateway errors
+        self.session = self._make_session(
+            cache_dir or os.environ.get("KBUNIPROT_CACHE_DIR")
+        )
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # requests verifies against certifi's CA bundle when verify is True
+        self.session.verify = verify_ssl
+
+        # Silence the per-request warning when verification is off, but only
+        # for the UniProt host: warnings about any other host still show.
+        # warnings.catch_warnings() around each request would swap the
+        # process-wide filter list, which is not safe with batch threads.
+        if not verify_ssl:
+            host = urllib3.util.parse_url(self.uniprot_api_url).host or ""
+            warnings.filterwarnings(
+                "ignore",
+                message=f"Unverified HTTPS request is being made to host '{re.escape(host)}'",
+                category=urllib3.exceptions.InsecureRequestWarning,
+            )
+
+        # Entries do not change at session timescales, so responses are
+        # memoized: an LRU of raw UniProtKB response bodies keyed by
+        # (uniprot_id, format, fields) and per-ID UniRef mappings keyed by
+        # (uniref_type, uniprot_id). Lookups already in flight are tracked as
+        # futures so concurrent callers asking for the same entry share one
+        # request. The lock guards all three for batch threads.
+        self._entry_cache: "OrderedDict[tuple, Union[bytes, str]]" = OrderedDict()
+        self._uniref_cache: Dict[tuple, Optional[str]] = {}
+        self._pending_entries: Dict[tuple, Future] = {}
+        self._cache_lock = threading.Lock()
+
+    def _make_session(self, cache_dir: Optional[str]) -> requests.Session:
+        """Create the HTTP session, backed by an on-disk cache if configured.
+
+        Args:
+            cache_dir: Directory for the SQLite response cache, or None
+
+        Returns:
+            A requests-cache CachedSession when cache_dir is set and
+            requests-cache is installed, else a plain requests.Session
+        """
+        if not cache_dir:
+            return requests.Session()
+        try:
+            from requests_cache import DO_NOT_CACHE, CachedSession
+        except ImportError:
+            self.log_warning(
+                "requests-cache is not installed; ignoring UniProt cache_dir "
+                f"{cache_dir}"
+            )
+            return requests.Session()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.log_info(f"Caching UniProt responses in {cache_dir}")
+        # Only GETs are cached; ID mapping job status changes while polling
+        return CachedSession(
+            cache_name=os.path.join(cache_dir, "uniprot_cache"),
+            backend="sqlite",
+            expire_after=_DISK_CACHE_EXPIRE_AFTER,
+            allowable_methods=("GET",),
+            urls_expire_after={"*/idmapping/status/*": DO_NOT_CACHE},
+            match_headers=["Accept"]
+        )
+
     def get_uniprot_entry(
         self,
         uniprot_id: str,
@@ -71,28 +297,84 @@ class KBUniProtUtils(BaseUtils):
         if not uniprot_id:
             raise ValueError("uniprot_id cannot be empty")
 
+        cache_key = (uniprot_id, format, tuple(sorted(fields or ())))
+        with self._cache_lock:
+            cached = self._entry_cache.get(cache_key)
+            if cached is not None:
+                self._entry_cache.move_to_end(cache_key)
+            else:
+                pending = self._pending_entries.get(cache_key)
+                if pending is None:
+                    future: Future = Future()
+                    self._pending_entries[cache_key] = future
+
+        # The cache holds immutable response bodies and each caller decodes
+        # its own entry, so mutating a result cannot change later lookups
+        if cached is not None:
+            return _decode_entry(cached, format)
+
+        # Another thread is already fetching this entry; share its outcome
+        if pending is not None:
+            return _decode_entry(pending.result(), format)
+
+        try:
+            body = self._fetch_uniprot_entry(uniprot_id, fields, format)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(body)
+            with self._cache_lock:
+                self._entry_cache[cache_key] = body
+                if len(self._entry_cache) > _ENTRY_CACHE_SIZE:
+                    self._entry_cache.popitem(last=False)
+            return _decode_entry(body, format)
+        finally:
+            with self._cache_lock:
+                self._pending_entries.pop(cache_key, None)
+
+    def _fetch_uniprot_entry(
+        self,
+        uniprot_id: str,
+        fields: Optional[List[str]],
+        format: str
+    ) -> Union[bytes, str]:
+        """Request a UniProt entry from the REST API, bypassing the cache.
+
+        Args:
+            uniprot_id: UniProt accession or ID
+            fields: List of field names to retrieve, or None for the defaults
+            format: Response format (json, tsv, fasta, etc.)
+
+        Returns:
+            The raw response bytes for JSON, else the response text; see
+            _decode_entry
+
+        Raises:
+            ValueError: If the entry does not exist
+            requests.RequestException: If API request fails
+        """
         self.log_info(f"Fetching UniProt entry for {uniprot_id}")
 
         url = f"{self.uniprotkb_endpoint}/{uniprot_id}"
         params = {"format": format}
 
         if fields:
-            params["fields"] = ",".join(fields)
+            params["fields"] = _join_fields(tuple(fields))
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 url,
                 params=params,
                 headers=self.headers,
-                timeout=30,
-                verify=False
+                timeout=30
             )
             response.raise_for_status()
 
             if format == "json":
-                return response.json()
+                return response.content
             else:
-                return {"raw_response": response.text}
+                return response.text
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -125,14 +407,13 @@ class KBUniProtUtils(BaseUtils):
         """
         self.log_info(f"Fetching protein sequence for {uniprot_id}")
 
+        # Both formats come from the compact FASTA response (also cached
+        # once for both); the raw sequence is its body without the header
+        result = self.get_uniprot_entry(uniprot_id, format="fasta")
+        fasta = result.get("raw_response", "")
         if format == "fasta":
-            result = self.get_uniprot_entry(uniprot_id, format="fasta")
-            return result.get("raw_response", "")
-        else:
-            # Get JSON entry and extract sequence
-            entry = self.get_uniprot_entry(uniprot_id, fields=["sequence"])
-            sequence = entry.get("sequence", {}).get("value", "")
-            return sequence
+            return fasta
+        return "".join(fasta.splitlines()[1:])
 
     def get_annotations(
         self,
@@ -159,19 +440,7 @@ class KBUniProtUtils(BaseUtils):
 
         # Default annotation fields if none specified
         if annotation_types is None:
-            annotation_types = [
-                "protein_name",
-                "gene_names",
-                "organism_name",
-                "cc_function",
-                "cc_catalytic_activity",
-                "ft_domain",
-                "ft_region",
-                "ft_site",
-                "keyword",
-                "go",
-                "ec"
-            ]
+            annotation_types = _ANNOTATION_FIELDS
 
         entry = self.get_uniprot_entry(uniprot_id, fields=annotation_types)
         return entry
@@ -194,20 +463,26 @@ class KBUniProtUtils(BaseUtils):
         """
         self.log_info(f"Fetching publications for {uniprot_id}")
 
-        fields = [
-            "lit_pubmed_id",
-            "lit_doi_id",
-            "cc_interaction"
-        ]
+        entry = self.get_uniprot_entry(uniprot_id, fields=_PUBLICATION_FIELDS)
+        return self._extract_publications(entry)
 
-        entry = self.get_uniprot_entry(uniprot_id, fields=fields)
+    def _extract_publications(self, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract publication references from a UniProt JSON entry.
 
+        Args:
+            entry: UniProt entry fetched with the publication fields
+
+        Returns:
+            List of publication dictionaries containing citation information
+        """
         # Extract references from the entry
         references = entry.get("references", [])
 
         publications = []
+        append = publications.append
+        xref_keys = _CITATION_XREF_KEYS
         for ref in references:
-            citation = ref.get("citation", {})
+            citation = ref.get("citation") or {}
             pub_info = {
                 "title": citation.get("title", ""),
                 "journal": citation.get("journal", ""),
@@ -217,13 +492,12 @@ class KBUniProtUtils(BaseUtils):
             }
 
             # Extract PubMed ID and DOI from citationCrossReferences
-            for xref in citation.get("citationCrossReferences", []):
-                if xref.get("database") == "PubMed":
-                    pub_info["pubmed_id"] = xref.get("id")
-                elif xref.get("database") == "DOI":
-                    pub_info["doi"] = xref.get("id")
+            for xref in citation.get("citationCrossReferences") or ():
+                key = xref_keys.get(xref.get("database"))
+                if key:
+                    pub_info[key] = xref.get("id")
 
-            publications.append(pub_info)
+            append(pub_info)
 
         return publications
 
@@ -245,11 +519,24 @@ class KBUniProtUtils(BaseUtils):
         """
         self.log_info(f"Fetching Rhea IDs for {uniprot_id}")
 
-        entry = self.get_uniprot_entry(
-            uniprot_id,
-            fields=["cc_catalytic_activity", "xref_rhea"]
-        )
+        # Same source as get_uniprot_info(include_rhea_ids=True), so both
+        # return the same Rhea IDs for an entry. The xref_rhea TSV column is
+        # smaller but is not guaranteed to match the catalytic activities.
+        entry = self.get_uniprot_entry(uniprot_id, fields=_RHEA_FIELDS)
+        unique_rhea_ids = self._extract_rhea_ids(entry)
+
+        self.log_info(f"Found {len(unique_rhea_ids)} Rhea IDs for {uniprot_id}")
+        return unique_rhea_ids
+
+    def _extract_rhea_ids(self, entry: Dict[str, Any]) -> List[str]:
+        """Extract unique Rhea reaction IDs from a UniProt JSON entry.
+
+        Args:
+            entry: UniProt entry fetched with the catalytic activity fields
 
+        Returns:
+            List of Rhea IDs, in order of first appearance
+        """
         rhea_ids = []
 
         # Extract from catalytic activity comments
@@ -262,15 +549,7 @@ class KBUniProtUtils(BaseUtils):
                     rhea_ids.append(rhea_id)
 
         # Remove duplicates while preserving order
-        seen = set()
-        unique_rhea_ids = []
-        for rhea_id in rhea_ids:
-            if rhea_id not in seen:
-                seen.add(rhea_id)
-                unique_rhea_ids.append(rhea_id)
-
-        self.log_info(f"Found {len(unique_rhea_ids)} Rhea IDs for {uniprot_id}")
-        return unique_rhea_ids
+        return list(dict.fromkeys(rhea_ids))
 
     def get_pdb_ids(
         self,
@@ -294,9 +573,33 @@ class KBUniProtUtils(BaseUtils):
         """
         self.log_info(f"Fetching PDB IDs for {uniprot_id}")
 
-        field = "xref_pdb_full" if full_info else "xref_pdb"
-        entry = self.get_uniprot_entry(uniprot_id, fields=[field])
+        if full_info:
+            entry = self.get_uniprot_entry(uniprot_id, fields=["xref_pdb_full"])
+            pdb_refs = self._extract_pdb_ids(entry, full_info)
+        else:
+            # IDs alone come from a compact one-column TSV
+            result = self.get_uniprot_entry(
+                uniprot_id, fields=["xref_pdb"], format="tsv"
+            )
+            pdb_refs = _tsv_ids(result.get("raw_response", ""))
 
+        self.log_info(f"Found {len(pdb_refs)} PDB entries for {uniprot_id}")
+        return pdb_refs
+
+    def _extract_pdb_ids(
+        self,
+        entry: Dict[str, Any],
+        full_info: bool = False
+    ) -> Union[List[str], List[Dict[str, Any]]]:
+        """Extract PDB cross-references from a UniProt JSON entry.
+
+        Args:
+            entry: UniProt entry fetched with a PDB cross-reference field
+            full_info: If True, include each structure's properties
+
+        Returns:
+            List of PDB IDs or list of dicts with full PDB information
+        """
         pdb_refs = []
 
         # Extract from uniProtKBCrossReferences
@@ -319,14 +622,13 @@ class KBUniProtUtils(BaseUtils):
                 else:
                     pdb_refs.append(xref.get("id"))
 
-        self.log_info(f"Found {len(pdb_refs)} PDB entries for {uniprot_id}")
         return pdb_refs
 
     def get_uniref_ids(
         self,
         uniprot_ids: Union[str, List[str]],
         uniref_type: str = "UniRef50",
-        poll_interval: float = 1.0,
+        poll_interval: float = 0.25,
         max_wait_time: float = 60.0
     ) -> Dict[str, Optional[str]]:
         """Map UniProt IDs to UniRef cluster IDs.
@@ -338,7 +640,9 @@ class KBUniProtUtils(BaseUtils):
         Args:
             uniprot_ids: Single UniProt ID or list of UniProt IDs
             uniref_type: Type of UniRef cluster (UniRef50, UniRef90, or UniRef100)
-            poll_interval: Time in seconds between polling attempts
+            poll_interval: Initial time in seconds between polling attempts;
+                grows 1.5x after each poll up to 4s unless the service sends
+                Retry-After
             max_wait_time: Maximum time in seconds to wait for results
 
         Returns:
@@ -363,10 +667,115 @@ class KBUniProtUtils(BaseUtils):
                 f"uniref_type must be one of {valid_types}, got: {uniref_type}"
             )
 
+        # Only IDs without a memoized mapping go to the ID mapping service
+        with self._cache_lock:
+            missing = [
+                uniprot_id for uniprot_id in dict.fromkeys(uniprot_ids)
+                if (uniref_type, uniprot_id) not in self._uniref_cache
+            ]
+
+        if missing:
+            mapping = self._run_uniref_mapping(
+                missing, uniref_type, poll_interval, max_wait_time
+            )
+            with self._cache_lock:
+                for uniprot_id, uniref_id in mapping.items():
+                    self._uniref_cache[(uniref_type, uniprot_id)] = uniref_id
+
+        with self._cache_lock:
+            return {
+                uniprot_id: self._uniref_cache.get((uniref_type, uniprot_id))
+                for uniprot_id in uniprot_ids
+            }
+
+    def _run_uniref_mapping(
+        self,
+        uniprot_ids: List[str],
+        uniref_type: str,
+        poll_interval: float,
+        max_wait_time: float
+    ) -> Dict[str, Optional[str]]:
+        """Map UniProt IDs to UniRef clusters through the ID mapping service.
+
+        IDs are split into chunks below the service's per-job cap and the
+        chunk jobs run concurrently.
+
+        Args:
+            uniprot_ids: UniProt IDs to map
+            uniref_type: Type of UniRef cluster (UniRef50, UniRef90, or UniRef100)
+            poll_interval: Time in seconds between polling attempts
+            max_wait_time: Maximum time in seconds to wait for each job
+
+        Returns:
+            Dict mapping every requested UniProt ID to its UniRef cluster ID
+            (None if no mapping found)
+
+        Raises:
+            requests.RequestException: If API request fails
+            TimeoutError: If a mapping job doesn't complete within max_wait_time
+        """
         self.log_info(
             f"Mapping {len(uniprot_ids)} UniProt IDs to {uniref_type} clusters"
         )
 
+        chunks = [
+            uniprot_ids[i:i + _IDMAPPING_CHUNK_SIZE]
+            for i in range(0, len(uniprot_ids), _IDMAPPING_CHUNK_SIZE)
+        ]
+
+        def map_chunk(chunk: List[str]) -> Dict[str, Optional[str]]:
+            return self._run_uniref_mapping_job(
+                chunk, uniref_type, poll_interval, max_wait_time
+            )
+
+        found: Dict[str, Optional[str]] = {}
+        if len(chunks) == 1:
+            found.update(map_chunk(chunks[0]))
+        else:
+            workers = min(_IDMAPPING_MAX_JOBS, len(chunks))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for chunk_mapping in executor.map(map_chunk, chunks):
+                    found.update(chunk_mapping)
+
+        # Ensure all requested IDs are in the result, even if unmapped,
+        # counting the mapped ones in the same pass
+        mapping: Dict[str, Optional[str]] = {}
+        mapped_count = 0
+        for uniprot_id in uniprot_ids:
+            uniref_id = found.get(uniprot_id)
+            mapping[uniprot_id] = uniref_id
+            if uniref_id:
+                mapped_count += 1
+
+        self.log_info(
+            f"Mapped {mapped_count} out of "
+            f"{len(uniprot_ids)} UniProt IDs to {uniref_type}"
+        )
+
+        return mapping
+
+    def _run_uniref_mapping_job(
+        self,
+        uniprot_ids: List[str],
+        uniref_type: str,
+        poll_interval: float,
+        max_wait_time: float
+    ) -> Dict[str, Optional[str]]:
+        """Submit one UniRef ID mapping job and collect all of its result pages.
+
+        Args:
+            uniprot_ids: UniProt IDs to map, at most one chunk
+            uniref_type: Type of UniRef cluster (UniRef50, UniRef90, or UniRef100)
+            poll_interval: Initial time in seconds between polling attempts
+            max_wait_time: Maximum time in seconds to wait for results
+
+        Returns:
+            Dict mapping the UniProt IDs that have a cluster to its ID
+
+        Raises:
+            requests.RequestException: If API request fails
+            TimeoutError: If mapping job doesn't complete within max_wait_time
+        """
         # Step 1: Submit ID mapping job
         submit_url = f"{self.idmapping_endpoint}/run"
 
@@ -377,12 +786,11 @@ class KBUniProtUtils(BaseUtils):
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 submit_url,
                 data=payload,
                 headers=self.headers,
-                timeout=30,
-                verify=False
+                timeout=30
             )
             response.raise_for_status()
 
@@ -391,7 +799,7 @@ class KBUniProtUtils(BaseUtils):
 
             if not job_id:
                 raise ValueError(
-                    f"Expected 'jobId' in response, got: {job_data.keys()}"
+                    f"Expected 'jobId' in response, got: {repr(job_data)[:200]}"
                 )
 
             self.log_info(f"ID mapping job submitted with job_id: {job_id}")
@@ -400,87 +808,113 @@ class KBUniProtUtils(BaseUtils):
             self.log_error(f"ID mapping job submission failed: {str(e)}")
             raise
 
-        # Step 2: Poll for results
-        results_url = f"{self.idmapping_endpoint}/status/{job_id}"
+        # Step 2: Poll until the job is finished. The interval grows
+        # geometrically between polls (capped), and a Retry-After from the
+        # service, e.g. on 429, takes precedence. Polls are conditional on
+        # the last ETag so an unchanged status can come back as a bare 304.
+        status_url = f"{self.idmapping_endpoint}/status/{job_id}"
         elapsed_time = 0.0
+        delay = poll_interval
+        etag: Optional[str] = None
 
         self.log_info(
             f"Polling for ID mapping results (interval: {poll_interval}s, "
             f"max_wait: {max_wait_time}s)"
         )
 
-        while elapsed_time < max_wait_time:
-            time.sleep(poll_interval)
-            elapsed_time += poll_interval
+        while True:
+            if elapsed_time >= max_wait_time:
+                raise TimeoutError(
+                    f"ID mapping job {job_id} did not complete within {max_wait_time}s"
+                )
+            delay = min(delay, max_wait_time - elapsed_time)
+            time.sleep(delay)
+            elapsed_time += delay
+            retry_after = None
 
             try:
-                status_response = requests.get(
-                    results_url,
-                    headers=self.headers,
+                # A finished job redirects to its results; stop at the
+                # redirect and fetch the paginated UniRef results instead
+                status_response = self.session.get(
+                    status_url,
+                    headers=(
+                        {**self.headers, "If-None-Match": etag}
+                        if etag else self.headers
+                    ),
                     timeout=30,
-                    verify=False
+                    allow_redirects=False
                 )
 
-                # Job is complete when we get redirected to results
                 if status_response.status_code == 303:
-                    # Follow redirect to get results
-                    results_location = status_response.headers.get("Location")
-                    if not results_location:
-                        raise RuntimeError("No Location header in redirect response")
-
-                    # Fetch the actual results
-                    results_response = requests.get(
-                        results_location,
-                        headers=self.headers,
-                        timeout=30,
-                        verify=False
-                    )
-                    results_response.raise_for_status()
-
-                    results_data = results_response.json()
-
-                    self.log_info(
-                        f"ID mapping completed successfully after {elapsed_time:.1f}s"
-                    )
-
-                    # Parse results into mapping dict
-                    mapping = {}
-                    for result in results_data.get("results", []):
-                        from_id = result.get("from")
-                        to_id = result.get("to", {}).get("id")
-                        if from_id:
-                            mapping[from_id] = to_id
-
-                    # Ensure all requested IDs are in the result, even if unmapped
-                    for uniprot_id in uniprot_ids:
-                        if uniprot_id not in mapping:
-                            mapping[uniprot_id] = None
-
-                    self.log_info(
-                        f"Mapped {len([v for v in mapping.values() if v])} out of "
-                        f"{len(uniprot_ids)} UniProt IDs to {uniref_type}"
-                    )
-
-                    return mapping
-
-                elif status_response.status_code == 200:
-                    # Job still running
-                    self.log_debug(
-                        f"Job still running after {elapsed_time:.1f}s"
-                    )
-                    continue
+                    break
 
+                if status_response.status_code == 304:
+                    # Status unchanged since the last poll
+                    job_status = "RUNNING"
                 else:
                     status_response.raise_for_status()
+                    etag = status_response.headers.get("ETag") or etag
+                    job_status = status_response.json().get("jobStatus")
+                if job_status in (None, "FINISHED"):
+                    break
+                if job_status in ("ERROR", "FAILURE"):
+                    raise RuntimeError(f"ID mapping job {job_id} failed: {job_status}")
+
+                # Job still running
+                self.log_debug(f"Job still running after {elapsed_time:.1f}s")
+                retry_after = _retry_after(status_response)
 
             except requests.exceptions.RequestException as e:
                 self.log_warning(f"Error polling for results: {str(e)}")
-                continue
+                retry_after = _retry_after(getattr(e, "response", None))
 
-        # Timeout reached
-        raise TimeoutError(
-            f"ID mapping job {job_id} did not complete within {max_wait_time}s"
-        )
+            if retry_after is not None:
+                delay = retry_after
+            else:
+                delay = min(delay * _POLL_BACKOFF, _MAX_POLL_INTERVAL)
+
+        self.log_info(f"ID mapping completed successfully after {elapsed_time:.1f}s")
+
+        # Step 3: Fetch results as gzipped two-column TSV pages, following
+        # the Link: rel="next" pages. The next page downloads in the
+        # background while the current one is parsed.
+        def fetch_page(
+            url: str, params: Optional[Dict[str, Any]]
+        ) -> requests.Response:
+            page = self.session.get(
+                url,
+                params=params,
+                headers=self.headers,
+                timeout=30
+            )
+            page.raise_for_status()
+            return page
+
+        mapping: Dict[str, Optional[str]] = {}
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending: Optional[Future] = prefetcher.submit(
+                fetch_page,
+                f"{self.idmapping_endpoint}/uniref/results/{job_id}",
+                {
+                    "format": "tsv",
+                    "fields": "id",
+                    "compressed": "true",
+                    "size": _IDMAPPING_PAGE_SIZE
+                }
+            )
+            while pending is not None:
+                results_response = pending.result()
+
+                # The next-page URL already carries the query parameters
+                next_url = results_response.links.get("next", {}).get("url")
+                pending = (
+                    prefetcher.submit(fetch_page, next_url, None) if next_url else None
+                )
+
+                for from_id, to_id in _uniref_tsv_rows(results_response.content):
+                    mapping[from_id] = to_id
+
+        return mapping
 
     def get_uniprot_info(
         self,
@@ -497,7 +931,10 @@ class KBUniProtUtils(BaseUtils):
         """Comprehensive method to fetch all requested information for a UniProt entry.
 
         This is a convenience method that fetches multiple types of information
-        in one call. Individual methods can be used for more fine-grained control.
+        in one call. All requested UniProtKB sections are retrieved with a
+        single request for the union of their fields and then split out, so
+        ``annotations`` and ``additional_data`` hold that combined entry.
+        Individual methods can be used for more fine-grained control.
 
         Args:
             uniprot_id: UniProt accession or ID
@@ -543,39 +980,47 @@ class KBUniProtUtils(BaseUtils):
             "additional_data": None
         }
 
-        try:
-            if include_sequence:
-                self.log_info("Fetching sequence...")
-                result["sequence"] = self.get_protein_sequence(uniprot_id, format="raw")
-
-            if include_annotations:
-                self.log_info("Fetching annotations...")
-                result["annotations"] = self.get_annotations(uniprot_id)
-
-            if include_publications:
-                self.log_info("Fetching publications...")
-                result["publications"] = self.get_publications(uniprot_id)
+        # Union of the fields every requested section needs
+        fields: List[str] = []
+        if include_sequence:
+            fields.append("sequence")
+        if include_annotations:
+            fields.extend(_ANNOTATION_FIELDS)
+        if include_publications:
+            fields.extend(_PUBLICATION_FIELDS)
+        if include_rhea_ids:
+            fields.extend(_RHEA_FIELDS)
+        if include_pdb_ids:
+            fields.append("xref_pdb")
+        if additional_fields:
+            fields.extend(additional_fields)
 
-            if include_rhea_ids:
-                self.log_info("Fetching Rhea IDs...")
-                result["rhea_ids"] = self.get_rhea_ids(uniprot_id)
+        try:
+            if fields:
+                self.log_info("Fetching UniProtKB entry...")
+                entry = self.get_uniprot_entry(
+                    uniprot_id,
+                    fields=list(dict.fromkeys(fields))
+                )
 
-            if include_pdb_ids:
-                self.log_info("Fetching PDB IDs...")
-                result["pdb_ids"] = self.get_pdb_ids(uniprot_id)
+                if include_sequence:
+                    result["sequence"] = entry.get("sequence", {}).get("value", "")
+                if include_annotations:
+                    result["annotations"] = entry
+                if include_publications:
+                    result["publications"] = self._extract_publications(entry)
+                if include_rhea_ids:
+                    result["rhea_ids"] = self._extract_rhea_ids(entry)
+                if include_pdb_ids:
+                    result["pdb_ids"] = self._extract_pdb_ids(entry)
+                if additional_fields:
+                    result["additional_data"] = entry
 
             if include_uniref_ids:
                 self.log_info(f"Fetching {uniref_type} cluster IDs...")
                 uniref_mapping = self.get_uniref_ids(uniprot_id, uniref_type=uniref_type)
                 result["uniref_ids"] = uniref_mapping.get(uniprot_id)
 
-            if additional_fields:
-                self.log_info("Fetching additional fields...")
-                result["additional_data"] = self.get_uniprot_entry(
-                    uniprot_id,
-                    fields=additional_fields
-                )
-
             self.log_info(f"Successfully fetched all requested information for {uniprot_id}")
             return result
 
@@ -586,15 +1031,21 @@ class KBUniProtUtils(BaseUtils):
     def get_batch_uniprot_info(
         self,
         uniprot_ids: List[str],
+        max_workers: int = 16,
         **kwargs: Any
     ) -> Dict[str, Dict[str, Any]]:
         """Fetch information for multiple UniProt entries.
 
         This method processes multiple UniProt IDs efficiently, using batch
-        operations where possible (e.g., for UniRef mapping).
+        operations where possible (e.g., for UniRef mapping). Entries are
+        fetched concurrently by a bounded pool of threads sharing the pooled
+        HTTP session, so their network round trips overlap, while the batch
+        UniRef mapping job runs alongside them on one extra thread.
+        Duplicate IDs are fetched once.
 
         Args:
             uniprot_ids: List of UniProt accessions or IDs
+            max_workers: Maximum number of entries fetched at once
             **kwargs: Arguments passed to get_uniprot_info for each entry
 
         Returns:
@@ -606,43 +1057,56 @@ class KBUniProtUtils(BaseUtils):
         if not uniprot_ids:
             raise ValueError("uniprot_ids cannot be empty")
 
+        # Results are keyed by ID, so repeated IDs only need one fetch
+        uniprot_ids = list(dict.fromkeys(uniprot_ids))
+
         self.log_info(f"Fetching information for {len(uniprot_ids)} UniProt entries")
 
         results = {}
 
-        # If UniRef IDs are requested, do batch mapping first
+        # If UniRef IDs are requested, they come from one batch mapping
         include_uniref = kwargs.get("include_uniref_ids", True)
         uniref_type = kwargs.get("uniref_type", "UniRef50")
 
-        uniref_mapping = {}
-        if include_uniref:
-            self.log_info(f"Performing batch {uniref_type} mapping...")
-            uniref_mapping = self.get_uniref_ids(uniprot_ids, uniref_type=uniref_type)
+        # Per-entry UniRef fetching is disabled since the batch mapping
+        # covers it; built once and only read by the workers
+        fetch_kwargs = {**kwargs, "include_uniref_ids": False}
 
-        # Fetch information for each entry
-        for uniprot_id in uniprot_ids:
+        def fetch(uniprot_id: str) -> Dict[str, Any]:
             try:
                 self.log_info(f"Processing {uniprot_id}...")
-
-                # Temporarily disable UniRef fetching since we already have it
-                fetch_kwargs = kwargs.copy()
-                fetch_kwargs["include_uniref_ids"] = False
-
-                entry_info = self.get_uniprot_info(uniprot_id, **fetch_kwargs)
-
-                # Add the pre-fetched UniRef ID
-                if include_uniref:
-                    entry_info["uniref_ids"] = uniref_mapping.get(uniprot_id)
-
-                results[uniprot_id] = entry_info
+                return self.get_uniprot_info(uniprot_id, **fetch_kwargs)
 
             except Exception as e:
                 self.log_error(f"Failed to fetch info for {uniprot_id}: {str(e)}")
-                results[uniprot_id] = {
+                return {
                     "error": str(e),
                     "uniprot_id": uniprot_id
                 }
 
+        # Fetch information for each entry; map() keeps input order
+        workers = max(1, min(max_workers, len(uniprot_ids)))
+        extra = 1 if include_uniref else 0
+        with ThreadPoolExecutor(max_workers=workers + extra) as executor:
+            uniref_future = None
+            if include_uniref:
+                self.log_info(f"Performing batch {uniref_type} mapping...")
+                uniref_future = executor.submit(
+                    self.get_uniref_ids, uniprot_ids, uniref_type=uniref_type
+                )
+
+            for uniprot_id, entry_info in zip(
+                uniprot_ids, executor.map(fetch, uniprot_ids)
+            ):
+                results[uniprot_id] = entry_info
+
+            # Add the batch-mapped UniRef IDs
+            if uniref_future is not None:
+                uniref_mapping = uniref_future.result()
+                for uniprot_id, entry_info in results.items():
+                    if "error" not in entry_info:
+                        entry_info["uniref_ids"] = uniref_mapping.get(uniprot_id)
+
         self.log_info(
             f"Successfully processed {len([r for r in results.values() if 'error' not in r])} "
             f"out of {len(uniprot_ids)} entries"
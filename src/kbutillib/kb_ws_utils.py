@@ -2,18 +2,20 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import os
+import random
 import re
-import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 from .installed_clients.AbstractHandleClient import AbstractHandle as HandleService
+from .installed_clients.baseclient import ServerError
 from .installed_clients.WorkspaceClient import Workspace
 from .kbase_endpoints import base_url as _base_url
 from .kbase_endpoints import env_from_url, service_url
@@ -21,6 +23,100 @@ from .shared_env_utils import SharedEnvUtils
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of objects requested per batched workspace call
+_WS_BATCH_SIZE = 1000
+
+# Workspace list_objects returns at most this many objects per page
+_WS_LIST_PAGE_SIZE = 5000
+
+# Maximum number of workspace id/name resolutions memoized by set_ws
+_WS_RESOLVE_CACHE_SIZE = 256
+
+# Bytes read and written per step when streaming a Shock download
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Client-side HTTP statuses that are still worth retrying
+_RETRYABLE_HTTP_STATUSES = frozenset({408, 429})
+
+# Workspace errors that retrying cannot fix: bad tokens and permissions
+_UNRECOVERABLE_WS_ERROR_RE = re.compile(
+    r"not authori[sz]ed|unauthori[sz]ed|may not (?:read|write)|"
+    r"(?:invalid|expired) token|token (?:is )?(?:invalid|expired)|login failed",
+    re.IGNORECASE,
+)
+
+
+def _is_unrecoverable(error: Exception) -> bool:
+    """Return True for failures a retry cannot fix (auth, permissions, 4xx)."""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return 400 <= status < 500 and status not in _RETRYABLE_HTTP_STATUSES
+    if isinstance(error, ServerError):
+        return _UNRECOVERABLE_WS_ERROR_RE.search(str(error)) is not None
+    return False
+
+
+def _call_with_retry(utils: Any, description: str, func: Any, *args: Any, **kwargs: Any) -> Any:
+    """Call ``func``, retrying recoverable failures with backoff and jitter.
+
+    Up to ``utils.max_retry`` attempts are made. The delay before retry
+    ``n`` (from 0) is ``retry_base_delay * 2**n`` stretched by a random
+    factor of up to ``1 + retry_jitter``, capped at ``retry_max_delay``, so
+    concurrent workers do not retry in lockstep. Auth/permission errors
+    and non-retryable 4xx responses are raised immediately.
+    """
+    tries = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            tries += 1
+            if _is_unrecoverable(e) or tries >= utils.max_retry:
+                utils.log_warning(f"{description} failed after {tries} tries: {e}")
+                raise
+            delay = min(
+                utils.retry_max_delay,
+                utils.retry_base_delay
+                * 2 ** (tries - 1)
+                * (1 + random.random() * utils.retry_jitter),
+            )
+            utils.log_warning(
+                f"{description} failed, retrying in {delay:.1f}s. Error: {e}"
+            )
+            time.sleep(delay)
+
+
+def _shock_get(
+    session: requests.Session, url: str, headers: Dict[str, str], stream: bool = False
+) -> requests.Response:
+    """GET a Shock URL, raising on statuses worth retrying (5xx, 408, 429)."""
+    r = session.get(url, headers=headers, stream=stream, allow_redirects=True)
+    if r.status_code >= 500 or r.status_code in _RETRYABLE_HTTP_STATUSES:
+        r.close()
+        r.raise_for_status()
+    return r
+
+
+def _shock_error(r: requests.Response) -> str:
+    """Return the error message from a failed Shock response.
+
+    Gateways can answer with an HTML page instead of Shock's JSON error
+    body, in which case the start of the raw text is returned.
+    """
+    try:
+        errors = r.json().get("error") or [r.text[:500]]
+        return str(errors[0])
+    except (ValueError, AttributeError):
+        return r.text[:500]
+
+
+def _make_http_session() -> requests.Session:
+    """Create the keep-alive session shared by Shock downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+    session.mount("https://", adapter)
+    return session
+
 
 class KBWSUtils(SharedEnvUtils):
     """Utilities for interacting with KBase (Department of Energy Systems Biology
@@ -36,6 +132,15 @@ class KBWSUtils(SharedEnvUtils):
     - Provenance tracking and logging
     """
 
+    # Backoff between retries of workspace and Shock calls (seconds)
+    retry_base_delay = 1.0
+    retry_max_delay = 30.0
+    retry_jitter = 0.5
+
+    # Backing fields for the lazily resolved ws_id/ws_name properties
+    _ws_id = None
+    _ws_name = None
+
     def __init__(
         self, kb_version: Optional[str] = "prod", max_retry: int = 3,  kbendpoint: Optional[str] = None, **kwargs: Any
     ) -> None:
@@ -50,15 +155,14 @@ class KBWSUtils(SharedEnvUtils):
         self.shock_url = service_url("shock", kb_version)
         self.hs_url = service_url("handle_service", kb_version)
         self.cached_to_obj_path = {}
-        self._ws_client = Workspace(
-            self.workspace_url, token=self.get_token(namespace="kbase")
-        )
+        token = self.get_token(namespace="kbase")
+        self._ws_client = Workspace(self.workspace_url, token=token)
         self.max_retry = max_retry
-        self.hs_client = HandleService(
-            self.hs_url, token=self.get_token(namespace="kbase")
-        )
+        self.hs_client = HandleService(self.hs_url, token=token)
+        self._http = _make_http_session()
         self.ws_id = None
         self.ws_name = None
+        self._ws_resolve_cache: Dict[Any, tuple] = {}
 
     def reset_attributes(self):
         """Resetting workspace elements related to a new method call."""
@@ -91,19 +195,68 @@ class KBWSUtils(SharedEnvUtils):
         """
         return self._ws_client
 
+    @property
+    def ws_id(self):
+        """ID of the current workspace, looked up on first use if set by name."""
+        if self._ws_id is None and self._ws_name is not None:
+            self._resolve_ws()
+        return self._ws_id
+
+    @ws_id.setter
+    def ws_id(self, value):
+        self._ws_id = value
+
+    @property
+    def ws_name(self):
+        """Name of the current workspace, looked up on first use if set by ID."""
+        if self._ws_name is None and self._ws_id is not None:
+            self._resolve_ws()
+        return self._ws_name
+
+    @ws_name.setter
+    def ws_name(self, value):
+        self._ws_name = value
+
     def set_ws(self, workspace):
-        if self.ws_id == workspace or self.ws_name == workspace:
+        """Make ``workspace`` (a name or numeric ID) the current workspace.
+
+        A name is resolved to its ID right away, so an unknown name fails
+        here. For a numeric ID only ``ws_name`` is deferred: it is fetched
+        on first access, and an unknown ID fails at that point instead.
+        """
+        if workspace in (self._ws_id, self._ws_name):
+            return
+        # Reuse an earlier id/name resolution instead of another RPC
+        cached = self._ws_resolve_cache.get(workspace)
+        if cached is not None:
+            self._ws_id, self._ws_name = cached
             return
-        if not isinstance(workspace, str) or re.search("^\\d+$", workspace) != None:
+        if not isinstance(workspace, str) or workspace.isdecimal():
             if isinstance(workspace, str):
                 workspace = int(workspace)
-            self.ws_id = workspace
-            info = self.ws_client().get_workspace_info({"id": workspace})
-            self.ws_name = info[1]
+            # Most callers only need the ID; ws_name looks the name up lazily
+            self._ws_id, self._ws_name = workspace, None
         else:
-            self.ws_name = workspace
-            info = self.ws_client().get_workspace_info({"workspace": workspace})
-            self.ws_id = info[0]
+            self._ws_id, self._ws_name = None, workspace
+            self._resolve_ws()
+
+    def _resolve_ws(self):
+        by_id = self._ws_id is not None
+        ident = {"id": self._ws_id} if by_id else {"workspace": self._ws_name}
+        info = _call_with_retry(
+            self, "Workspace get_workspace_info",
+            self.ws_client().get_workspace_info, ident,
+        )
+        if by_id:
+            self._ws_name = info[1]
+        else:
+            self._ws_id = info[0]
+        # Remember the pair under every form it may be requested by
+        resolved = (self._ws_id, self._ws_name)
+        for alias in (self._ws_id, str(self._ws_id), self._ws_name):
+            self._ws_resolve_cache[alias] = resolved
+        while len(self._ws_resolve_cache) > _WS_RESOLVE_CACHE_SIZE:
+            del self._ws_resolve_cache[next(iter(self._ws_resolve_cache))]
 
     def get_base_url_from_version(self, version):
         """Return the services base URL for a KBase environment.
@@ -117,43 +270,77 @@ class KBWSUtils(SharedEnvUtils):
             self.log_critical("Unknown workspace version: " + version)
             return _base_url("prod")
 
-    def download_blob_file(self, handle_id, file_path):
-        headers = {"Authorization": "OAuth " + self.get_token(namespace="kbase")}
+    def download_blob_file(self, handle_id, file_path, session=None):
         hs = self.hs_client
         handles = hs.hids_to_handles([handle_id])
-        shock_id = handles[0]["id"]
+        return self._download_handle(handles[0], file_path, session)
+
+    def download_blob_files(self, handle_ids, out_dir, workers=8):
+        """Download several handles into ``out_dir`` concurrently.
+
+        Handles are resolved with one handle service call and the files are
+        fetched by a thread pool over the shared keep-alive session. Each
+        file lands in ``out_dir/<handle_id>/<node file name>``, so handles
+        whose Shock nodes share a file name do not overwrite each other. A
+        failed download is logged and mapped to None without cancelling the
+        rest.
+
+        Returns:
+            Dict mapping each handle ID to its downloaded path, or None
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        handles = self.hs_client.hids_to_handles(list(handle_ids))
+        by_hid = {handle["hid"]: handle for handle in handles}
+
+        def download(handle_id):
+            try:
+                target = os.path.join(out_dir, str(handle_id))
+                os.makedirs(target, exist_ok=True)
+                return self._download_handle(by_hid[handle_id], target)
+            except Exception as e:
+                self.log_error(f"Failed to download handle {handle_id}: {e}")
+                return None
+
+        # A handle listed twice is fetched once
+        unique_ids = list(dict.fromkeys(handle_ids))
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return dict(zip(unique_ids, executor.map(download, unique_ids)))
+
+    def _download_handle(self, handle, file_path, session=None):
+        session = session or self._http
+        headers = {"Authorization": "OAuth " + self.get_token(namespace="kbase")}
+        shock_id = handle["id"]
         node_url = self.shock_url + "/node/" + shock_id
-        r = requests.get(node_url, headers=headers, allow_redirects=True)
+        r = _call_with_retry(
+            self, f"Shock node {shock_id} lookup", _shock_get, session, node_url, headers
+        )
         errtxt = ("Error downloading file from shock " + "node {}: ").format(shock_id)
         if not r.ok:
-            print(json.loads(r.content)["error"][0])
+            self.log_warning(f"Shock node {shock_id}: {_shock_error(r)}")
             return None
         resp_obj = r.json()
         size = resp_obj["data"]["file"]["size"]
         if not size:
-            print(f"Node {shock_id} has no file")
+            self.log_warning(f"Node {shock_id} has no file")
             return None
         node_file_name = resp_obj["data"]["file"]["name"]
         attributes = resp_obj["data"]["attributes"]
         # Making the directory if it doesn't exist
         dir = os.path.dirname(file_path)
-        os.makedirs(dir, exist_ok=True)
+        if dir:
+            os.makedirs(dir, exist_ok=True)
         # Adding filename to the end of the directory
         if os.path.isdir(file_path):
             file_path = os.path.join(file_path, node_file_name)
-        with open(file_path, "wb") as fhandle:
-            with requests.get(
-                node_url + "?download_raw",
-                stream=True,
-                headers=headers,
-                allow_redirects=True,
+        with open(file_path, "wb", buffering=_DOWNLOAD_CHUNK_SIZE) as fhandle:
+            with _call_with_retry(
+                self, f"Shock node {shock_id} download",
+                _shock_get, session, node_url + "?download_raw", headers, stream=True,
             ) as r:
                 if not r.ok:
-                    print(json.loads(r.content)["error"][0])
+                    self.log_warning(f"Shock node {shock_id}: {_shock_error(r)}")
                     return None
-                for chunk in r.iter_content(1024):
-                    if not chunk:
-                        break
+                for chunk in r.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
                     fhandle.write(chunk)
         return file_path
 
@@ -256,6 +443,8 @@ class KBWSUtils(SharedEnvUtils):
         self.obj_created.append(
             {"ref": self.create_ref(objid, self.ws_name), "description": ""}
         )
+        # Not retried: a save that times out after the server committed it
+        # would be written again as a duplicate version
         return self.ws_client().save_objects(params)
 
     def set_provenance(self,method="unknown",description=None,input_objects=[],params={},service="unknown",version=0):
@@ -291,54 +480,50 @@ class KBWSUtils(SharedEnvUtils):
             }
         ]
 
-    def list_ws_objects(self, wsid_or_ref, type=None, include_metadata=True):
-        """List objects in a workspace"""
-        ws_client = self.ws_client()
-        done = False
-        skip = 0
-        full_output = {}
-        start_after = None
-        while not done:
-            input = {}
-            if type:
-                input["type"] = type
-            if include_metadata:
-                input["includeMetadata"] = 1
-            else:
-                input["includeMetadata"] = 0
-            if isinstance(wsid_or_ref, int):
-                input["ids"] = [wsid_or_ref]
-                wsid_or_ref = str(wsid_or_ref)
-            else:
-                input["workspaces"] = [wsid_or_ref]
+    def iter_ws_objects(self, wsid_or_ref, type=None, include_metadata=True):
+        """Yield the object info of every object in a workspace, page by page.
 
-            if start_after:
-                input["startafter"] = start_after
+        Only one page of list_objects output is held at a time, so callers
+        that filter or stop early never materialize the full listing.
+        """
+        ws_client = self.ws_client()
+        input = {"includeMetadata": 1 if include_metadata else 0}
+        if type:
+            input["type"] = type
+        if isinstance(wsid_or_ref, int):
+            input["ids"] = [wsid_or_ref]
+        else:
+            input["workspaces"] = [wsid_or_ref]
+        ref_prefix = f"{wsid_or_ref}/"
+        while True:
             output = ws_client.list_objects(input)
-            # An empty page means the workspace has zero (matching)
-            # objects -- nothing to paginate from, so skip the start_after
-            # bookkeeping (latent bug: `output[-1]` used to IndexError on
-            # a bare/type-filtered-empty workspace).
-            if output:
-                start_after = wsid_or_ref + "/" + str(output[-1][0])
-                for item in output:
-                    full_output[item[1]] = item
-            if len(output) < 5000:
-                done = True
-        return full_output
+            yield from output
+            # A short (or empty) page is the last one
+            if len(output) < _WS_LIST_PAGE_SIZE:
+                return
+            input["startafter"] = ref_prefix + str(output[-1][0])
+
+    def list_ws_objects(self, wsid_or_ref, type=None, include_metadata=True):
+        """List objects in a workspace, keyed by object name"""
+        return {
+            item[1]: item
+            for item in self.iter_ws_objects(wsid_or_ref, type, include_metadata)
+        }
 
     def process_ws_ids(self, id_or_ref, workspace=None, no_ref=False):
         """IDs should always be processed through this function so we can interchangeably use
         refs, IDs, and names for workspaces and objects
         """
         objspec = {}
-        if len(id_or_ref.split(";")) > 1:
-            objspec["to_obj_ref_path"] = id_or_ref.split(";")[0:-1]
-            id_or_ref = id_or_ref.split(";")[-1]
-
-        if len(id_or_ref.split("/")) > 1:
+        path = id_or_ref.split(";")
+        if len(path) > 1:
+            objspec["to_obj_ref_path"] = path[:-1]
+            id_or_ref = path[-1]
+
+        # no_ref only needs the workspace and object segments
+        array = id_or_ref.split("/", 2)
+        if len(array) > 1:
             if no_ref:
-                array = id_or_ref.split("/")
                 workspace = array[0]
                 id_or_ref = array[1]
             else:
@@ -356,14 +541,45 @@ class KBWSUtils(SharedEnvUtils):
         return objspec
 
     def get_object_info(self, id_or_ref, ws=None):
-        ws_identities = [self.process_ws_ids(id_or_ref, ws)]
-        return self.ws_client().get_object_info(ws_identities, 1)[0]
+        return self.get_object_infos([id_or_ref], ws)[0]
+
+    def get_object_infos(self, ids_or_refs, ws=None):
+        """Fetch the info tuples of several objects in batched calls.
+
+        One workspace call is made per 1000 objects, so prefer this to
+        calling ``get_object_info`` in a loop.
+        """
+        infos = []
+        for start in range(0, len(ids_or_refs), _WS_BATCH_SIZE):
+            ws_identities = [
+                self.process_ws_ids(id_or_ref, ws)
+                for id_or_ref in ids_or_refs[start:start + _WS_BATCH_SIZE]
+            ]
+            infos.extend(self.ws_client().get_object_info(ws_identities, 1))
+        return infos
 
     def get_object(self, id_or_ref, ws=None):
-        res = self.ws_get_objects({"objects": [self.process_ws_ids(id_or_ref, ws)]})
-        if res is None:
+        objects = self.get_objects([id_or_ref], ws)
+        if not objects:
             return None
-        return res["data"][0]
+        return objects[0]
+
+    def get_objects(self, ids_or_refs, ws=None):
+        """Fetch several objects with batched get_objects2 calls.
+
+        One workspace call is made per 1000 objects, so prefer this to
+        calling ``get_object`` in a loop.
+        """
+        data = []
+        for start in range(0, len(ids_or_refs), _WS_BATCH_SIZE):
+            specs = [
+                self.process_ws_ids(id_or_ref, ws)
+                for id_or_ref in ids_or_refs[start:start + _WS_BATCH_SIZE]
+            ]
+            res = self.ws_get_objects({"objects": specs})
+            if res is not None:
+                data.extend(res["data"])
+        return data
 
     def ws_get_objects(self, args):
         """All functions calling get_objects2 should call this function to ensure they get the retry
@@ -371,29 +587,17 @@ class KBWSUtils(SharedEnvUtils):
         :param args:
         :return:
         """
-        tries = 0
-        while tries < self.max_retry:
-            try:
-                return self.ws_client().get_objects2(args)
-            except Exception as e:
-                self.log_warning(
-                    "Workspace get_objects2 call failed [%s:%s - %s]. Trying again! Error: %s"
-                    % (sys.exc_info()[0], sys.exc_info()[1], sys.exc_info()[2], str(e))
-                )
-                tries += 1
-                time.sleep(10)  # Give half second
-        self.log_warning(
-            "get_objects2 failed after multiple tries: %s" % sys.exc_info()[0]
+        return _call_with_retry(
+            self, "Workspace get_objects2", self.ws_client().get_objects2, args
         )
-        raise
 
     def wsinfo_to_ref(self, info):
-        return str(info[6]) + "/" + str(info[0]) + "/" + str(info[4])
+        return f"{info[6]}/{info[0]}/{info[4]}"
 
     def create_ref(self, id_or_ref, ws=None):
         if isinstance(id_or_ref, int):
             id_or_ref = str(id_or_ref)
-        if len(id_or_ref.split("/")) > 1:
+        if "/" in id_or_ref:
             return id_or_ref
         if isinstance(ws, int):
             ws = str(ws)
@@ -692,6 +896,15 @@ class KBWSUtilsImpl:
     All public methods are preserved from the legacy ``KBWSUtils``.
     """
 
+    # Backoff between retries of workspace and Shock calls (seconds)
+    retry_base_delay = 1.0
+    retry_max_delay = 30.0
+    retry_jitter = 0.5
+
+    # Backing fields for the lazily resolved ws_id/ws_name properties
+    _ws_id = None
+    _ws_name = None
+
     def __init__(
         self,
         env: SharedEnvUtils,
@@ -708,15 +921,14 @@ class KBWSUtilsImpl:
         self.shock_url = service_url("shock", kb_version)
         self.hs_url = service_url("handle_service", kb_version)
         self.cached_to_obj_path: Dict[str, Any] = {}
-        self._ws_client = Workspace(
-            self.workspace_url, token=env.get_token(namespace="kbase")
-        )
+        token = env.get_token(namespace="kbase")
+        self._ws_client = Workspace(self.workspace_url, token=token)
         self.max_retry = max_retry
-        self.hs_client = HandleService(
-            self.hs_url, token=env.get_token(namespace="kbase")
-        )
-        self.ws_id: Optional[int] = None
-        self.ws_name: Optional[str] = None
+        self.hs_client = HandleService(self.hs_url, token=token)
+        self._http = _make_http_session()
+        self.ws_id = None
+        self.ws_name = None
+        self._ws_resolve_cache: Dict[Any, tuple] = {}
         # Provenance state (from BaseUtils)
         self.obj_created: List[Any] = []
         self.input_objects: List[Any] = []
@@ -810,19 +1022,68 @@ class KBWSUtilsImpl:
     def ws_client(self) -> Workspace:
         return self._ws_client
 
+    @property
+    def ws_id(self) -> Optional[int]:
+        """ID of the current workspace, looked up on first use if set by name."""
+        if self._ws_id is None and self._ws_name is not None:
+            self._resolve_ws()
+        return self._ws_id
+
+    @ws_id.setter
+    def ws_id(self, value) -> None:
+        self._ws_id = value
+
+    @property
+    def ws_name(self) -> Optional[str]:
+        """Name of the current workspace, looked up on first use if set by ID."""
+        if self._ws_name is None and self._ws_id is not None:
+            self._resolve_ws()
+        return self._ws_name
+
+    @ws_name.setter
+    def ws_name(self, value) -> None:
+        self._ws_name = value
+
     def set_ws(self, workspace) -> None:
-        if self.ws_id == workspace or self.ws_name == workspace:
+        """Make ``workspace`` (a name or numeric ID) the current workspace.
+
+        A name is resolved to its ID right away, so an unknown name fails
+        here. For a numeric ID only ``ws_name`` is deferred: it is fetched
+        on first access, and an unknown ID fails at that point instead.
+        """
+        if workspace in (self._ws_id, self._ws_name):
+            return
+        # Reuse an earlier id/name resolution instead of another RPC
+        cached = self._ws_resolve_cache.get(workspace)
+        if cached is not None:
+            self._ws_id, self._ws_name = cached
             return
-        if not isinstance(workspace, str) or re.search(r"^\d+$", workspace) is not None:
+        if not isinstance(workspace, str) or workspace.isdecimal():
             if isinstance(workspace, str):
                 workspace = int(workspace)
-            self.ws_id = workspace
-            info = self.ws_client().get_workspace_info({"id": workspace})
-            self.ws_name = info[1]
+            # Most callers only need the ID; ws_name looks the name up lazily
+            self._ws_id, self._ws_name = workspace, None
         else:
-            self.ws_name = workspace
-            info = self.ws_client().get_workspace_info({"workspace": workspace})
-            self.ws_id = info[0]
+            self._ws_id, self._ws_name = None, workspace
+            self._resolve_ws()
+
+    def _resolve_ws(self) -> None:
+        by_id = self._ws_id is not None
+        ident = {"id": self._ws_id} if by_id else {"workspace": self._ws_name}
+        info = _call_with_retry(
+            self, "Workspace get_workspace_info",
+            self.ws_client().get_workspace_info, ident,
+        )
+        if by_id:
+            self._ws_name = info[1]
+        else:
+            self._ws_id = info[0]
+        # Remember the pair under every form it may be requested by
+        resolved = (self._ws_id, self._ws_name)
+        for alias in (self._ws_id, str(self._ws_id), self._ws_name):
+            self._ws_resolve_cache[alias] = resolved
+        while len(self._ws_resolve_cache) > _WS_RESOLVE_CACHE_SIZE:
+            del self._ws_resolve_cache[next(iter(self._ws_resolve_cache))]
 
     def get_base_url_from_version(self, version):
         try:
@@ -831,39 +1092,60 @@ class KBWSUtilsImpl:
             logger.critical("Unknown workspace version: " + version)
             return _base_url("prod")
 
-    def download_blob_file(self, handle_id, file_path):
+    def download_blob_file(self, handle_id, file_path, session=None):
+        handles = self.hs_client.hids_to_handles([handle_id])
+        return self._download_handle(handles[0], file_path, session)
+
+    def download_blob_files(self, handle_ids, out_dir, workers=8):
+        os.makedirs(out_dir, exist_ok=True)
+        handles = self.hs_client.hids_to_handles(list(handle_ids))
+        by_hid = {handle["hid"]: handle for handle in handles}
+
+        def download(handle_id):
+            try:
+                target = os.path.join(out_dir, str(handle_id))
+                os.makedirs(target, exist_ok=True)
+                return self._download_handle(by_hid[handle_id], target)
+            except Exception as e:
+                logger.error(f"Failed to download handle {handle_id}: {e}")
+                return None
+
+        # A handle listed twice is fetched once
+        unique_ids = list(dict.fromkeys(handle_ids))
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return dict(zip(unique_ids, executor.map(download, unique_ids)))
+
+    def _download_handle(self, handle, file_path, session=None):
+        session = session or self._http
         headers = {"Authorization": "OAuth " + self.get_token(namespace="kbase")}
-        hs = self.hs_client
-        handles = hs.hids_to_handles([handle_id])
-        shock_id = handles[0]["id"]
+        shock_id = handle["id"]
         node_url = self.shock_url + "/node/" + shock_id
-        r = requests.get(node_url, headers=headers, allow_redirects=True)
+        r = _call_with_retry(
+            self, f"Shock node {shock_id} lookup", _shock_get, session, node_url, headers
+        )
         if not r.ok:
-            print(json.loads(r.content)["error"][0])
+            self.log_warning(f"Shock node {shock_id}: {_shock_error(r)}")
             return None
         resp_obj = r.json()
         size = resp_obj["data"]["file"]["size"]
         if not size:
-            print(f"Node {shock_id} has no file")
+            self.log_warning(f"Node {shock_id} has no file")
             return None
         node_file_name = resp_obj["data"]["file"]["name"]
         dir = os.path.dirname(file_path)
-        os.makedirs(dir, exist_ok=True)
+        if dir:
+            os.makedirs(dir, exist_ok=True)
         if os.path.isdir(file_path):
             file_path = os.path.join(file_path, node_file_name)
-        with open(file_path, "wb") as fhandle:
-            with requests.get(
-                node_url + "?download_raw",
-                stream=True,
-                headers=headers,
-                allow_redirects=True,
+        with open(file_path, "wb", buffering=_DOWNLOAD_CHUNK_SIZE) as fhandle:
+            with _call_with_retry(
+                self, f"Shock node {shock_id} download",
+                _shock_get, session, node_url + "?download_raw", headers, stream=True,
             ) as r:
                 if not r.ok:
-                    print(json.loads(r.content)["error"][0])
+                    self.log_warning(f"Shock node {shock_id}: {_shock_error(r)}")
                     return None
-                for chunk in r.iter_content(1024):
-                    if not chunk:
-                        break
+                for chunk in r.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
                     fhandle.write(chunk)
         return file_path
 
@@ -941,6 +1223,8 @@ class KBWSUtilsImpl:
             "objects": [{"data": obj_json, "name": objid, "type": obj_type, "meta": {}, "provenance": prov_actions}],
         }
         self.obj_created.append({"ref": self.create_ref(objid, self.ws_name), "description": ""})
+        # Not retried: a save that times out after the server committed it
+        # would be written again as a duplicate version
         return self.ws_client().save_objects(params)
 
     def set_provenance(self, method="unknown", description=None, input_objects=[], params={}, service="unknown", version=0):
@@ -1148,44 +1432,46 @@ class KBWSUtilsImpl:
         # object_info tuple: [0]=objid, [4]=version
         return f"{latest_ref.split('/')[0]}/{info[0]}/{info[4]}"
 
-    def list_ws_objects(self, wsid_or_ref, type=None, include_metadata=True):
+    def iter_ws_objects(self, wsid_or_ref, type=None, include_metadata=True):
+        """Yield the object info of every object in a workspace, page by page.
+
+        Only one page of list_objects output is held at a time, so callers
+        that filter or stop early never materialize the full listing.
+        """
         ws_client = self.ws_client()
-        done = False
-        full_output = {}
-        start_after = None
-        while not done:
-            input = {}
-            if type:
-                input["type"] = type
-            input["includeMetadata"] = 1 if include_metadata else 0
-            if isinstance(wsid_or_ref, int):
-                input["ids"] = [wsid_or_ref]
-                wsid_or_ref = str(wsid_or_ref)
-            else:
-                input["workspaces"] = [wsid_or_ref]
-            if start_after:
-                input["startafter"] = start_after
+        input = {"includeMetadata": 1 if include_metadata else 0}
+        if type:
+            input["type"] = type
+        if isinstance(wsid_or_ref, int):
+            input["ids"] = [wsid_or_ref]
+        else:
+            input["workspaces"] = [wsid_or_ref]
+        ref_prefix = f"{wsid_or_ref}/"
+        while True:
             output = ws_client.list_objects(input)
-            # An empty page means the workspace has zero (matching)
-            # objects -- nothing to paginate from, so skip the start_after
-            # bookkeeping (latent bug: `output[-1]` used to IndexError on
-            # a bare/type-filtered-empty workspace).
-            if output:
-                start_after = wsid_or_ref + "/" + str(output[-1][0])
-                for item in output:
-                    full_output[item[1]] = item
-            if len(output) < 5000:
-                done = True
-        return full_output
+            yield from output
+            # A short (or empty) page is the last one
+            if len(output) < _WS_LIST_PAGE_SIZE:
+                return
+            input["startafter"] = ref_prefix + str(output[-1][0])
+
+    def list_ws_objects(self, wsid_or_ref, type=None, include_metadata=True):
+        return {
+            item[1]: item
+            for item in self.iter_ws_objects(wsid_or_ref, type, include_metadata)
+        }
 
     def process_ws_ids(self, id_or_ref, workspace=None, no_ref=False):
         objspec = {}
-        if len(id_or_ref.split(";")) > 1:
-            objspec["to_obj_ref_path"] = id_or_ref.split(";")[0:-1]
-            id_or_ref = id_or_ref.split(";")[-1]
-        if len(id_or_ref.split("/")) > 1:
+        path = id_or_ref.split(";")
+        if len(path) > 1:
+            objspec["to_obj_ref_path"] = path[:-1]
+            id_or_ref = path[-1]
+
+        # no_ref only needs the workspace and object segments
+        array = id_or_ref.split("/", 2)
+        if len(array) > 1:
             if no_ref:
-                array = id_or_ref.split("/")
                 workspace = array[0]
                 id_or_ref = array[1]
             else:
@@ -1202,37 +1488,58 @@ class KBWSUtilsImpl:
         return objspec
 
     def get_object_info(self, id_or_ref, ws=None):
-        ws_identities = [self.process_ws_ids(id_or_ref, ws)]
-        return self.ws_client().get_object_info(ws_identities, 1)[0]
+        return self.get_object_infos([id_or_ref], ws)[0]
+
+    def get_object_infos(self, ids_or_refs, ws=None):
+        """Fetch the info tuples of several objects in batched calls.
+
+        One workspace call is made per 1000 objects, so prefer this to
+        calling ``get_object_info`` in a loop.
+        """
+        infos = []
+        for start in range(0, len(ids_or_refs), _WS_BATCH_SIZE):
+            ws_identities = [
+                self.process_ws_ids(id_or_ref, ws)
+                for id_or_ref in ids_or_refs[start:start + _WS_BATCH_SIZE]
+            ]
+            infos.extend(self.ws_client().get_object_info(ws_identities, 1))
+        return infos
 
     def get_object(self, id_or_ref, ws=None):
-        res = self.ws_get_objects({"objects": [self.process_ws_ids(id_or_ref, ws)]})
-        if res is None:
+        objects = self.get_objects([id_or_ref], ws)
+        if not objects:
             return None
-        return res["data"][0]
+        return objects[0]
+
+    def get_objects(self, ids_or_refs, ws=None):
+        """Fetch several objects with batched get_objects2 calls.
+
+        One workspace call is made per 1000 objects, so prefer this to
+        calling ``get_object`` in a loop.
+        """
+        data = []
+        for start in range(0, len(ids_or_refs), _WS_BATCH_SIZE):
+            specs = [
+                self.process_ws_ids(id_or_ref, ws)
+                for id_or_ref in ids_or_refs[start:start + _WS_BATCH_SIZE]
+            ]
+            res = self.ws_get_objects({"objects": specs})
+            if res is not None:
+                data.extend(res["data"])
+        return data
 
     def ws_get_objects(self, args):
-        tries = 0
-        while tries < self.max_retry:
-            try:
-                return self.ws_client().get_objects2(args)
-            except Exception as e:
-                logger.warning(
-                    "Workspace get_objects2 call failed [%s:%s - %s]. Trying again! Error: %s",
-                    sys.exc_info()[0], sys.exc_info()[1], sys.exc_info()[2], str(e),
-                )
-                tries += 1
-                time.sleep(10)
-        logger.warning("get_objects2 failed after multiple tries: %s", sys.exc_info()[0])
-        raise
+        return _call_with_retry(
+            self, "Workspace get_objects2", self.ws_client().get_objects2, args
+        )
 
     def wsinfo_to_ref(self, info):
-        return str(info[6]) + "/" + str(info[0]) + "/" + str(info[4])
+        return f"{info[6]}/{info[0]}/{info[4]}"
 
     def create_ref(self, id_or_ref, ws=None):
         if isinstance(id_or_ref, int):
             id_or_ref = str(id_or_ref)
-        if len(id_or_ref.split("/")) > 1:
+        if "/" in id_or_ref:
             return id_or_ref
         if isinstance(ws, int):
             ws = str(ws)
@@ -4,16 +4,98 @@ This module provides utilities for using SKANI to compute genome distances
 and manage sketch databases for efficient genome comparison.
 """
 
+import functools
+import gzip
+import hashlib
 import json
 import os
+import re
+import shutil
 import subprocess
 import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
 
 from .shared_env_utils import SharedEnvUtils
 
+# FASTA files picked up by sketch_genome_directory; skani reads gzipped
+# FASTA directly, so the .gz forms are accepted too.
+_FASTA_EXTENSIONS = (".fasta", ".fa", ".fna", ".ffn", ".faa")
+_FASTA_SUFFIXES = _FASTA_EXTENSIONS + tuple(ext + ".gz" for ext in _FASTA_EXTENSIONS)
+
+# Bytes of skani output parsed per pyarrow block in _read_skani_table
+_SKANI_READ_BLOCK_SIZE = 16 << 20
+
+# skani's default FracMinHash screening threshold (percent ANI)
+_SKANI_DEFAULT_SCREEN = 80
+
+
+def _genome_id(filename: str) -> str:
+    """Return the genome ID for a FASTA filename.
+
+    Drops a trailing ``.gz`` and then the FASTA extension, so
+    ``GCF_1.fna.gz`` and ``GCF_1.fna`` both map to ``GCF_1``.
+    """
+    if filename.endswith(".gz"):
+        filename = filename[:-3]
+    return os.path.splitext(filename)[0]
+
+
+@functools.lru_cache(maxsize=8)
+def _detect_skani(
+    executable: str, resolved: Optional[str], mtime: Optional[float]
+) -> Optional[str]:
+    """Run ``skani --version`` once per executable and return the version.
+
+    ``resolved`` and ``mtime`` are only part of the cache key, so replacing
+    or reinstalling the binary triggers a fresh check. Returns None when
+    skani cannot be run.
+    """
+    try:
+        result = subprocess.run(
+            [executable, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def _unlink(path: str) -> Optional[OSError]:
+    """Unlink ``path``, returning the error instead of raising it.
+
+    A path that is already gone is not an error: another process may be
+    sweeping the same trash directory.
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return e
+    return None
+
+
+def _file_stem(path: str) -> str:
+    """Return the genome ID for a FASTA path, as ``_genome_id`` of its basename.
+
+    Uses plain string operations rather than ``Path``, since it runs once
+    per row of skani output.
+    """
+    return _genome_id(path[path.rfind("/") + 1:])
+
 
 class SKANIUtils(SharedEnvUtils):
     """Utilities for genome distance computation using SKANI.
@@ -55,6 +137,10 @@ class SKANIUtils(SharedEnvUtils):
 
         self.cache_file = Path(cache_file)
 
+        # Parsed genome lists keyed by sidecar path, with the (mtime, size)
+        # they were read at; see _load_genomes
+        self._genomes_cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+
         # Ensure cache file directory exists
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
 
@@ -64,36 +150,46 @@ class SKANIUtils(SharedEnvUtils):
 
         self.log_info(f"SKANI database cache: {self.cache_file}")
 
+        # Background deletions started by remove_database(delete_files=True),
+        # and the trash directories they are working on
+        self._delete_threads: List[threading.Thread] = []
+        self._deleting: Set[Path] = set()
+
         # Check if SKANI is available
         self._check_skani_availability()
 
-    def _check_skani_availability(self) -> bool:
+    def _check_skani_availability(self, refresh: bool = False) -> bool:
         """Check if SKANI tools are available in the system.
 
+        The ``skani --version`` probe is memoized per interpreter, keyed by
+        the resolved executable path and its mtime, so constructing many
+        instances forks skani only once.
+
+        Args:
+            refresh: Discard memoized results and probe skani again
+
         Returns:
             bool: True if SKANI is available, False otherwise
         """
+        if refresh:
+            _detect_skani.cache_clear()
+
+        resolved = shutil.which(self.skani_executable)
         try:
-            result = subprocess.run(
-                [self.skani_executable, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                self.skani_available = True
-                self.log_info(f"SKANI is available: {version} (executable: {self.skani_executable})")
-                return True
-            else:
-                self.skani_available = False
-                self._log_skani_installation_instructions()
-                return False
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            mtime = os.stat(resolved).st_mtime if resolved else None
+        except OSError:
+            mtime = None
+
+        version = _detect_skani(self.skani_executable, resolved, mtime)
+        if version is None:
             self.skani_available = False
             self._log_skani_installation_instructions()
             return False
 
+        self.skani_available = True
+        self.log_info(f"SKANI is available: {version} (executable: {self.skani_executable})")
+        return True
+
     def _log_skani_installation_instructions(self) -> None:
         """Log instructions for installing SKANI."""
         self.log_warning(
@@ -104,6 +200,120 @@ class SKANIUtils(SharedEnvUtils):
             f"  Or set 'skani.executable' in config.yaml to the full path"
         )
 
+    def _run_skani(
+        self, cmd: List[str], timeout: int
+    ) -> subprocess.CompletedProcess:
+        """Run one skani command, capturing only stderr.
+
+        For calls that write their results with ``-o``: stdout is discarded
+        instead of buffered.
+
+        Args:
+            cmd: Full command line, starting with the skani executable
+            timeout: Seconds before subprocess.TimeoutExpired is raised
+
+        Returns:
+            The completed process; ``stderr`` holds skani's diagnostics
+        """
+        return subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=timeout
+        )
+
+    def _run_skani_streaming(
+        self,
+        cmd: List[str],
+        timeout: int,
+        consume: Callable[[BinaryIO], Any]
+    ) -> Tuple[subprocess.CompletedProcess, Any]:
+        """Run one skani command that writes its results to stdout.
+
+        ``consume`` reads the stdout pipe while skani is still running, so
+        parsing overlaps with the search and nothing is staged on disk.
+        stderr goes to an anonymous temp file so a chatty skani cannot
+        block on a full pipe. A timer kills skani after ``timeout`` seconds.
+
+        Args:
+            cmd: Full command line, starting with the skani executable
+            timeout: Seconds before skani is killed
+            consume: Called with skani's stdout (a buffered binary stream)
+
+        Returns:
+            Tuple of (completed process with ``stderr`` text, value returned
+            by ``consume``). When skani fails, errors raised by ``consume``
+            on the partial output are dropped in favour of the return code.
+
+        Raises:
+            subprocess.TimeoutExpired: If skani ran longer than ``timeout``
+        """
+        timed_out = threading.Event()
+        value = None
+        consume_error = None
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=stderr_file
+            )
+
+            def kill() -> None:
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+            try:
+                try:
+                    value = consume(proc.stdout)
+                except Exception as e:
+                    consume_error = e
+                finally:
+                    proc.stdout.close()
+                    returncode = proc.wait()
+            finally:
+                timer.cancel()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout, stderr=stderr)
+        if consume_error is not None and returncode == 0:
+            raise consume_error
+        return subprocess.CompletedProcess(cmd, returncode, stderr=stderr), value
+
+    def _resolve_threads(self, threads: int) -> int:
+        """Return the thread count to pass to skani's ``-t``.
+
+        Args:
+            threads: Requested thread count; 0 or less means all CPUs
+
+        Returns:
+            A positive thread count
+        """
+        if threads and threads > 0:
+            return threads
+        return os.cpu_count() or 1
+
+    def _write_file_list(self, paths: List[Any]) -> str:
+        """Write paths one per line to a temp file for skani's list options.
+
+        Passing genomes through ``-l``/``--rl`` instead of argv keeps large
+        batches under the OS argument-length limit.
+
+        Args:
+            paths: FASTA paths (str or Path)
+
+        Returns:
+            Path of the temp file; the caller is responsible for deleting it
+        """
+        with tempfile.NamedTemporaryFile(
+            mode='w', suffix='.txt', delete=False
+        ) as f:
+            f.write("\n".join(str(path) for path in paths))
+            f.write("\n")
+            return f.name
+
     def _load_cache(self) -> Dict[str, Dict[str, Any]]:
         """Load the sketch database cache from JSON file.
 
@@ -127,15 +337,90 @@ class SKANIUtils(SharedEnvUtils):
             bool: True if successful, False otherwise
         """
         try:
+            # Entries written before genome lists moved to per-database
+            # sidecar files still carry them inline; split them out now
+            for db_info in cache.values():
+                if "genomes" in db_info and db_info.get("path") and (
+                    Path(db_info["path"]).is_dir()
+                ):
+                    db_info["genomes_file"] = self._save_genomes(
+                        db_info["path"], db_info.pop("genomes")
+                    )
+            # json.dumps with no indent runs on the C encoder; json.dump and
+            # any indent fall back to the pure-Python one
+            payload = json.dumps(cache, separators=(",", ":"))
             with open(self.cache_file, 'w') as f:
-                json.dump(cache, f, indent=2)
+                f.write(payload)
             return True
         except IOError as e:
             self.log_error(f"Failed to save cache file: {e}")
             return False
 
+    def _save_genomes(
+        self,
+        db_path: Union[str, Path],
+        genomes: List[Dict[str, Any]]
+    ) -> str:
+        """Write a database's genome list to ``<db_path>/genomes.json``.
+
+        Genome lists live beside each database rather than in the shared
+        cache file, so listing databases or looking one up never parses
+        them.
+
+        Args:
+            db_path: Database directory
+            genomes: Genome info dicts
+
+        Returns:
+            Path of the written file, for the cache entry's ``genomes_file``
+        """
+        genomes_file = str(Path(db_path) / "genomes.json")
+        payload = json.dumps(genomes, separators=(",", ":"))
+        with open(genomes_file, 'w') as f:
+            f.write(payload)
+        stat = os.stat(genomes_file)
+        self._genomes_cache[genomes_file] = (
+            (stat.st_mtime_ns, stat.st_size), genomes
+        )
+        return genomes_file
+
+    def _load_genomes(self, db_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return a database's genome list, reading its sidecar if needed.
+
+        Parsed sidecars are kept in memory and reused while the file's
+        mtime and size are unchanged, so repeated lookups skip the JSON
+        parse. The returned list is shared; callers must not modify it.
+
+        Args:
+            db_info: Cache entry for the database
+
+        Returns:
+            Genome info dicts; empty if none were recorded or the file is
+            unreadable
+        """
+        if "genomes" in db_info:
+            return db_info["genomes"]
+        genomes_file = db_info.get("genomes_file")
+        if not genomes_file:
+            return []
+        try:
+            stat = os.stat(genomes_file)
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = self._genomes_cache.get(genomes_file)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            with open(genomes_file, 'r') as f:
+                genomes = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            self.log_error(f"Failed to load genome list {genomes_file}: {e}")
+            return []
+        self._genomes_cache[genomes_file] = (key, genomes)
+        return genomes
+
     def _get_database_info(self, database_name: str) -> Optional[Dict[str, Any]]:
-        """Get information about a database from cache.
+        """Get summary information about a database from cache.
+
+        The genome list is not included; see _load_genomes.
 
         Args:
             database_name: Name of the database
@@ -154,7 +439,8 @@ class SKANIUtils(SharedEnvUtils):
         description: Optional[str] = None,
         marker: Optional[str] = None,
         force_rebuild: bool = False,
-        threads: int = 1
+        threads: int = 0,
+        fragment_size: Optional[int] = None
     ) -> Dict[str, Any]:
         """Create a SKANI sketch database from a directory of FASTA files.
 
@@ -165,8 +451,17 @@ class SKANIUtils(SharedEnvUtils):
                           If None, uses ~/.kbutillib/skani_sketches/<database_name>
             description: Optional description of this database
             marker: Marker mode for skani (e.g., --marker-compression)
-            force_rebuild: If True, rebuild even if database exists
-            threads: Number of threads to use for sketching
+            force_rebuild: If True, rebuild even if database exists. Without
+                          it, an existing database is only rebuilt when its
+                          genomes were added, removed or modified
+            threads: Number of threads to use for sketching (0 = all CPUs)
+            fragment_size: If set, split every genome into non-overlapping
+                          fragments of this many bp (10000 is typical) and
+                          sketch each fragment individually (skani -i). This
+                          finds local similarity that whole-genome ANI misses,
+                          e.g. for incomplete MAGs. Fragment FASTA files are
+                          kept under <database_path>/fragments; hits still
+                          report the source genome ID.
 
         Returns:
             Dict containing:
@@ -189,16 +484,17 @@ class SKANIUtils(SharedEnvUtils):
         if not fasta_dir.exists() or not fasta_dir.is_dir():
             raise ValueError(f"Directory not found: {fasta_directory}")
 
-        # Find all FASTA files
-        fasta_extensions = ["*.fasta", "*.fa", "*.fna", "*.ffn", "*.faa"]
-        fasta_files = []
-        for ext in fasta_extensions:
-            fasta_files.extend(fasta_dir.glob(ext))
+        # Find all FASTA files in one directory pass
+        with os.scandir(fasta_dir) as entries:
+            fasta_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.endswith(_FASTA_SUFFIXES) and entry.is_file()
+            )
 
         if not fasta_files:
             raise ValueError(
                 f"No FASTA files found in {fasta_directory}. "
-                f"Looking for extensions: {', '.join(fasta_extensions)}"
+                f"Looking for extensions: {', '.join(_FASTA_SUFFIXES)}"
             )
 
         self.log_info(f"Found {len(fasta_files)} FASTA files to sketch")
@@ -218,8 +514,12 @@ class SKANIUtils(SharedEnvUtils):
         sketch_db = db_path / "sketch_db"
 
         # Check if database exists in cache and force_rebuild is False
+        changed = []
         if database_name in cache and not force_rebuild:
             existing_info = cache[database_name]
+            existing_genomes = self._load_genomes(existing_info)
+            changed = self._changed_genomes(existing_genomes, fasta_files)
+        if database_name in cache and not force_rebuild and not changed:
             self.log_info(
                 f"Database '{database_name}' already exists with "
                 f"{existing_info.get('genome_count', 0)} genomes. "
@@ -230,37 +530,57 @@ class SKANIUtils(SharedEnvUtils):
                 "database_name": database_name,
                 "database_path": existing_info.get("path", str(db_path)),
                 "genome_count": existing_info.get("genome_count", 0),
-                "genomes": existing_info.get("genomes", []),
+                # Copies: the cached genome list must not be mutated
+                "genomes": [dict(genome) for genome in existing_genomes],
                 "rebuilt": False
             }
 
+        if changed:
+            self.log_info(
+                f"{len(changed)} genome(s) in '{database_name}' were added, "
+                f"removed or modified since it was sketched; rebuilding"
+            )
+
         # Build the skani sketch command
         cmd = [self.skani_executable, "sketch"]
 
-        # Add input files
-        for fasta_file in fasta_files:
-            cmd.append(str(fasta_file))
+        # Optionally sketch fixed-size fragments instead of whole genomes
+        sketch_inputs = fasta_files
+        if fragment_size:
+            fragment_dir = db_path / "fragments"
+            fragment_dir.mkdir(exist_ok=True)
+            sketch_inputs = []
+            for fasta_file in fasta_files:
+                fragment_file = fragment_dir / (_genome_id(fasta_file.name) + ".fna")
+                self._write_fragments(fasta_file, fragment_file, fragment_size)
+                sketch_inputs.append(fragment_file)
+            cmd.append("-i")
+            self.log_info(
+                f"Split {len(fasta_files)} genome(s) into {fragment_size} bp fragments"
+            )
+
+        # Add input files via a list file rather than argv
+        file_list = self._write_file_list(sketch_inputs)
+        cmd.extend(["-l", file_list])
 
         # Add output database
         cmd.extend(["-o", str(sketch_db)])
 
-        # Add threads if specified
-        if threads > 1:
-            cmd.extend(["-t", str(threads)])
+        # Add threads
+        threads = self._resolve_threads(threads)
+        cmd.extend(["-t", str(threads)])
 
         # Add marker compression if specified
         if marker:
             cmd.append(marker)
 
-        self.log_info(f"Creating sketch database: {' '.join(cmd[:5])}...")
+        self.log_info(
+            f"Creating sketch database with {threads} thread(s): "
+            f"{' '.join(cmd[:5])}..."
+        )
 
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 minute timeout
-            )
+            result = self._run_skani(cmd, timeout=600)  # 10 minute timeout
 
             if result.returncode != 0:
                 self.log_error(f"skani sketch failed: {result.stderr}")
@@ -272,28 +592,35 @@ class SKANIUtils(SharedEnvUtils):
 
             self.log_info("Sketch database created successfully")
 
-            # Create genome metadata
+            # Create genome metadata; every genome in a run shares one timestamp
+            now = datetime.now().isoformat()
             genomes = []
             for fasta_file in fasta_files:
+                filename = fasta_file.name
+                stat = fasta_file.stat()
                 genomes.append({
-                    "id": fasta_file.stem,
-                    "filename": fasta_file.name,
+                    "id": _genome_id(filename),
+                    "filename": filename,
                     "source_path": str(fasta_file.absolute()),
-                    "sketched_date": datetime.now().isoformat()
+                    "sketched_date": now,
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                    "md5": self._file_md5(fasta_file)
                 })
 
             # Create database entry for cache
             db_entry = {
                 "path": str(db_path),
                 "description": description or f"Sketch database from {fasta_directory}",
-                "created": datetime.now().isoformat(),
-                "updated": datetime.now().isoformat(),
+                "created": now,
+                "updated": now,
                 "genome_count": len(genomes),
                 "source_directory": str(fasta_dir.absolute()),
-                "genomes": genomes,
+                "genomes_file": self._save_genomes(db_path, genomes),
                 "metadata": {
                     "marker": marker,
-                    "threads": threads
+                    "threads": threads,
+                    "fragment_size": fragment_size
                 }
             }
 
@@ -306,7 +633,7 @@ class SKANIUtils(SharedEnvUtils):
                 "database_name": database_name,
                 "database_path": str(db_path),
                 "genome_count": len(genomes),
-                "genomes": genomes,
+                "genomes": [dict(genome) for genome in genomes],
                 "rebuilt": True
             }
 
@@ -324,6 +651,113 @@ class SKANIUtils(SharedEnvUtils):
                 "error": str(e),
                 "database_name": database_name
             }
+        finally:
+            try:
+                os.unlink(file_list)
+            except:
+                pass
+
+    def _file_md5(self, path: Union[str, Path]) -> str:
+        """Return the MD5 hex digest of a file, read in 64 KB blocks."""
+        digest = hashlib.md5()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _changed_genomes(
+        self,
+        recorded: List[Dict[str, Any]],
+        fasta_files: List[Path]
+    ) -> List[str]:
+        """List genomes that differ from what a database was sketched from.
+
+        A file is unchanged when its size and mtime match the recorded
+        values; if only the mtime moved, the MD5 decides. Databases without
+        recorded hashes (registered via add_skani_database, or sketched
+        before hashes were stored) are treated as unchanged so they are
+        never rebuilt implicitly.
+
+        Args:
+            recorded: The ``genomes`` list stored for the database
+            fasta_files: FASTA files currently in the source directory
+
+        Returns:
+            Source paths of added, removed or modified genomes
+        """
+        if not recorded or any("md5" not in genome for genome in recorded):
+            return []
+
+        recorded_by_path = {genome["source_path"]: genome for genome in recorded}
+        current = {str(fasta_file.absolute()) for fasta_file in fasta_files}
+        changed = sorted(recorded_by_path.keys() - current)
+        for path in sorted(current):
+            genome = recorded_by_path.get(path)
+            if genome is None:
+                changed.append(path)
+                continue
+            stat = os.stat(path)
+            if stat.st_size != genome["size"]:
+                changed.append(path)
+            elif stat.st_mtime != genome.get("mtime") and (
+                self._file_md5(path) != genome["md5"]
+            ):
+                changed.append(path)
+        return changed
+
+    def _write_fragments(
+        self,
+        fasta_file: Path,
+        output_file: Path,
+        fragment_size: int
+    ) -> int:
+        """Split each record of a FASTA file into fixed-size fragments.
+
+        Streams the input (plain or gzipped) and writes fragments as soon as
+        they fill, so memory stays at about one fragment regardless of
+        contig length. Fragments are named ``<record_id>_frag<start>-<end>``
+        (1-based, inclusive); a record's final fragment may be shorter.
+
+        Args:
+            fasta_file: Input FASTA (``.gz`` is decompressed on the fly)
+            output_file: Multi-FASTA to write the fragments to
+            fragment_size: Fragment length in bp
+
+        Returns:
+            Number of fragments written
+        """
+        opener = gzip.open if fasta_file.name.endswith(".gz") else open
+        count = 0
+        record_id = b"seq"
+        buffer = bytearray()
+        offset = 0
+
+        with opener(fasta_file, 'rb') as src, open(output_file, 'wb') as out:
+
+            def emit(length: int) -> None:
+                nonlocal count, offset
+                end = offset + length
+                out.write(b">%s_frag%d-%d\n" % (record_id, offset + 1, end))
+                out.write(buffer[:length])
+                out.write(b"\n")
+                del buffer[:length]
+                offset = end
+                count += 1
+
+            for line in src:
+                if line.startswith(b">"):
+                    if buffer:
+                        emit(len(buffer))
+                    fields = line[1:].split(None, 1)
+                    record_id = fields[0] if fields else b"seq"
+                    offset = 0
+                    continue
+                buffer += line.strip()
+                while len(buffer) >= fragment_size:
+                    emit(fragment_size)
+            if buffer:
+                emit(len(buffer))
+        return count
 
     def add_skani_database(
         self,
@@ -392,16 +826,24 @@ class SKANIUtils(SharedEnvUtils):
         database_name: str = "default",
         min_ani: float = 0.0,
         max_results: Optional[int] = None,
-        threads: int = 1
+        threads: int = 0,
+        fast: bool = False
     ) -> Dict[str, List[Dict[str, Any]]]:
         """Query genome(s) against a sketch database.
 
+        When ``min_ani`` is high enough, skani's FracMinHash screen (``-s``)
+        is set 10 points below it so pairs that cannot reach the threshold
+        are dropped before the expensive alignment step. skani's own
+        default screen (80) is never loosened.
+
         Args:
             query_fasta: Path to query FASTA file(s)
             database_name: Name of the sketch database to query against
             min_ani: Minimum ANI threshold (0.0-1.0)
             max_results: Maximum number of results per query (None = all)
-            threads: Number of threads to use
+            threads: Number of threads to use (0 = all CPUs)
+            fast: Pass ``--fast`` to skani for faster, less accurate ANI;
+                fine when only high-ANI (>95%) hits matter
 
         Returns:
             Dict mapping query IDs to lists of hit dictionaries:
@@ -427,7 +869,8 @@ class SKANIUtils(SharedEnvUtils):
                 "database_name": database_name,
                 "min_ani": min_ani,
                 "max_results": max_results,
-                "threads": threads
+                "threads": threads,
+                "fast": fast
             },
             print_params=True
         )
@@ -445,73 +888,67 @@ class SKANIUtils(SharedEnvUtils):
                 f"Create it first with sketch_genome_directory() or add it with add_skani_database()."
             )
 
-        db_path = Path(db_info["path"])
-        sketch_db = db_path
+        sketch_db = str(db_info["path"])
 
-        if not sketch_db.exists():
+        if not os.path.exists(sketch_db):
             raise ValueError(
                 f"Sketch database file not found: {sketch_db}. "
                 f"The database may have been moved or deleted."
             )
 
-        # Handle single file or list of files
-        if isinstance(query_fasta, str):
-            query_files = [Path(query_fasta)]
+        # Handle single file or list of files; paths stay plain strings
+        if isinstance(query_fasta, (str, os.PathLike)):
+            query_files = [os.fspath(query_fasta)]
         else:
-            query_files = [Path(f) for f in query_fasta]
+            query_files = [os.fspath(f) for f in query_fasta]
 
         # Validate query files exist
         for qfile in query_files:
-            if not qfile.exists():
+            if not os.path.exists(qfile):
                 raise ValueError(f"Query file not found: {qfile}")
 
-        # Create temporary output file
-        with tempfile.NamedTemporaryFile(
-            mode='w', suffix='.txt', delete=False
-        ) as f:
-            output_file = f.name
+        # Pass queries via a list file rather than argv
+        query_list = self._write_file_list(query_files)
 
         try:
             # Build skani search command
-            cmd = [self.skani_executable, "search"]
-
-            # Add query files
-            for qfile in query_files:
-                cmd.append(str(qfile))
+            cmd = [self.skani_executable, "search", "--ql", query_list]
 
             # Add database
-            cmd.extend(["-d", str(sketch_db)])
-
-            # Add output file
-            cmd.extend(["-o", output_file])
+            cmd.extend(["-d", sketch_db])
 
             # Add threads
-            if threads > 1:
-                cmd.extend(["-t", str(threads)])
+            threads = self._resolve_threads(threads)
+            cmd.extend(["-t", str(threads)])
+
+            # Prune in skani's screen rather than after full ANI
+            screen = min_ani * 100 - 10
+            if screen > _SKANI_DEFAULT_SCREEN:
+                cmd.extend(["-s", f"{screen:g}"])
+            if fast:
+                cmd.append("--fast")
 
             self.log_info(
                 f"Searching {len(query_files)} query genome(s) "
-                f"against database '{database_name}'"
+                f"against database '{database_name}' with {threads} thread(s)"
             )
 
-            result = subprocess.run(
+            # Without -o skani writes results to stdout; parse them straight
+            # off the pipe instead of round-tripping through a temp file.
+            result, results_by_query = self._run_skani_streaming(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
+                timeout=300,  # 5 minute timeout
+                consume=lambda stream: self._parse_skani_output(
+                    stream,
+                    min_ani=min_ani,
+                    max_results=max_results
+                )
             )
 
             if result.returncode != 0:
                 self.log_error(f"skani search failed: {result.stderr}")
                 raise RuntimeError(f"skani search failed: {result.stderr}")
 
-            # Parse results
-            results_by_query = self._parse_skani_output(
-                output_file,
-                min_ani=min_ani,
-                max_results=max_results
-            )
-
             self.log_info(
                 f"Search completed: found results for "
                 f"{len(results_by_query)} query genome(s)"
@@ -523,22 +960,81 @@ class SKANIUtils(SharedEnvUtils):
             self.log_error("skani search timed out after 5 minutes")
             raise RuntimeError("skani search timed out")
         finally:
-            # Clean up temporary file
-            try:
-                os.unlink(output_file)
-            except:
-                pass
+            if os.path.exists(query_list):
+                os.unlink(query_list)
+
+    def _read_skani_table(
+        self,
+        source: Union[str, BinaryIO],
+        min_ani: float = 0.0
+    ) -> Tuple[List[str], List[str], List[float], List[float], List[float]]:
+        """Read a skani search/dist table and drop rows below ``min_ani``.
+
+        Parsing, float conversion and the ANI filter run in pyarrow's C++
+        CSV reader and compute kernels rather than a per-line Python loop.
+        The table is streamed in blocks and filtered as it is read, so
+        memory follows the number of hits rather than the size of the
+        skani output, and only the five columns used here are converted.
+
+        SKANI output format (tab separated, one header line):
+        Ref_file Query_file ANI Align_fraction_ref Align_fraction_query ...
+
+        Args:
+            source: Path to a SKANI output file, or a buffered binary stream
+                    (e.g. skani's stdout pipe) positioned at the header
+            min_ani: Minimum ANI threshold (0.0-1.0)
+
+        Returns:
+            Tuple of (ref_files, query_files, anis, align_fractions_ref,
+            align_fractions_query) for the rows that pass the filter, with
+            ANI converted from a percentage to a fraction
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                return self._read_skani_table(f, min_ani)
+
+        header = source.readline().decode().rstrip("\r\n").split("\t")
+        if len(header) < 5 or not source.peek(1):
+            return [], [], [], [], []
+
+        used = header[:5]
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(
+                column_names=header, block_size=_SKANI_READ_BLOCK_SIZE
+            ),
+            parse_options=pa_csv.ParseOptions(delimiter="\t", quote_char=False),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=used,
+                column_types={
+                    name: pa.string() if i < 2 else pa.float64()
+                    for i, name in enumerate(used)
+                }
+            )
+        )
+
+        columns: Tuple[List[Any], ...] = ([], [], [], [], [])
+        for batch in reader:
+            ani = pc.divide(batch.column(2), 100.0)
+            keep = pc.greater_equal(ani, min_ani)
+            for column, values in zip(
+                columns,
+                (batch.column(0), batch.column(1), ani,
+                 batch.column(3), batch.column(4))
+            ):
+                column.extend(pc.filter(values, keep).to_pylist())
+        return columns
 
     def _parse_skani_output(
         self,
-        output_file: str,
+        output_file: Union[str, BinaryIO],
         min_ani: float = 0.0,
         max_results: Optional[int] = None
     ) -> Dict[str, List[Dict[str, Any]]]:
-        """Parse SKANI output file.
+        """Parse SKANI output.
 
         Args:
-            output_file: Path to SKANI output file
+            output_file: Path to SKANI output file, or skani's stdout stream
             min_ani: Minimum ANI threshold
             max_results: Maximum results per query
 
@@ -548,46 +1044,35 @@ class SKANIUtils(SharedEnvUtils):
         results_by_query = {}
 
         try:
-            with open(output_file, 'r') as f:
-                # Skip header line
-                header = f.readline()
-
-                for line in f:
-                    if not line.strip():
-                        continue
-
-                    parts = line.strip().split('\t')
-                    if len(parts) < 5:
-                        continue
-
-                    # SKANI output format:
-                    # Ref_file Query_file ANI Align_fraction_ref Align_fraction_query ...
-                    ref_file = parts[0]
-                    query_file = parts[1]
-                    ani = float(parts[2]) / 100.0  # Convert percentage to fraction
-                    align_frac_ref = float(parts[3])
-                    align_frac_query = float(parts[4])
-
-                    # Filter by ANI threshold
-                    if ani < min_ani:
-                        continue
-
-                    # Extract query ID from filename
-                    query_id = Path(query_file).stem
-
-                    # Create hit entry
-                    hit = {
-                        "reference": Path(ref_file).stem,
-                        "reference_file": ref_file,
-                        "ani": ani,
-                        "align_fraction_query": align_frac_query,
-                        "align_fraction_ref": align_frac_ref
-                    }
+            ref_files, query_files, anis, align_refs, align_queries = (
+                self._read_skani_table(output_file, min_ani)
+            )
+            # Each file appears on many rows; derive its stem only once
+            stems: Dict[str, str] = {}
+            for ref_file, query_file, ani, align_frac_ref, align_frac_query in zip(
+                ref_files, query_files, anis, align_refs, align_queries
+            ):
+                # Extract query ID from filename
+                query_id = stems.get(query_file)
+                if query_id is None:
+                    query_id = stems[query_file] = _file_stem(query_file)
+                reference = stems.get(ref_file)
+                if reference is None:
+                    reference = stems[ref_file] = _file_stem(ref_file)
+
+                # Create hit entry
+                hit = {
+                    "reference": reference,
+                    "reference_file": ref_file,
+                    "ani": ani,
+                    "align_fraction_query": align_frac_query,
+                    "align_fraction_ref": align_frac_ref
+                }
 
-                    if query_id not in results_by_query:
-                        results_by_query[query_id] = []
+                if query_id not in results_by_query:
+                    results_by_query[query_id] = []
 
-                    results_by_query[query_id].append(hit)
+                results_by_query[query_id].append(hit)
 
             # Sort results by ANI (highest first) and apply max_results
             for query_id in results_by_query:
@@ -640,9 +1125,15 @@ class SKANIUtils(SharedEnvUtils):
             database_name: Name of the database
 
         Returns:
-            Database metadata dictionary, or None if not found
+            Database metadata dictionary including its ``genomes`` list (for
+            databases built by sketch_genome_directory), or None if not found
         """
-        return self._get_database_info(database_name)
+        db_info = self._get_database_info(database_name)
+        if db_info is not None and "genomes_file" in db_info:
+            db_info["genomes"] = [
+                dict(genome) for genome in self._load_genomes(db_info)
+            ]
+        return db_info
 
     def remove_database(self, database_name: str, delete_files: bool = False) -> bool:
         """Remove a sketch database from the cache.
@@ -662,49 +1153,145 @@ class SKANIUtils(SharedEnvUtils):
 
         db_info = cache[database_name]
 
-        # Optionally delete files
+        # Optionally delete files. Renaming the directory aside is atomic
+        # and instant; the (possibly tens of GB) contents are then removed on
+        # a background thread so the caller does not wait on it. The thread
+        # is not a daemon, so interpreter exit waits for it to finish.
         if delete_files:
             db_path = Path(db_info["path"])
             if db_path.exists():
+                trash = db_path.with_name(
+                    f"{db_path.name}.trash-{uuid.uuid4().hex}"
+                )
                 try:
-                    import shutil
-                    shutil.rmtree(db_path)
-                    self.log_info(f"Deleted database files at {db_path}")
+                    db_path.rename(trash)
                 except Exception as e:
                     self.log_error(f"Failed to delete database files: {e}")
                     return False
+                # Also pick up trash left by earlier deletions of this same
+                # database that were killed or failed part way through. Only
+                # names this method could have produced match, so unrelated
+                # directories that happen to contain ".trash-" are left alone.
+                stale = re.compile(re.escape(db_path.name) + r"\.trash-[0-9a-f]{32}")
+                trash_dirs = [trash] + [
+                    path for path in trash.parent.iterdir()
+                    if path != trash and stale.fullmatch(path.name)
+                    and path.is_dir() and path not in self._deleting
+                ]
+                self._deleting.update(trash_dirs)
+                thread = threading.Thread(
+                    target=self._delete_trees, args=(trash_dirs,)
+                )
+                thread.start()
+                self._delete_threads.append(thread)
+                self.log_info(f"Deleting database files at {db_path} in the background")
 
         # Remove from cache
+        self._genomes_cache.pop(db_info.get("genomes_file"), None)
         del cache[database_name]
         self._save_cache(cache)
         self.log_info(f"Removed database '{database_name}' from cache")
         return True
 
+    def _delete_trees(self, paths: List[Path]) -> None:
+        """Delete each directory tree in turn; see _delete_tree."""
+        for path in paths:
+            try:
+                self._delete_tree(path)
+            finally:
+                self._deleting.discard(path)
+
+    def _delete_tree(self, path: Path) -> bool:
+        """Delete a directory tree, unlinking files from a small thread pool.
+
+        Files that cannot be unlinked are logged and the tree is left in
+        place, so a later remove_database sweep can retry it.
+
+        Args:
+            path: Directory to remove
+
+        Returns:
+            bool: True if the whole tree was removed
+        """
+        dirs = []
+        results = []
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for root, dirnames, filenames in os.walk(path):
+                    dirs.append(root)
+                    # os.walk lists symlinks to directories under dirnames
+                    # without descending; they are unlinked like files
+                    names = filenames + [
+                        name for name in dirnames
+                        if os.path.islink(os.path.join(root, name))
+                    ]
+                    results.append(executor.map(
+                        _unlink, [os.path.join(root, name) for name in names]
+                    ))
+            errors = [error for result in results for error in result if error]
+            if errors:
+                self.log_error(
+                    f"Failed to delete {len(errors)} file(s) under {path}, "
+                    f"e.g. {errors[0]}"
+                )
+                return False
+            # os.walk is top-down, so reversed order removes children first
+            for directory in reversed(dirs):
+                os.rmdir(directory)
+        except Exception as e:
+            self.log_error(f"Failed to delete {path}: {e}")
+            return False
+        return True
+
     def compute_pairwise_distances(
         self,
         fasta_files: List[str],
         min_ani: float = 0.0,
-        threads: int = 1
+        threads: int = 0,
+        block_size: Optional[int] = None,
+        all_vs_all: bool = False
     ) -> List[Dict[str, Any]]:
         """Compute pairwise distances between genomes without caching.
 
+        By default the first genome is the query and is compared with each
+        of the others as references (``skani dist``), giving N-1 rows for N
+        genomes.
+        With ``all_vs_all=True`` every unordered pair is compared once
+        instead, with ``skani triangle -E``, giving N*(N-1)/2 rows.
+
+        When ``block_size`` is set and there are more genomes than that,
+        the work is split into several skani runs of at most that many
+        genomes per side. In all-vs-all mode, diagonal blocks run
+        ``skani triangle -E`` and off-diagonal block pairs run
+        ``skani dist --ql/--rl``. The runs execute concurrently, sharing
+        ``threads`` between them. This bounds the memory any single skani
+        process needs for very large genome sets.
+
         Args:
             fasta_files: List of paths to FASTA files
             min_ani: Minimum ANI threshold
-            threads: Number of threads to use
+            threads: Number of threads to use (0 = all CPUs)
+            block_size: Maximum genomes per skani invocation (None = one
+                       invocation for the whole set)
+            all_vs_all: Compare every pair rather than the first genome
+                       against the rest
 
         Returns:
-            List of pairwise comparison dictionaries
+            List of pairwise comparison dictionaries; empty for a single
+            genome
 
         Raises:
             RuntimeError: If SKANI is not available
+            ValueError: If no files are given or any file is missing
         """
         self.initialize_call(
             "compute_pairwise_distances",
             {
                 "fasta_files": fasta_files,
                 "min_ani": min_ani,
-                "threads": threads
+                "threads": threads,
+                "block_size": block_size,
+                "all_vs_all": all_vs_all
             },
             print_params=True
         )
@@ -714,90 +1301,144 @@ class SKANIUtils(SharedEnvUtils):
                 "SKANI is not available. Please install SKANI first."
             )
 
-        # Validate files
-        for fasta_file in fasta_files:
-            if not Path(fasta_file).exists():
-                raise ValueError(f"File not found: {fasta_file}")
+        # Validate files; the stat calls are I/O bound (slow on NFS), so
+        # overlap them and report every missing file at once
+        if not fasta_files:
+            raise ValueError("No FASTA files provided")
+        with ThreadPoolExecutor(max_workers=min(32, len(fasta_files))) as executor:
+            exists = list(executor.map(os.path.exists, fasta_files))
+        missing = [f for f, ok in zip(fasta_files, exists) if not ok]
+        if missing:
+            raise ValueError(f"File not found: {', '.join(map(str, missing))}")
+
+        if all_vs_all:
+            # Tile the comparison matrix: (block, None) is a diagonal block
+            # compared against itself, (block_a, block_b) an off-diagonal one
+            if block_size and len(fasta_files) > block_size:
+                blocks = [
+                    fasta_files[i:i + block_size]
+                    for i in range(0, len(fasta_files), block_size)
+                ]
+            else:
+                blocks = [fasta_files]
+            tasks = [(block, None) for block in blocks if len(block) > 1]
+            for i, block_a in enumerate(blocks):
+                for block_b in blocks[i + 1:]:
+                    tasks.append((block_a, block_b))
+        else:
+            # The first genome queried against the others, in reference
+            # blocks
+            query, references = fasta_files[:1], fasta_files[1:]
+            size = block_size or len(references) or 1
+            tasks = [
+                (query, references[i:i + size])
+                for i in range(0, len(references), size)
+            ]
+        if not tasks:
+            self.log_info("Fewer than two genomes; no pairs to compare")
+            return []
+
+        threads = self._resolve_threads(threads)
+        workers = min(len(tasks), threads)
+        threads_per_task = max(1, threads // workers)
+
+        self.log_info(
+            f"Computing pairwise distances for {len(fasta_files)} genomes "
+            f"in {len(tasks)} skani run(s) with {threads} thread(s)"
+        )
 
-        # Create temporary output file
-        with tempfile.NamedTemporaryFile(
-            mode='w', suffix='.txt', delete=False
-        ) as f:
-            output_file = f.name
+        def run_block(task):
+            return self._run_skani_block(
+                task[0], task[1], threads_per_task, min_ani
+            )
 
         try:
-            # Build skani dist command
-            cmd = [self.skani_executable, "dist"]
+            if workers == 1:
+                tables = [run_block(task) for task in tasks]
+            else:
+                # Each task is a skani subprocess, so threads are enough to
+                # keep several running at once
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    tables = list(executor.map(run_block, tasks))
+        except subprocess.TimeoutExpired:
+            self.log_error("skani dist timed out")
+            raise RuntimeError("skani dist timed out")
 
-            # Add files
-            for fasta_file in fasta_files:
-                cmd.append(str(fasta_file))
+        # Parse results
+        comparisons = []
+        stems = {str(path): _file_stem(str(path)) for path in fasta_files}
+        for ref_files, query_files, anis, align_refs, align_queries in tables:
+            for ref_file, query_file, ani, align_frac_ref, align_frac_query in zip(
+                ref_files, query_files, anis, align_refs, align_queries
+            ):
+                comparisons.append({
+                    "genome1": stems.get(ref_file) or _file_stem(ref_file),
+                    "genome2": stems.get(query_file) or _file_stem(query_file),
+                    "genome1_file": ref_file,
+                    "genome2_file": query_file,
+                    "ani": ani,
+                    "align_fraction_1": align_frac_ref,
+                    "align_fraction_2": align_frac_query
+                })
 
-            # Add output
-            cmd.extend(["-o", output_file])
+        self.log_info(f"Computed {len(comparisons)} pairwise comparisons")
+        return comparisons
 
-            # Add threads
-            if threads > 1:
-                cmd.extend(["-t", str(threads)])
+    def _run_skani_block(
+        self,
+        query_files: List[str],
+        ref_files: Optional[List[str]],
+        threads: int,
+        min_ani: float
+    ) -> Tuple[List[str], List[str], List[float], List[float], List[float]]:
+        """Run one tile of compute_pairwise_distances.
 
-            self.log_info(
-                f"Computing pairwise distances for {len(fasta_files)} genomes"
-            )
+        Args:
+            query_files: Genomes on one side of the tile
+            ref_files: Genomes on the other side, or None to compare
+                       ``query_files`` against each other (``skani triangle``)
+            threads: Threads for this skani run
+            min_ani: Minimum ANI threshold
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
+        Returns:
+            The filtered table columns, as from _read_skani_table
+
+        Raises:
+            RuntimeError: If skani exits with an error
+            subprocess.TimeoutExpired: If skani runs longer than 5 minutes
+        """
+        with tempfile.NamedTemporaryFile(
+            mode='w', suffix='.txt', delete=False
+        ) as f:
+            output_file = f.name
+        list_files = []
+
+        try:
+            if ref_files is None:
+                list_files.append(self._write_file_list(query_files))
+                cmd = [self.skani_executable, "triangle", "-E", "-l", list_files[0]]
+            else:
+                list_files.append(self._write_file_list(query_files))
+                list_files.append(self._write_file_list(ref_files))
+                cmd = [
+                    self.skani_executable, "dist",
+                    "--ql", list_files[0], "--rl", list_files[1]
+                ]
+            cmd.extend(["-o", output_file, "-t", str(threads)])
+
+            result = self._run_skani(cmd, timeout=300)
 
             if result.returncode != 0:
-                self.log_error(f"skani dist failed: {result.stderr}")
-                raise RuntimeError(f"skani dist failed: {result.stderr}")
-
-            # Parse results - for dist, format is different
-            comparisons = []
-
-            with open(output_file, 'r') as f:
-                # Skip header
-                header = f.readline()
-
-                for line in f:
-                    if not line.strip():
-                        continue
-
-                    parts = line.strip().split('\t')
-                    if len(parts) < 5:
-                        continue
-
-                    ref_file = parts[0]
-                    query_file = parts[1]
-                    ani = float(parts[2]) / 100.0
-                    align_frac_ref = float(parts[3])
-                    align_frac_query = float(parts[4])
-
-                    if ani >= min_ani:
-                        comparisons.append({
-                            "genome1": Path(ref_file).stem,
-                            "genome2": Path(query_file).stem,
-                            "genome1_file": ref_file,
-                            "genome2_file": query_file,
-                            "ani": ani,
-                            "align_fraction_1": align_frac_ref,
-                            "align_fraction_2": align_frac_query
-                        })
-
-            self.log_info(f"Computed {len(comparisons)} pairwise comparisons")
-            return comparisons
+                self.log_error(f"skani {cmd[1]} failed: {result.stderr}")
+                raise RuntimeError(f"skani {cmd[1]} failed: {result.stderr}")
 
-        except subprocess.TimeoutExpired:
-            self.log_error("skani dist timed out")
-            raise RuntimeError("skani dist timed out")
+            return self._read_skani_table(output_file, min_ani)
         finally:
-            try:
-                os.unlink(output_file)
-            except:
-                pass
+            for path in [output_file] + list_files:
+                try:
+                    os.unlink(path)
+                except:
+                    pass
 
 
 # ── Composition-based implementation ─────────────────────────────────────
@@ -71,11 +71,13 @@ import os
 import re
 import shlex
 import shutil
+import signal
 import subprocess
 import tempfile
 import time
 import uuid
 import xml.etree.ElementTree as ET
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
@@ -98,6 +100,9 @@ _INSTALL_HINT = (
     "or set transyt.docker_image in config.yaml and build docker/transyt/Dockerfile"
 )
 
+# Docker stderr messages for a run whose image is not present locally
+_IMAGE_MISSING_MARKERS = ("Unable to find image", "No such image")
+
 # Default params.txt values written to the input directory
 _DEFAULT_SCORING = {
     "blastEvalue": "1e-5",
@@ -118,13 +123,37 @@ _SBML_HTML_NS = "http://www.w3.org/1999/xhtml"
 # ModelSEED species id pattern, e.g. "M_cpd00382_e0" → ("cpd00382", "e0").
 _MS_SPECIES_RE = re.compile(r"^M_(cpd\d+)_([a-z]\d+)$")
 
+# scoresMethod1.txt hit line, e.g. "4.A.1.1.9 - Evalue: 2.72E-149\t[...]".
+_SCORE_LINE_RE = re.compile(r"\s*(\S+)\s*-\s*Evalue:\s*(\S+)")
+
 # Transyt exit code for "no resolvable taxonomy"
 _EXIT_NO_TAXONOMY = 8
 
+# SBML reaction child list → key in _parse_reactions output
+_REACTION_SIDES = {
+    "listOfReactants": "reactants",
+    "listOfProducts": "products",
+}
+
 
 def _local_tag(elem) -> str:
     """Return an element's local (namespace-stripped) tag name."""
-    return elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+    return elem.tag.rpartition("}")[2]
+
+
+def _sbml_root(source: Path | ET.Element) -> ET.Element | None:
+    """Return the root element of a Transyt SBML file.
+
+    *source* may be a path or an already-parsed root, so ``_parse_results``
+    can parse the (potentially tens-of-MB) SBML once and hand the same tree
+    to every parser below.  Returns None if the file is not valid XML.
+    """
+    if isinstance(source, ET.Element):
+        return source
+    try:
+        return ET.parse(str(source)).getroot()
+    except ET.ParseError:
+        return None
 
 
 # ---------------------------------------------------------------------------
@@ -133,7 +162,7 @@ def _local_tag(elem) -> str:
 
 
 def _parse_transyt_xml(
-    xml_path: Path,
+    xml_path: Path | ET.Element,
 ) -> dict[str, list[str]]:
     """Parse a Transyt SBML results file and return gene → reaction-id list.
 
@@ -143,24 +172,17 @@ def _parse_transyt_xml(
     ``<geneProduct>`` elements, which corresponds to the caller's protein id).
 
     Args:
-        xml_path: Path to ``results/transyt.xml``.
+        xml_path: Path to ``results/transyt.xml``, or its parsed root.
 
     Returns:
         A dict mapping gene-product name (caller protein id) to a list of
         Transyt reaction ids (e.g. ``["R_T0001", "R_T0003"]``).  Genes with
         no associations are absent.
     """
-    try:
-        tree = ET.parse(str(xml_path))
-    except ET.ParseError:
+    root = _sbml_root(xml_path)
+    if root is None:
         return {}
 
-    root = tree.getroot()
-
-    def _local(elem) -> str:
-        """Local (namespace-stripped) tag name of an element."""
-        return elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-
     def _fbc_attr(elem, name: str) -> str:
         """fbc-namespaced attribute, falling back to the bare attribute."""
         return elem.get(f"{{{_SBML_FBC_NS}}}{name}", elem.get(name, ""))
@@ -170,7 +192,7 @@ def _parse_transyt_xml(
     #   <fbc:geneProduct fbc:id="G_x" fbc:label="x" fbc:name="x"/>
     id_to_label: dict[str, str] = {}
     for elem in root.iter():
-        if _local(elem) != "geneProduct":
+        if _local_tag(elem) != "geneProduct":
             continue
         gp_id = _fbc_attr(elem, "id")
         label = _fbc_attr(elem, "label") or _fbc_attr(elem, "name") or gp_id
@@ -180,28 +202,27 @@ def _parse_transyt_xml(
     # Collect gene → reactions.  In L3V2/fbc the gene-product association is
     # NESTED inside each <reaction> as fbc:geneProductAssociation containing one
     # or more fbc:geneProductRef (possibly under fbc:and / fbc:or operators), so
-    # walk every reaction and gather all geneProductRef descendants.
-    gene_to_rxns: dict[str, list[str]] = {}
+    # walk every reaction and gather all geneProductRef descendants.  Reaction
+    # ids are collected as dict keys: O(1) dedup that keeps document order.
+    gene_to_rxns: dict[str, dict[str, None]] = {}
     for rxn in root.iter():
-        if _local(rxn) != "reaction":
+        if _local_tag(rxn) != "reaction":
             continue
         rxn_id = rxn.get("id", "")
         if not rxn_id:
             continue
         for ref in rxn.iter():
-            if _local(ref) != "geneProductRef":
+            if _local_tag(ref) != "geneProductRef":
                 continue
             gp_id = _fbc_attr(ref, "geneProduct")
             gene_name = id_to_label.get(gp_id, gp_id)
             if gene_name:
-                rxns = gene_to_rxns.setdefault(gene_name, [])
-                if rxn_id not in rxns:
-                    rxns.append(rxn_id)
+                gene_to_rxns.setdefault(gene_name, {})[rxn_id] = None
 
-    return gene_to_rxns
+    return {gene: list(rxns) for gene, rxns in gene_to_rxns.items()}
 
 
-def _parse_species(xml_path: Path) -> dict[str, dict[str, Any]]:
+def _parse_species(xml_path: Path | ET.Element) -> dict[str, dict[str, Any]]:
     """Parse listOfSpecies → species id → compound info.
 
     TranSyT species ids look like ``M_cpd00382_e0`` (ModelSEED compound +
@@ -213,12 +234,11 @@ def _parse_species(xml_path: Path) -> dict[str, dict[str, Any]]:
     ``modelseed`` is False for species whose id is not a ModelSEED compound
     (then ``cpd`` is None and callers fall back to the name/id).
     """
-    try:
-        tree = ET.parse(str(xml_path))
-    except ET.ParseError:
+    root = _sbml_root(xml_path)
+    if root is None:
         return {}
     out: dict[str, dict[str, Any]] = {}
-    for elem in tree.getroot().iter():
+    for elem in root.iter():
         if _local_tag(elem) != "species":
             continue
         sid = elem.get("id", "")
@@ -235,7 +255,7 @@ def _parse_species(xml_path: Path) -> dict[str, dict[str, Any]]:
     return out
 
 
-def _parse_reactions(xml_path: Path) -> dict[str, dict[str, Any]]:
+def _parse_reactions(xml_path: Path | ET.Element) -> dict[str, dict[str, Any]]:
     """Parse listOfReactions → reaction id → stoichiometry + direction.
 
     Returns, per reaction id::
@@ -244,12 +264,11 @@ def _parse_reactions(xml_path: Path) -> dict[str, dict[str, Any]]:
          "products":  [(species_id, stoich_str), ...],
          "reversible": bool}
     """
-    try:
-        tree = ET.parse(str(xml_path))
-    except ET.ParseError:
+    root = _sbml_root(xml_path)
+    if root is None:
         return {}
     out: dict[str, dict[str, Any]] = {}
-    for rxn in tree.getroot().iter():
+    for rxn in root.iter():
         if _local_tag(rxn) != "reaction":
             continue
         rid = rxn.get("id", "")
@@ -260,10 +279,7 @@ def _parse_reactions(xml_path: Path) -> dict[str, dict[str, Any]]:
             "reversible": rxn.get("reversible", "false") == "true",
         }
         for side in rxn:
-            key = {
-                "listOfReactants": "reactants",
-                "listOfProducts": "products",
-            }.get(_local_tag(side))
+            key = _REACTION_SIDES.get(_local_tag(side))
             if key is None:
                 continue
             for sref in side:
@@ -303,7 +319,7 @@ def _parse_scores_method1(scores_path: Path) -> dict[str, list[tuple[str, str]]]
             continue
         if gene is None:
             continue
-        m = re.match(r"\s*(\S+)\s*-\s*Evalue:\s*(\S+)", line)
+        m = _SCORE_LINE_RE.match(line)
         if m:
             out[gene].append((m.group(1).strip(), m.group(2).strip()))
     return out
@@ -362,26 +378,26 @@ def _parse_reactions_references(
     """
     result: dict[str, tuple[str | None, list[str]]] = {}
     try:
-        text = ref_path.read_text(encoding="utf-8")
+        handle = open(ref_path, encoding="utf-8")
     except OSError:
         return result
 
-    for line in text.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        parts = line.split("\t")
-        rxn_id = parts[0]
-        msrxn = parts[1].strip() if len(parts) > 1 else None
-        # TranSyT writes the ModelSEED rxn id(s) bracketed, e.g. "[rxn05643]";
-        # strip the brackets so the stored id is the bare "rxn05643".
-        if msrxn:
-            msrxn = msrxn.strip("[]").strip()
-        if msrxn == "" or msrxn is None:
-            msrxn = None
-        cpds_raw = parts[2].strip() if len(parts) > 2 else ""
-        cpds = [c.strip() for c in cpds_raw.split(";") if c.strip()]
-        result[rxn_id] = (msrxn, cpds)
+    # Stream the file line by line; partition() splits off each column
+    # without building a list per line.
+    with handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            rxn_id, _, rest = line.partition("\t")
+            msrxn_raw, _, rest = rest.partition("\t")
+            # TranSyT writes the ModelSEED rxn id(s) bracketed, e.g.
+            # "[rxn05643]"; strip the brackets so the stored id is the bare
+            # "rxn05643".
+            msrxn = msrxn_raw.strip().strip("[]").strip() or None
+            cpds_raw = rest.partition("\t")[0]
+            cpds = [c.strip() for c in cpds_raw.split(";") if c.strip()]
+            result[rxn_id] = (msrxn, cpds)
 
     return result
 
@@ -426,11 +442,11 @@ def _build_annotation_records(
     """
     input_ids = set(input_protein_ids)
     records: list[AnnotationRecord] = []
+    # Transporter reactions are typically shared by several genes; render
+    # each equation once rather than once per gene.
+    equations: dict[str, str] = {}
 
-    for gene in sorted(set(gene_to_rxns) | set(gene_to_tc)):
-        if gene not in input_ids:
-            continue
-
+    for gene in sorted((gene_to_rxns.keys() | gene_to_tc.keys()) & input_ids):
         terms: list[Term] = []
 
         seen_tc: set[str] = set()
@@ -447,25 +463,29 @@ def _build_annotation_records(
             rxn = reactions.get(rxn_id)
             if rxn is None:
                 continue
-            equation = _reaction_equation(rxn, species)
             mapping = rxn_to_msrxn_cpds.get(rxn_id)
             msrxn = mapping[0] if mapping else None
-            if msrxn:
-                if msrxn not in seen_rxn:
-                    seen_rxn.add(msrxn)
+            # Several TranSyT reactions can map to one ModelSEED reaction;
+            # only the first gets a term, so skip rendering for the rest.
+            term_id = msrxn or rxn_id
+            if term_id not in seen_rxn:
+                seen_rxn.add(term_id)
+                equation = equations.get(rxn_id)
+                if equation is None:
+                    equation = equations[rxn_id] = _reaction_equation(rxn, species)
+                if msrxn:
                     terms.append(Term(
                         namespace="MSRXN", id=msrxn, value=equation,
                         evidence={"transyt_rxn_id": rxn_id,
                                   "reversible": rxn["reversible"]},
                     ))
-            elif rxn_id not in seen_rxn:
-                seen_rxn.add(rxn_id)
-                terms.append(Term(
-                    namespace="TRANSYT_RXN", id=rxn_id, value=equation,
-                    evidence={"reversible": rxn["reversible"]},
-                ))
-
-            for sid, _stoich in rxn["reactants"] + rxn["products"]:
+                else:
+                    terms.append(Term(
+                        namespace="TRANSYT_RXN", id=rxn_id, value=equation,
+                        evidence={"reversible": rxn["reversible"]},
+                    ))
+
+            for sid, _stoich in chain(rxn["reactants"], rxn["products"]):
                 info = species.get(sid)
                 if info is None:
                     continue
@@ -547,6 +567,8 @@ class TransytUtils(AnnotatorUtils):
         self._neo4j_pagecache: str = self.get_config_value(
             "transyt.neo4j_pagecache", default="512m"
         )
+        # Image tags already confirmed present; see _require_available.
+        self._available_images: set[str] = set()
 
     def _docker_workdir_base(self) -> str:
         """Base dir for the per-run input dir (``tempfile.TemporaryDirectory``).
@@ -589,6 +611,26 @@ class TransytUtils(AnnotatorUtils):
         except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
             return False
 
+    def _require_available(self, refresh: bool = False) -> None:
+        """Raise ToolUnavailableError unless the Docker image is present.
+
+        A successful probe is remembered per image tag, so repeated
+        ``annotate()`` calls on one instance run ``docker image inspect``
+        once.  ``is_available()`` itself stays an uncached, side-effect-free
+        probe; a failed probe is never remembered, and a run that fails
+        because the image has since been removed forgets the tag again.
+
+        Args:
+            refresh: Probe again even if the image was already confirmed.
+
+        Raises:
+            ToolUnavailableError: If the image is not locally present.
+        """
+        if not refresh and self._docker_image in self._available_images:
+            return
+        super()._require_available()
+        self._available_images.add(self._docker_image)
+
     # ------------------------------------------------------------------
     # Public interface
     # ------------------------------------------------------------------
@@ -748,12 +790,18 @@ class TransytUtils(AnnotatorUtils):
             reference_database: Reference database name.
             metabolites: Optional list of ModelSEED compound ids.
         """
-        # Write protein.faa
-        faa_lines: list[str] = []
-        for gid, seq in proteins.items():
-            faa_lines.append(f">{gid}")
-            faa_lines.append(seq.strip())
-        (indir / "protein.faa").write_text("\n".join(faa_lines) + "\n", encoding="utf-8")
+        # Write protein.faa, streaming records through a 1 MiB buffer rather
+        # than materialising the whole proteome as one string first.
+        with open(
+            indir / "protein.faa", "w", encoding="utf-8", buffering=1 << 20
+        ) as faa:
+            write = faa.write
+            for gid, seq in proteins.items():
+                write(">")
+                write(gid)
+                write("\n")
+                write(seq.strip())
+                write("\n")
 
         # Write params.txt.  TranSyT parses this file with a TAB delimiter
         # (FilesUtils.readMapFromFile splits each line on "\t" and drops lines
@@ -778,7 +826,9 @@ class TransytUtils(AnnotatorUtils):
     # Docker invocation
     # ------------------------------------------------------------------
 
-    def _build_docker_command(self, indir: Path) -> list[str]:
+    def _build_docker_command(
+        self, indir: Path, container_name: str | None = None
+    ) -> list[str]:
         """Build the docker run argv list.
 
         Constructs the full ``docker run`` command that:
@@ -789,6 +839,8 @@ class TransytUtils(AnnotatorUtils):
         Args:
             indir: Host-side input directory, bind-mounted at
                 ``/workdir/processingDir`` inside the container.
+            container_name: Optional ``--name`` for the container, so it can
+                be stopped with ``docker kill`` if the run times out.
 
         Returns:
             List of strings forming the complete ``docker run`` command.
@@ -818,10 +870,12 @@ class TransytUtils(AnnotatorUtils):
         )
         inner_script = f"{neo4j_env}neo4j start && {neo4j_poll} && {jar_cmd}"
 
+        name_args = ["--name", container_name] if container_name else []
         return [
             "docker",
             "run",
             "--rm",
+            *name_args,
             "-v",
             f"{indir}:/workdir/processingDir",
             "--entrypoint",
@@ -841,21 +895,68 @@ class TransytUtils(AnnotatorUtils):
             A tuple of (shlex-quoted command string, docker exit code).
             Exit code 8 indicates no resolvable taxonomy (empty result).
 
+        Raises:
+            subprocess.TimeoutExpired: If the run exceeds the timeout; the
+                container is killed first.
+
         Note:
             The container is run with a generous timeout based on the
             neo4j_timeout setting plus a fixed overhead for JAR startup.
             Total timeout = neo4j_timeout * 2 + 300 seconds.
+
+            Transyt's Java and Neo4j logs are not read into memory: stdout
+            is discarded and stderr is spooled to a temp file, whose tail is
+            logged only when the run fails.  The client runs in its own
+            session and the container is named, so a timeout can stop both
+            rather than leaving Neo4j running inside an orphaned container.
         """
-        argv = self._build_docker_command(indir)
+        container_name = f"transyt-{uuid.uuid4().hex[:12]}"
+        argv = self._build_docker_command(indir, container_name=container_name)
         cmd_str = shlex.join(argv)
         timeout = self._neo4j_timeout * 2 + 300
 
-        proc = subprocess.run(
-            argv,
-            capture_output=True,
-            timeout=timeout,
-        )
-        return cmd_str, proc.returncode
+        with tempfile.TemporaryFile() as stderr:
+            proc = subprocess.Popen(
+                argv,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr,
+                start_new_session=True,
+            )
+            try:
+                returncode = proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self._kill_container(container_name)
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except OSError:
+                    pass
+                proc.wait()
+                raise
+
+            if returncode not in (0, _EXIT_NO_TAXONOMY):
+                stderr.seek(0, os.SEEK_END)
+                stderr.seek(max(0, stderr.tell() - 4096))
+                tail = stderr.read().decode("utf-8", errors="replace")
+                self.log_warning(
+                    f"Transyt container exited with code {returncode}:\n{tail}"
+                )
+                if any(marker in tail for marker in _IMAGE_MISSING_MARKERS):
+                    # Removed since _require_available confirmed it; probe
+                    # again on the next run
+                    self._available_images.discard(self._docker_image)
+        return cmd_str, returncode
+
+    def _kill_container(self, container_name: str) -> None:
+        """Best-effort ``docker kill`` of a named container; never raises."""
+        try:
+            subprocess.run(
+                ["docker", "kill", container_name],
+                capture_output=True,
+                timeout=30,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+            pass
 
     # ------------------------------------------------------------------
     # Results parsing
@@ -870,7 +971,8 @@ class TransytUtils(AnnotatorUtils):
     ) -> list[AnnotationRecord]:
         """Parse TranSyT output files and build AnnotationRecords.
 
-        Delegates to the pure parse functions, then assembles records.
+        Delegates to the pure parse functions, then assembles records.  The
+        SBML is parsed once and the tree shared by the three SBML parsers.
 
         Args:
             xml_path: Path to ``results/transyt.xml`` (gene→reaction links,
@@ -885,10 +987,14 @@ class TransytUtils(AnnotatorUtils):
         Returns:
             List of AnnotationRecord objects.
         """
-        gene_to_rxns = _parse_transyt_xml(xml_path)
+        root = _sbml_root(xml_path)
+        if root is None:
+            gene_to_rxns, reactions, species = {}, {}, {}
+        else:
+            gene_to_rxns = _parse_transyt_xml(root)
+            reactions = _parse_reactions(root)
+            species = _parse_species(root)
         gene_to_tc = _parse_scores_method1(scores_path)
-        reactions = _parse_reactions(xml_path)
-        species = _parse_species(xml_path)
         rxn_to_msrxn_cpds = _parse_reactions_references(ref_path)
         return _build_annotation_records(
             gene_to_rxns, gene_to_tc, reactions, species,
@@ -902,6 +1008,10 @@ class TransytUtils(AnnotatorUtils):
     def _get_image_digest(self) -> str:
         """Return the Docker image digest for the configured image.
 
+        Inspected on every call rather than cached: the tag may be pulled
+        again during the instance's lifetime, and provenance must record
+        the image that actually ran.
+
         Returns:
             Image digest string (e.g. ``"sha256:abc123..."``), or empty
             string on failure.
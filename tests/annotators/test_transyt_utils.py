@@ -14,6 +14,7 @@ TranSyT actually emits).
 from __future__ import annotations
 
 import subprocess
+import xml.etree.ElementTree as ET
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -95,6 +96,26 @@ class TestIsAvailable:
             assert tu.is_available() is False
 
 
+class TestRequireAvailable:
+    def test_successful_probe_remembered(self):
+        tu = _make_utils()
+        with patch.object(tu, "is_available", return_value=True) as probe:
+            tu._require_available()
+            tu._require_available()
+            assert probe.call_count == 1
+            tu._require_available(refresh=True)
+            assert probe.call_count == 2
+
+    def test_failed_probe_not_remembered(self):
+        tu = _make_utils()
+        with patch.object(tu, "is_available", return_value=False):
+            with pytest.raises(ToolUnavailableError):
+                tu._require_available()
+        with patch.object(tu, "is_available", return_value=True) as probe:
+            tu._require_available()
+            assert probe.call_count == 1
+
+
 # ---------------------------------------------------------------------------
 # annotate() — validation before Docker is touched
 # ---------------------------------------------------------------------------
@@ -211,6 +232,27 @@ class TestParseTransytXml:
 # ---------------------------------------------------------------------------
 
 
+class TestParseResults:
+    def test_sbml_parsed_once(self):
+        tu = _make_utils()
+        with patch(
+            "kbutillib.transyt_utils.ET.parse", wraps=ET.parse
+        ) as parse:
+            records = tu._parse_results(
+                _XML_FIXTURE, _REF_FIXTURE, _SCORES_FIXTURE, ["prot1", "prot2", "prot3"]
+            )
+        assert parse.call_count == 1
+        assert {r.gene_id for r in records} == {"prot1", "prot2", "prot3"}
+
+    def test_invalid_sbml_keeps_tc_terms(self, tmp_path):
+        bad = tmp_path / "bad.xml"
+        bad.write_text("<not valid xml")
+        records = _make_utils()._parse_results(
+            bad, tmp_path / "missing.txt", _SCORES_FIXTURE, ["prot1"]
+        )
+        assert [t.namespace for t in records[0].terms] == ["TC"] * len(records[0].terms)
+
+
 class TestParseSpecies:
     def test_modelseed_species(self):
         spec = _parse_species(_XML_FIXTURE)
@@ -353,6 +395,14 @@ class TestParseReactionsReferences:
         assert msrxn == "rxn00001"
         assert cpds == ["cpd00001", "cpd00002"]
 
+    def test_missing_and_extra_columns(self, tmp_path):
+        f = tmp_path / "refs.txt"
+        f.write_text("R_T1\nR_T2\t[]\nR_T3\trxn1\tcpd1\textra\n", encoding="utf-8")
+        result = _parse_reactions_references(f)
+        assert result["R_T1"] == (None, [])
+        assert result["R_T2"] == (None, [])
+        assert result["R_T3"] == ("rxn1", ["cpd1"])
+
 
 # ---------------------------------------------------------------------------
 # _build_annotation_records — rich schema
@@ -443,6 +493,35 @@ class TestBuildAnnotationRecords:
         )
         assert len(self._terms(records, "g1", "TC")) == 1
 
+    def test_duplicate_msrxn_mapping_rendered_once(self):
+        reactions = {
+            "R_T1": {"reactants": [], "products": [], "reversible": True},
+            "R_T2": {"reactants": [], "products": [], "reversible": False},
+        }
+        refs = {"R_T1": ("rxn1", []), "R_T2": ("rxn1", [])}
+        with patch(
+            "kbutillib.transyt_utils._reaction_equation", return_value="A <=> B"
+        ) as render:
+            records = _build_annotation_records(
+                {"g1": ["R_T1", "R_T2"]}, {}, reactions, {}, refs, ["g1"]
+            )
+        assert render.call_count == 1
+        msrxn = self._terms(records, "g1", "MSRXN")
+        assert [(t.id, t.evidence["transyt_rxn_id"]) for t in msrxn] == [("rxn1", "R_T1")]
+
+    def test_shared_reaction_equation_rendered_once(self):
+        reactions = {"R_T1": {"reactants": [], "products": [], "reversible": True}}
+        with patch(
+            "kbutillib.transyt_utils._reaction_equation", return_value="A <=> B"
+        ) as render:
+            records = _build_annotation_records(
+                {"g1": ["R_T1"], "g2": ["R_T1"]}, {}, reactions, {}, {}, ["g1", "g2"]
+            )
+        assert render.call_count == 1
+        assert [self._terms(records, g, "TRANSYT_RXN")[0].value for g in ("g1", "g2")] == [
+            "A <=> B", "A <=> B"
+        ]
+
 
 # ---------------------------------------------------------------------------
 # _stage_inputs — input file staging (params.txt is TAB-delimited)
@@ -457,6 +536,7 @@ class TestStageInputs:
         tu._stage_inputs(indir, {"gene1": "MKTAY", "gene2": "MNFST"}, "562", "ModelSEED", None)
         faa = (indir / "protein.faa").read_text()
         assert ">gene1" in faa and "MKTAY" in faa and ">gene2" in faa
+        assert faa == ">gene1\nMKTAY\n>gene2\nMNFST\n"
 
     def test_params_txt_tax_id_is_tab_delimited(self, tmp_path):
         tu = _make_utils()
@@ -536,6 +616,62 @@ class TestBuildDockerCommand:
         assert "NEO4J_dbms_memory_heap_max__size=512m" in inner
         assert "NEO4J_dbms_memory_pagecache_size=256m" in inner
 
+    def test_container_name(self):
+        tu = _make_utils()
+        cmd = tu._build_docker_command(Path("/tmp/fakedir"), container_name="t-1")
+        assert cmd[cmd.index("--name") + 1] == "t-1"
+        assert "--name" not in self._cmd()
+
+
+# ---------------------------------------------------------------------------
+# _run_docker — subprocess handling
+# ---------------------------------------------------------------------------
+
+
+class TestRunDocker:
+    def test_output_not_captured_in_memory(self, tmp_path):
+        tu = _make_utils()
+        proc = MagicMock(pid=12345)
+        proc.wait.return_value = 0
+        with patch("subprocess.Popen", return_value=proc) as popen:
+            cmd, code = tu._run_docker(tmp_path)
+        assert code == 0
+        kwargs = popen.call_args.kwargs
+        assert kwargs["stdout"] == subprocess.DEVNULL
+        assert kwargs["start_new_session"] is True
+        assert "--name" in popen.call_args.args[0]
+        assert cmd.startswith("docker run")
+
+    def test_timeout_kills_container(self, tmp_path):
+        tu = _make_utils()
+        proc = MagicMock(pid=12345)
+        proc.wait.side_effect = [subprocess.TimeoutExpired("docker", 1), None]
+        with patch("subprocess.Popen", return_value=proc) as popen, \
+             patch("subprocess.run") as run, \
+             patch("os.killpg") as killpg:
+            with pytest.raises(subprocess.TimeoutExpired):
+                tu._run_docker(tmp_path)
+        argv = popen.call_args.args[0]
+        name = argv[argv.index("--name") + 1]
+        assert run.call_args.args[0] == ["docker", "kill", name]
+        killpg.assert_called_once()
+
+    def test_missing_image_forgets_confirmed_tag(self, tmp_path):
+        tu = _make_utils()
+        with patch.object(tu, "is_available", return_value=True):
+            tu._require_available()
+
+        def popen(argv, stderr, **kwargs):
+            stderr.write(b"docker: Error response from daemon: No such image: x\n")
+            return MagicMock(pid=12345, **{"wait.return_value": 125})
+
+        with patch("subprocess.Popen", side_effect=popen):
+            _, code = tu._run_docker(tmp_path)
+        assert code == 125
+        with patch.object(tu, "is_available", return_value=False):
+            with pytest.raises(ToolUnavailableError):
+                tu._require_available()
+
 
 # ---------------------------------------------------------------------------
 # annotate() — Docker mocked out
@@ -613,6 +749,26 @@ class TestAnnotateMocked:
         assert result.parameters["metabolites"] == ["cpd00027"]
 
 
+class TestGetImageDigest:
+    def test_repulled_tag_reports_new_digest(self):
+        tu = _make_utils()
+        tu._docker_image = "mock:latest"
+        before = MagicMock(returncode=0, stdout="mock@sha256:abc\n")
+        after = MagicMock(returncode=0, stdout="mock@sha256:def\n")
+        with patch("subprocess.run", side_effect=[before, after]):
+            assert tu._get_image_digest() == "mock@sha256:abc"
+            assert tu._get_image_digest() == "mock@sha256:def"
+
+    def test_failure_returns_empty(self):
+        tu = _make_utils()
+        tu._docker_image = "mock:latest"
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            assert tu._get_image_digest() == ""
+        mock_result = MagicMock(returncode=0, stdout="mock@sha256:abc\n")
+        with patch("subprocess.run", return_value=mock_result):
+            assert tu._get_image_digest() == "mock@sha256:abc"
+
+
 # ---------------------------------------------------------------------------
 # annotate() — regression: cleanup PermissionError must not mask the result
 # ---------------------------------------------------------------------------
@@ -0,0 +1,91 @@
+"""Unit tests for KBSDKUtils.build_dataframe_report."""
+
+import json
+import re
+
+import pytest
+
+from kbutillib.kb_sdk_utils import KBSDKUtils
+
+pd = pytest.importorskip("pandas")
+
+
+@pytest.fixture
+def sdk_utils(tmp_path):
+    """A KBSDKUtils with only ``working_dir`` set (no KBase clients)."""
+    utils = KBSDKUtils.__new__(KBSDKUtils)
+    utils.working_dir = str(tmp_path)
+    return utils
+
+
+class TestBuildDataframeReport:
+    def test_small_table_is_inlined(self, sdk_utils, tmp_path):
+        table = pd.DataFrame({"Model": ["m1", "m2"], "Reactions": [10, 20]})
+        sdk_utils.build_dataframe_report(table, ["Model", "Reactions"])
+
+        html = (tmp_path / "html" / "index.html").read_text(encoding="utf-8")
+        assert '<table id="example"' in html
+        assert '"title": "Model"' in html
+        assert "$('#example')" in html
+        assert not (tmp_path / "html" / "data.json").exists()
+
+        start = html.index('type="application/json">') + len('type="application/json">')
+        data = json.loads(html[start : html.index("</script>", start)])
+        assert data == [["m1", 10], ["m2", 20]]
+
+    def test_large_table_uses_data_json(self, sdk_utils, tmp_path, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_sdk_utils._INLINE_DATA_LIMIT", 0)
+        table = pd.DataFrame({"Model": ["m1", "m2"], "Reactions": [10, 20]})
+        sdk_utils.build_dataframe_report(table, ["Model", "Reactions"])
+
+        html = (tmp_path / "html" / "index.html").read_text(encoding="utf-8")
+        assert '"url": "data.json"' in html
+        assert "tbl-data" not in html
+        # The ajax option needs $.ajax, which the slim jQuery build lacks
+        assert "jquery-3.6.0.min.js" in html and "slim" not in html
+        data = json.loads((tmp_path / "html" / "data.json").read_text(encoding="utf-8"))
+        assert data[1] == ["m2", 20]
+
+    def test_rows_follow_column_list(self, sdk_utils, tmp_path, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_sdk_utils._INLINE_DATA_LIMIT", 0)
+        table = pd.DataFrame({"a": [1.5], "b": [2], "unused": [3]})
+        sdk_utils.build_dataframe_report(table, ["b", "a", "missing"])
+
+        data = json.loads((tmp_path / "html" / "data.json").read_text(encoding="utf-8"))
+        assert data == [[2, 1.5, None]]
+
+    def test_inlined_data_cannot_close_script(self, sdk_utils, tmp_path):
+        table = pd.DataFrame({"Name": ["</script><b>"]})
+        sdk_utils.build_dataframe_report(table, ["Name"])
+
+        html = (tmp_path / "html" / "index.html").read_text(encoding="utf-8")
+        assert "</script><b>" not in html
+
+    def test_non_ascii_written_as_utf8(self, sdk_utils, tmp_path):
+        table = pd.DataFrame({"Name": ["α-ketoglutarate"]})
+        sdk_utils.build_dataframe_report(table, ["Name"])
+
+        html = (tmp_path / "html" / "index.html").read_text(encoding="utf-8")
+        assert "α-ketoglutarate" in html
+
+    def test_column_titles_and_cells_are_escaped(self, sdk_utils, tmp_path):
+        table = pd.DataFrame({"a<b": ["<script>x</script>"]})
+        sdk_utils.build_dataframe_report(table, ["a<b"])
+
+        html = (tmp_path / "html" / "index.html").read_text(encoding="utf-8")
+        assert '"title": "a&lt;b"' in html
+        assert "render.text()" in html
+
+    def test_cdn_tags_carry_matching_sri(self, sdk_utils, tmp_path):
+        table = pd.DataFrame({"Name": ["x"]})
+        sdk_utils.build_dataframe_report(table, ["Name"])
+
+        html = (tmp_path / "html" / "index.html").read_text(encoding="utf-8")
+        tags = re.findall(r"<(?:link|script)\b[^>]*https://[^>]*>", html)
+        assert len(tags) == 5
+        integrity = {}
+        for tag in tags:
+            assert 'crossorigin="anonymous"' in tag
+            url = re.search(r'(?:href|src)="([^"]+)"', tag).group(1)
+            sri = re.search(r'integrity="([^"]+)"', tag).group(1)
+            assert integrity.setdefault(url, sri) == sri
@@ -0,0 +1,588 @@
+"""Unit tests for KBUniProtUtils (UniProt REST calls are mocked)."""
+
+import gzip
+import json
+import sys
+import threading
+import warnings
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+import urllib3
+
+from kbutillib.kb_uniprot_utils import KBUniProtUtils, _uniref_tsv_rows
+
+
+def _response(json_data=None, status_code=200, text="", headers=None, links=None):
+    """Build a mock requests.Response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = json_data
+    response.content = text.encode() if text else json.dumps(json_data).encode()
+    response.text = text
+    response.headers = headers or {}
+    response.links = links or {}
+    if status_code >= 400:
+        error = requests.exceptions.HTTPError(f"{status_code} error")
+        error.response = response
+        response.raise_for_status.side_effect = error
+    return response
+
+
+@pytest.fixture
+def uniprot_utils():
+    """A KBUniProtUtils instance."""
+    return KBUniProtUtils()
+
+
+class TestSession:
+    def test_requests_share_one_session(self, uniprot_utils):
+        entry = {"primaryAccession": "P12345"}
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(entry)
+        ) as get, patch("requests.get") as module_get:
+            assert uniprot_utils.get_uniprot_entry("P12345") == entry
+            assert uniprot_utils.get_uniprot_entry("P12345", fields=["sequence"])
+        assert get.call_count == 2
+        module_get.assert_not_called()
+
+    def test_https_adapter_retries_transient_errors(self, uniprot_utils):
+        adapter = uniprot_utils.session.get_adapter("https://rest.uniprot.org")
+        assert 429 in adapter.max_retries.status_forcelist
+        assert adapter.max_retries.total == 5
+
+    def test_ssl_verification_set_on_session(self, uniprot_utils):
+        assert uniprot_utils.session.verify is True
+        assert KBUniProtUtils(verify_ssl=False).session.verify is False
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response({})
+        ) as get:
+            uniprot_utils.get_uniprot_entry("P12345")
+        assert "verify" not in get.call_args.kwargs
+
+    def test_unverified_warning_silenced_only_for_uniprot_host(self):
+        InsecureRequestWarning = urllib3.exceptions.InsecureRequestWarning
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            KBUniProtUtils(verify_ssl=False)
+            for host in ("rest.uniprot.org", "example.org"):
+                warnings.warn(
+                    f"Unverified HTTPS request is being made to host '{host}'. ",
+                    InsecureRequestWarning,
+                )
+        assert [str(w.message) for w in caught] == [
+            "Unverified HTTPS request is being made to host 'example.org'. "
+        ]
+
+    def test_cache_dir_without_requests_cache_uses_plain_session(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setitem(sys.modules, "requests_cache", None)
+        utils = KBUniProtUtils(cache_dir=str(tmp_path / "cache"))
+        assert type(utils.session) is requests.Session
+        assert utils.session.get_adapter("https://rest.uniprot.org").max_retries.total == 5
+
+    def test_missing_entry_raises_value_error(self, uniprot_utils):
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(status_code=404)
+        ):
+            with pytest.raises(ValueError, match="not found"):
+                uniprot_utils.get_uniprot_entry("NOPE")
+
+
+class TestBatchUniProtInfo:
+    def test_entries_fetched_concurrently_in_order(self, uniprot_utils):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_info(uniprot_id, **kwargs):
+            # Only returns once three fetches are in flight together
+            barrier.wait()
+            assert kwargs["include_uniref_ids"] is False
+            return {"uniprot_id": uniprot_id}
+
+        ids = ["P1", "P2", "P3"]
+        with patch.object(uniprot_utils, "get_uniprot_info", side_effect=fake_info):
+            results = uniprot_utils.get_batch_uniprot_info(
+                ids, include_uniref_ids=False, max_workers=3
+            )
+        assert list(results) == ids
+        assert all("error" not in info for info in results.values())
+
+    def test_uniref_mapping_overlaps_entry_fetches(self, uniprot_utils):
+        mapping_started = threading.Event()
+
+        def fake_uniref(ids, uniref_type):
+            mapping_started.set()
+            return {uniprot_id: f"{uniref_type}_{uniprot_id}" for uniprot_id in ids}
+
+        def fake_info(uniprot_id, **kwargs):
+            # Entry fetches proceed while the mapping job is in flight
+            assert mapping_started.wait(5)
+            assert kwargs["include_uniref_ids"] is False
+            return {"uniprot_id": uniprot_id}
+
+        with patch.object(
+            uniprot_utils, "get_uniref_ids", side_effect=fake_uniref
+        ), patch.object(uniprot_utils, "get_uniprot_info", side_effect=fake_info):
+            results = uniprot_utils.get_batch_uniprot_info(["P1", "P2"])
+
+        assert results["P1"]["uniref_ids"] == "UniRef50_P1"
+        assert results["P2"]["uniref_ids"] == "UniRef50_P2"
+
+    def test_failed_entry_reported_not_raised(self, uniprot_utils):
+        def fake_info(uniprot_id, **kwargs):
+            if uniprot_id == "BAD":
+                raise ValueError("UniProt entry not found: BAD")
+            return {"uniprot_id": uniprot_id}
+
+        with patch.object(uniprot_utils, "get_uniprot_info", side_effect=fake_info):
+            results = uniprot_utils.get_batch_uniprot_info(
+                ["P1", "BAD"], include_uniref_ids=False
+            )
+        assert results["P1"] == {"uniprot_id": "P1"}
+        assert "not found" in results["BAD"]["error"]
+
+
+class TestUniProtInfo:
+    def test_sections_fetched_with_one_request(self, uniprot_utils):
+        entry = {
+            "primaryAccession": "P12345",
+            "sequence": {"value": "MKV"},
+            "comments": [
+                {
+                    "commentType": "CATALYTIC ACTIVITY",
+                    "reaction": {"reactionCrossReference": {"id": "RHEA:10000"}},
+                },
+                {
+                    "commentType": "CATALYTIC ACTIVITY",
+                    "reaction": {"reactionCrossReference": {"id": "RHEA:10000"}},
+                },
+            ],
+            "uniProtKBCrossReferences": [
+                {"database": "PDB", "id": "1ABC"},
+                {"database": "GO", "id": "GO:0003824"},
+            ],
+        }
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(entry)
+        ) as get:
+            info = uniprot_utils.get_uniprot_info("P12345", include_uniref_ids=False)
+
+        assert get.call_count == 1
+        fields = get.call_args.kwargs["params"]["fields"].split(",")
+        assert len(fields) == len(set(fields))
+        assert {"sequence", "xref_pdb", "lit_pubmed_id", "go"} <= set(fields)
+        assert info["sequence"] == "MKV"
+        assert info["rhea_ids"] == ["RHEA:10000"]
+        assert info["pdb_ids"] == ["1ABC"]
+        assert info["publications"] == []
+        assert info["annotations"] is not None
+
+        # get_rhea_ids reads the same catalytic-activity comments
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(entry)
+        ):
+            assert uniprot_utils.get_rhea_ids("P99999") == info["rhea_ids"]
+
+    def test_no_sections_makes_no_request(self, uniprot_utils):
+        with patch.object(uniprot_utils.session, "get") as get:
+            info = uniprot_utils.get_uniprot_info(
+                "P12345",
+                include_sequence=False,
+                include_annotations=False,
+                include_publications=False,
+                include_rhea_ids=False,
+                include_pdb_ids=False,
+                include_uniref_ids=False,
+            )
+        get.assert_not_called()
+        assert info["sequence"] is None
+        assert info["annotations"] is None
+
+
+class TestCaching:
+    def test_entry_cached_per_id_fields_and_format(self, uniprot_utils):
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response({"a": 1})
+        ) as get:
+            uniprot_utils.get_uniprot_entry("P1", fields=["go", "sequence"])
+            uniprot_utils.get_uniprot_entry("P1", fields=["sequence", "go"])
+            uniprot_utils.get_uniprot_entry("P1", fields=["go"])
+            uniprot_utils.get_uniprot_entry("P1", fields=["go"], format="tsv")
+        assert get.call_count == 3
+
+    def test_entry_cache_evicts_least_recently_used(self, uniprot_utils, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_uniprot_utils._ENTRY_CACHE_SIZE", 2)
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response({"a": 1})
+        ) as get:
+            for uniprot_id in ["P1", "P2", "P1", "P3", "P1", "P2"]:
+                uniprot_utils.get_uniprot_entry(uniprot_id)
+        # P2 was evicted by P3, so it is fetched twice; P1 stays hot
+        assert [c.args[0].rsplit("/", 1)[1] for c in get.call_args_list] == [
+            "P1", "P2", "P3", "P2"
+        ]
+
+    def test_mutating_result_does_not_change_cache(self, uniprot_utils):
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response({"a": {"b": 1}})
+        ):
+            first = uniprot_utils.get_uniprot_entry("P1")
+            first["a"]["b"] = 2
+            first["new"] = True
+            second = uniprot_utils.get_uniprot_entry("P1")
+            second["a"]["b"] = 3
+        assert uniprot_utils.get_uniprot_entry("P1") == {"a": {"b": 1}}
+
+    def test_failed_lookup_not_cached(self, uniprot_utils):
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(status_code=404)
+        ) as get:
+            for _ in range(2):
+                with pytest.raises(ValueError):
+                    uniprot_utils.get_uniprot_entry("NOPE")
+        assert get.call_count == 2
+
+    def test_uniref_mappings_reused_per_id(self, uniprot_utils):
+        def fake_mapping(ids, uniref_type, poll_interval, max_wait_time):
+            return {uniprot_id: f"UniRef50_{uniprot_id}" for uniprot_id in ids}
+
+        with patch.object(
+            uniprot_utils, "_run_uniref_mapping", side_effect=fake_mapping
+        ) as run:
+            batch = uniprot_utils.get_uniref_ids(["P1", "P2"])
+            single = uniprot_utils.get_uniref_ids("P2")
+            mixed = uniprot_utils.get_uniref_ids(["P1", "P3"])
+
+        assert batch == {"P1": "UniRef50_P1", "P2": "UniRef50_P2"}
+        assert single == {"P2": "UniRef50_P2"}
+        assert mixed == {"P1": "UniRef50_P1", "P3": "UniRef50_P3"}
+        assert [c.args[0] for c in run.call_args_list] == [["P1", "P2"], ["P3"]]
+
+
+class TestCoalescing:
+    def test_concurrent_identical_lookups_share_one_request(self, uniprot_utils):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return _response({"primaryAccession": "P1"})
+
+        results = []
+        with patch.object(uniprot_utils.session, "get", side_effect=slow_get) as get:
+            first = threading.Thread(
+                target=lambda: results.append(uniprot_utils.get_uniprot_entry("P1"))
+            )
+            first.start()
+            started.wait(5)
+            second = threading.Thread(
+                target=lambda: results.append(uniprot_utils.get_uniprot_entry("P1"))
+            )
+            second.start()
+            release.set()
+            first.join(5)
+            second.join(5)
+
+        assert get.call_count == 1
+        assert results == [{"primaryAccession": "P1"}] * 2
+        assert uniprot_utils._pending_entries == {}
+
+    def test_failed_lookup_clears_pending(self, uniprot_utils):
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(status_code=404)
+        ):
+            with pytest.raises(ValueError):
+                uniprot_utils.get_uniprot_entry("NOPE")
+        assert uniprot_utils._pending_entries == {}
+
+    def test_batch_fetches_duplicate_ids_once(self, uniprot_utils):
+        with patch.object(
+            uniprot_utils,
+            "get_uniprot_info",
+            side_effect=lambda uniprot_id, **kwargs: {"uniprot_id": uniprot_id},
+        ) as info:
+            results = uniprot_utils.get_batch_uniprot_info(
+                ["P1", "P2", "P1"], include_uniref_ids=False
+            )
+        assert list(results) == ["P1", "P2"]
+        assert info.call_count == 2
+
+
+class TestUniRefMapping:
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_uniprot_utils.time.sleep", lambda s: None)
+
+    def test_redirect_stops_polling_and_pages_are_followed(self, uniprot_utils):
+        page_two = "https://rest.uniprot.org/idmapping/uniref/results/J1?cursor=2"
+        responses = [
+            _response({"jobStatus": "RUNNING"}),
+            _response(status_code=303, headers={"Location": "elsewhere"}),
+            _response(
+                text="From\tCluster ID\nP1\tUniRef50_A\n",
+                links={"next": {"url": page_two}},
+            ),
+            _response(text="From\tCluster ID\nP2\tUniRef50_B\n"),
+        ]
+        with patch.object(
+            uniprot_utils.session, "post", return_value=_response({"jobId": "J1"})
+        ), patch.object(uniprot_utils.session, "get", side_effect=responses) as get:
+            mapping = uniprot_utils.get_uniref_ids(["P1", "P2", "P3"])
+
+        assert mapping == {"P1": "UniRef50_A", "P2": "UniRef50_B", "P3": None}
+        status_call, _, first_page, second_page = get.call_args_list
+        assert status_call.kwargs["allow_redirects"] is False
+        assert first_page.args[0].endswith("/idmapping/uniref/results/J1")
+        assert first_page.kwargs["params"]["size"] == 500
+        assert first_page.kwargs["params"]["format"] == "tsv"
+        assert second_page.args[0] == page_two
+        assert second_page.kwargs["params"] is None
+
+    def test_next_page_prefetched_while_parsing(self, uniprot_utils, monkeypatch):
+        page_two = "https://rest.uniprot.org/idmapping/uniref/results/J1?cursor=2"
+        second_requested = threading.Event()
+        pages = {
+            None: _response(status_code=303),
+            "first": _response(
+                text="From\tCluster ID\nP1\tUniRef50_A\n",
+                links={"next": {"url": page_two}},
+            ),
+            page_two: _response(text="From\tCluster ID\nP2\tUniRef50_B\n"),
+        }
+
+        def fake_get(url, **kwargs):
+            if url == page_two:
+                second_requested.set()
+                return pages[page_two]
+            return pages["first" if "/results/" in url else None]
+
+        parsed_before_prefetch = []
+        real_rows = _uniref_tsv_rows
+
+        def rows(content):
+            if b"P1" in content:
+                parsed_before_prefetch.append(not second_requested.wait(5))
+            return real_rows(content)
+
+        monkeypatch.setattr("kbutillib.kb_uniprot_utils._uniref_tsv_rows", rows)
+        with patch.object(
+            uniprot_utils.session, "post", return_value=_response({"jobId": "J1"})
+        ), patch.object(uniprot_utils.session, "get", side_effect=fake_get):
+            mapping = uniprot_utils.get_uniref_ids(["P1", "P2"])
+
+        assert mapping == {"P1": "UniRef50_A", "P2": "UniRef50_B"}
+        assert parsed_before_prefetch == [False]
+
+    def test_large_inputs_are_split_into_jobs(self, uniprot_utils, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_uniprot_utils._IDMAPPING_CHUNK_SIZE", 2)
+
+        def fake_job(ids, uniref_type, poll_interval, max_wait_time):
+            return {uniprot_id: f"UniRef50_{uniprot_id}" for uniprot_id in ids}
+
+        with patch.object(
+            uniprot_utils, "_run_uniref_mapping_job", side_effect=fake_job
+        ) as job:
+            mapping = uniprot_utils.get_uniref_ids(["P1", "P2", "P3", "P4", "P5"])
+
+        assert sorted(len(c.args[0]) for c in job.call_args_list) == [1, 2, 2]
+        assert mapping == {f"P{i}": f"UniRef50_P{i}" for i in range(1, 6)}
+
+    def test_failed_job_raises(self, uniprot_utils):
+        with patch.object(
+            uniprot_utils.session, "post", return_value=_response({"jobId": "J1"})
+        ), patch.object(
+            uniprot_utils.session, "get", return_value=_response({"jobStatus": "ERROR"})
+        ):
+            with pytest.raises(RuntimeError, match="J1"):
+                uniprot_utils.get_uniref_ids("P1")
+
+
+class TestUniRefPolling:
+    def _poll(self, uniprot_utils, monkeypatch, statuses, **kwargs):
+        sleeps = []
+        monkeypatch.setattr(
+            "kbutillib.kb_uniprot_utils.time.sleep", lambda s: sleeps.append(s)
+        )
+        with patch.object(
+            uniprot_utils.session, "post", return_value=_response({"jobId": "J1"})
+        ), patch.object(
+            uniprot_utils.session,
+            "get",
+            side_effect=statuses + [_response(text="From\tCluster ID\n")],
+        ):
+            uniprot_utils.get_uniref_ids("P1", **kwargs)
+        return sleeps
+
+    def test_interval_grows_up_to_cap(self, uniprot_utils, monkeypatch):
+        running = [_response({"jobStatus": "RUNNING"}) for _ in range(5)]
+        sleeps = self._poll(
+            uniprot_utils,
+            monkeypatch,
+            running + [_response({"jobStatus": "FINISHED"})],
+            poll_interval=1.0,
+        )
+        assert sleeps == [1.0, 1.5, 2.25, 3.375, 4.0, 4.0]
+
+    def test_retry_after_overrides_backoff(self, uniprot_utils, monkeypatch):
+        sleeps = self._poll(
+            uniprot_utils,
+            monkeypatch,
+            [
+                _response(status_code=429, headers={"Retry-After": "3"}),
+                _response({"jobStatus": "RUNNING"}, headers={"Retry-After": "0.5"}),
+                _response({"jobStatus": "FINISHED"}),
+            ],
+            poll_interval=1.0,
+        )
+        assert sleeps == [1.0, 3.0, 0.5]
+
+    def test_last_sleep_clipped_to_max_wait(self, uniprot_utils, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(
+            "kbutillib.kb_uniprot_utils.time.sleep", lambda s: sleeps.append(s)
+        )
+        with patch.object(
+            uniprot_utils.session, "post", return_value=_response({"jobId": "J1"})
+        ), patch.object(
+            uniprot_utils.session,
+            "get",
+            return_value=_response({"jobStatus": "RUNNING"}),
+        ):
+            with pytest.raises(TimeoutError):
+                uniprot_utils.get_uniref_ids("P1", poll_interval=1.0, max_wait_time=5.0)
+        assert sleeps == [1.0, 1.5, 2.25, 0.25]
+
+
+class TestProteinSequence:
+    FASTA = ">sp|P12345|TEST_HUMAN Test protein\nMKVLA\nAGGT\n"
+
+    def test_raw_sequence_is_fasta_body(self, uniprot_utils):
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(text=self.FASTA)
+        ) as get:
+            raw = uniprot_utils.get_protein_sequence("P12345", format="raw")
+            fasta = uniprot_utils.get_protein_sequence("P12345")
+
+        assert raw == "MKVLAAGGT"
+        assert fasta == self.FASTA
+        assert get.call_count == 1
+        assert get.call_args.kwargs["params"]["format"] == "fasta"
+
+
+class TestTsvIdLookups:
+    def test_pdb_ids_from_tsv(self, uniprot_utils):
+        tsv = "PDB\n1ABC;2DEF;\n"
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(text=tsv)
+        ) as get:
+            assert uniprot_utils.get_pdb_ids("P12345") == ["1ABC", "2DEF"]
+        assert get.call_args.kwargs["params"]["format"] == "tsv"
+
+    def test_entry_without_ids(self, uniprot_utils):
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(text="PDB\n\n")
+        ):
+            assert uniprot_utils.get_pdb_ids("P12345") == []
+
+    def test_full_pdb_info_uses_json(self, uniprot_utils):
+        entry = {
+            "uniProtKBCrossReferences": [
+                {"database": "PDB", "id": "1ABC", "properties": []}
+            ]
+        }
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response(entry)
+        ) as get:
+            refs = uniprot_utils.get_pdb_ids("P12345", full_info=True)
+        assert refs == [{"id": "1ABC", "properties": {}}]
+        assert get.call_args.kwargs["params"]["format"] == "json"
+
+
+class TestPublications:
+    def test_citation_cross_references(self, uniprot_utils):
+        entry = {
+            "references": [
+                {
+                    "citation": {
+                        "title": "A study",
+                        "journal": "J",
+                        "publicationDate": "2020",
+                        "citationCrossReferences": [
+                            {"database": "PubMed", "id": "123"},
+                            {"database": "DOI", "id": "10.1/x"},
+                            {"database": "AGRICOLA", "id": "IND1"},
+                        ],
+                    }
+                },
+                {"citation": None},
+            ]
+        }
+        assert uniprot_utils._extract_publications(entry) == [
+            {
+                "title": "A study",
+                "journal": "J",
+                "pubmed_id": "123",
+                "doi": "10.1/x",
+                "year": "2020",
+            },
+            {"title": "", "journal": "", "pubmed_id": None, "doi": None, "year": ""},
+        ]
+
+
+class TestJsonDecoding:
+    def test_orjson_used_when_available(self, uniprot_utils, monkeypatch):
+        decoder = MagicMock()
+        decoder.loads.return_value = {"primaryAccession": "P1"}
+        monkeypatch.setattr("kbutillib.kb_uniprot_utils.orjson", decoder)
+        response = _response({"primaryAccession": "P1"})
+        with patch.object(uniprot_utils.session, "get", return_value=response):
+            entry = uniprot_utils.get_uniprot_entry("P1")
+        assert entry == {"primaryAccession": "P1"}
+        decoder.loads.assert_called_once_with(response.content)
+        response.json.assert_not_called()
+
+    def test_stdlib_fallback(self, uniprot_utils, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_uniprot_utils.orjson", None)
+        with patch.object(
+            uniprot_utils.session, "get", return_value=_response({"a": 1})
+        ):
+            assert uniprot_utils.get_uniprot_entry("P1") == {"a": 1}
+
+
+class TestUniRefTsvRows:
+    def test_gzipped_page(self):
+        page = "From\tCluster ID\tSize\nP1\tUniRef50_A\t3\nP2\t\t1\n"
+        rows = list(_uniref_tsv_rows(gzip.compress(page.encode())))
+        assert rows == [("P1", "UniRef50_A"), ("P2", None)]
+
+    def test_plain_and_empty_pages(self):
+        assert list(_uniref_tsv_rows(b"From\tCluster ID\nP1\tUniRef90_X\n")) == [
+            ("P1", "UniRef90_X")
+        ]
+        assert list(_uniref_tsv_rows(b"")) == []
+
+
+class TestUniRefConditionalPolling:
+    def test_etag_sent_and_304_means_still_running(self, uniprot_utils, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(
+            "kbutillib.kb_uniprot_utils.time.sleep", lambda s: sleeps.append(s)
+        )
+        responses = [
+            _response({"jobStatus": "RUNNING"}, headers={"ETag": '"v1"'}),
+            _response(status_code=304),
+            _response(status_code=303),
+            _response(text="From\tCluster ID\nP1\tUniRef50_A\n"),
+        ]
+        with patch.object(
+            uniprot_utils.session, "post", return_value=_response({"jobId": "J1"})
+        ), patch.object(uniprot_utils.session, "get", side_effect=responses) as get:
+            assert uniprot_utils.get_uniref_ids("P1") == {"P1": "UniRef50_A"}
+
+        first, second, third = (c.kwargs["headers"] for c in get.call_args_list[:3])
+        assert "If-None-Match" not in first
+        assert second["If-None-Match"] == third["If-None-Match"] == '"v1"'
+        assert sleeps[0] == 0.25
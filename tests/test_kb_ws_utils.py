@@ -1,6 +1,9 @@
 """Unit tests for KBWSUtils workspace type management functions."""
 
+import shutil
+
 import pytest
+import requests
 from unittest.mock import Mock, patch, MagicMock
 from kbutillib.kb_ws_utils import KBWSUtils, KBWSUtilsImpl
 from kbutillib.shared_env_utils import SharedEnvUtils
@@ -392,3 +395,444 @@ class TestIntegration:
         assert 'KBaseGenomes.Genome' in result
         assert 'json_schema' in result['KBaseGenomes.Genome']
 
+
+
+class TestWsRetry:
+    """Workspace calls retry transient failures with capped, jittered backoff."""
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr("kbutillib.kb_ws_utils.time.sleep", calls.append)
+        monkeypatch.setattr("kbutillib.kb_ws_utils.random.random", lambda: 0.5)
+        return calls
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_transient_failures_back_off_exponentially(
+        self, utils_fixture, fake_ws_client, sleeps, request
+    ):
+        utils = request.getfixturevalue(utils_fixture)
+        fake_ws_client.get_objects2.side_effect = [
+            Exception("timeout"), Exception("timeout"), {"data": [{"data": {}}]}
+        ]
+        assert utils.ws_get_objects({"objects": []}) == {"data": [{"data": {}}]}
+        # base * 2**n * (1 + 0.5 * jitter)
+        assert sleeps == [1.25, 2.5]
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_last_error_raised_when_retries_exhausted(
+        self, utils_fixture, fake_ws_client, sleeps, request
+    ):
+        utils = request.getfixturevalue(utils_fixture)
+        fake_ws_client.get_objects2.side_effect = Exception("still down")
+        with pytest.raises(Exception, match="still down"):
+            utils.ws_get_objects({"objects": []})
+        assert fake_ws_client.get_objects2.call_count == utils.max_retry
+        assert len(sleeps) == utils.max_retry - 1
+
+    def test_delay_capped(self, ws_utils_prov, fake_ws_client, sleeps):
+        ws_utils_prov.max_retry = 8
+        fake_ws_client.get_objects2.side_effect = [Exception("x")] * 7 + [{"data": []}]
+        ws_utils_prov.ws_get_objects({"objects": []})
+        assert max(sleeps) == ws_utils_prov.retry_max_delay
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_permission_errors_not_retried(
+        self, utils_fixture, fake_ws_client, sleeps, request
+    ):
+        from kbutillib.installed_clients.baseclient import ServerError
+
+        utils = request.getfixturevalue(utils_fixture)
+        fake_ws_client.get_objects2.side_effect = ServerError(
+            "JSONRPCError", -32500, "User alice may not read workspace 42"
+        )
+        with pytest.raises(ServerError):
+            utils.ws_get_objects({"objects": []})
+        assert fake_ws_client.get_objects2.call_count == 1
+        assert sleeps == []
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_save_objects_not_retried(
+        self, utils_fixture, fake_ws_client, sleeps, request
+    ):
+        utils = request.getfixturevalue(utils_fixture)
+        fake_ws_client.save_objects.side_effect = Exception("timeout")
+        with pytest.raises(Exception, match="timeout"):
+            utils.save_ws_object("myobj", 12345, {}, "KBaseGenomes.Genome")
+        assert fake_ws_client.save_objects.call_count == 1
+        assert sleeps == []
+
+    def test_set_ws_retries_workspace_info(self, ws_utils_prov, fake_ws_client, sleeps):
+        info = fake_ws_client.get_workspace_info.return_value
+        fake_ws_client.get_workspace_info.side_effect = [Exception("503"), info]
+        ws_utils_prov.set_ws("test_workspace")
+        assert ws_utils_prov.ws_id == 12345
+        assert len(sleeps) == 1
+
+    def test_download_retries_shock_server_errors(
+        self, ws_utils_prov, sleeps, tmp_path
+    ):
+        ws_utils_prov.hs_client.hids_to_handles.return_value = [{"id": "node1"}]
+        meta = {"data": {"file": {"size": 3, "name": "f.txt"}, "attributes": {}}}
+
+        def response(status, json_data=None, body=b""):
+            r = MagicMock()
+            r.status_code = status
+            r.ok = status < 400
+            r.json.return_value = json_data
+            r.iter_content.return_value = [body]
+            r.__enter__.return_value = r
+            if status >= 400:
+                r.raise_for_status.side_effect = requests.HTTPError(response=r)
+            return r
+
+        replies = [response(502), response(200, meta), response(200, body=b"abc")]
+        with patch.object(ws_utils_prov._http, "get", side_effect=replies), \
+                patch.object(ws_utils_prov, "get_token", return_value="token"):
+            path = ws_utils_prov.download_blob_file("KBH_1", str(tmp_path / "out.txt"))
+
+        assert open(path, "rb").read() == b"abc"
+        assert len(sleeps) == 1
+
+
+class TestBatchedObjectFetch:
+    """get_objects/get_object_infos issue one workspace call per batch."""
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_get_objects_single_call(self, utils_fixture, fake_ws_client, request):
+        utils = request.getfixturevalue(utils_fixture)
+        fake_ws_client.get_objects2.return_value = {"data": ["a", "b"]}
+        assert utils.get_objects(["1/2/3", "obj"], ws="myws") == ["a", "b"]
+        fake_ws_client.get_objects2.assert_called_once_with(
+            {"objects": [{"ref": "1/2/3"}, {"workspace": "myws", "name": "obj"}]}
+        )
+
+    def test_get_objects_chunked(self, ws_utils_prov, fake_ws_client, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_ws_utils._WS_BATCH_SIZE", 2)
+        fake_ws_client.get_objects2.side_effect = lambda args: {
+            "data": [spec["ref"] for spec in args["objects"]]
+        }
+        refs = ["1/1", "1/2", "1/3"]
+        assert ws_utils_prov.get_objects(refs) == refs
+        assert fake_ws_client.get_objects2.call_count == 2
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_get_object_infos_single_call(self, utils_fixture, fake_ws_client, request):
+        utils = request.getfixturevalue(utils_fixture)
+        fake_ws_client.get_object_info.return_value = [["info1"], ["info2"]]
+        assert utils.get_object_infos(["1/1", "1/2"]) == [["info1"], ["info2"]]
+        assert utils.get_object_info("1/1") == ["info1"]
+        fake_ws_client.get_object_info.assert_any_call(
+            [{"ref": "1/1"}, {"ref": "1/2"}], 1
+        )
+
+    def test_get_object_returns_first(self, ws_utils_prov, fake_ws_client):
+        fake_ws_client.get_objects2.return_value = {"data": [{"data": {"id": "x"}}]}
+        assert ws_utils_prov.get_object("1/2") == {"data": {"id": "x"}}
+
+
+def _shock_response(status, json_data=None, body=b""):
+    """Build a mock Shock HTTP response usable as a context manager."""
+    r = MagicMock()
+    r.status_code = status
+    r.ok = status < 400
+    r.json.return_value = json_data
+    r.iter_content.return_value = [body]
+    r.__enter__.return_value = r
+    return r
+
+
+class TestDownloadBlobFiles:
+    """download_blob_files fans downloads out over one pooled session."""
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_downloads_all_handles_and_isolates_failures(
+        self, utils_fixture, request, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr("kbutillib.kb_ws_utils.time.sleep", lambda s: None)
+        utils = request.getfixturevalue(utils_fixture)
+        utils.hs_client.hids_to_handles.return_value = [
+            {"hid": "KBH_1", "id": "node1"},
+            {"hid": "KBH_2", "id": "node2"},
+        ]
+
+        def fake_get(url, **kwargs):
+            if "node2" in url:
+                raise ValueError("boom")
+            if url.endswith("?download_raw"):
+                return _shock_response(200, body=b"one")
+            meta = {"data": {"file": {"size": 3, "name": "one.txt"}, "attributes": {}}}
+            return _shock_response(200, meta)
+
+        out_dir = tmp_path / "out"
+        with patch.object(utils._http, "get", side_effect=fake_get), \
+                patch.object(utils, "get_token", return_value="token"):
+            paths = utils.download_blob_files(["KBH_1", "KBH_2"], str(out_dir))
+
+        utils.hs_client.hids_to_handles.assert_called_once_with(["KBH_1", "KBH_2"])
+        assert paths == {"KBH_1": str(out_dir / "KBH_1" / "one.txt"), "KBH_2": None}
+        assert (out_dir / "KBH_1" / "one.txt").read_bytes() == b"one"
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_handles_sharing_a_file_name_do_not_collide(
+        self, utils_fixture, request, tmp_path
+    ):
+        utils = request.getfixturevalue(utils_fixture)
+        utils.hs_client.hids_to_handles.return_value = [
+            {"hid": "KBH_1", "id": "node1"},
+            {"hid": "KBH_2", "id": "node2"},
+        ]
+
+        def fake_get(url, **kwargs):
+            node = url.split("/node/")[1].split("?")[0]
+            if url.endswith("?download_raw"):
+                return _shock_response(200, body=node.encode())
+            meta = {"data": {"file": {"size": 5, "name": "genome.fna"}, "attributes": {}}}
+            return _shock_response(200, meta)
+
+        out_dir = tmp_path / "out"
+        with patch.object(utils._http, "get", side_effect=fake_get), \
+                patch.object(utils, "get_token", return_value="token"):
+            paths = utils.download_blob_files(["KBH_1", "KBH_2", "KBH_1"], str(out_dir))
+
+        assert set(paths) == {"KBH_1", "KBH_2"}
+        assert paths["KBH_1"] != paths["KBH_2"]
+        assert open(paths["KBH_1"], "rb").read() == b"node1"
+        assert open(paths["KBH_2"], "rb").read() == b"node2"
+
+    def test_download_streams_in_large_chunks(self, ws_utils_prov, tmp_path):
+        ws_utils_prov.hs_client.hids_to_handles.return_value = [{"id": "node1"}]
+        meta = {"data": {"file": {"size": 3, "name": "f.txt"}, "attributes": {}}}
+        raw = _shock_response(200, body=b"abc")
+        with patch.object(
+            ws_utils_prov._http, "get", side_effect=[_shock_response(200, meta), raw]
+        ), patch.object(ws_utils_prov, "get_token", return_value="token"):
+            ws_utils_prov.download_blob_file("KBH_1", str(tmp_path / "f.txt"))
+        raw.iter_content.assert_called_once_with(chunk_size=1 << 20)
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    @pytest.mark.parametrize("json_data, text, expected", [
+        ({"error": ["Node not found"]}, "", "Node not found"),
+        (ValueError("not json"), "<html>Bad Gateway</html>", "<html>Bad Gateway</html>"),
+    ])
+    def test_shock_error_is_logged(
+        self, utils_fixture, json_data, text, expected, request, tmp_path, capsys
+    ):
+        utils = request.getfixturevalue(utils_fixture)
+        utils.hs_client.hids_to_handles.return_value = [{"id": "node1"}]
+        failed = _shock_response(404)
+        failed.text = text
+        if isinstance(json_data, Exception):
+            failed.json.side_effect = json_data
+        else:
+            failed.json.return_value = json_data
+        with patch.object(utils._http, "get", return_value=failed), \
+                patch.object(utils, "get_token", return_value="token"), \
+                patch.object(utils, "log_warning") as log_warning:
+            assert utils.download_blob_file("KBH_1", str(tmp_path / "f.txt")) is None
+        log_warning.assert_called_once_with(f"Shock node node1: {expected}")
+        assert capsys.readouterr().out == ""
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_target_directory_recreated_after_cleanup(
+        self, utils_fixture, request, tmp_path, monkeypatch
+    ):
+        utils = request.getfixturevalue(utils_fixture)
+        utils.hs_client.hids_to_handles.return_value = [{"id": "node1"}]
+        meta = {"data": {"file": {"size": 1, "name": "f.txt"}, "attributes": {}}}
+        out_dir = tmp_path / "out"
+        monkeypatch.chdir(tmp_path)
+        with patch.object(
+            utils._http, "get",
+            side_effect=lambda url, **kw: _shock_response(
+                200, None if url.endswith("?download_raw") else meta, b"x"
+            ),
+        ), patch.object(utils, "get_token", return_value="token"):
+            utils.download_blob_file("KBH_1", str(out_dir / "a.txt"))
+            shutil.rmtree(out_dir)
+            utils.download_blob_file("KBH_1", str(out_dir / "b.txt"))
+            # A bare filename has no directory to create
+            utils.download_blob_file("KBH_1", "c.txt")
+
+        assert (out_dir / "b.txt").read_bytes() == b"x"
+        assert (tmp_path / "c.txt").read_bytes() == b"x"
+
+    def test_session_is_pooled(self, ws_utils_prov):
+        adapter = ws_utils_prov._http.get_adapter("https://kbase.us")
+        assert adapter._pool_maxsize == 32
+
+
+class TestSetWsCache:
+    """set_ws memoizes id/name resolutions across workspace switches."""
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_repeat_lookups_skip_rpc(self, utils_fixture, fake_ws_client, request):
+        utils = request.getfixturevalue(utils_fixture)
+        utils.set_ws("test_workspace")
+        utils.reset_attributes()
+        for alias in ("test_workspace", 12345, "12345"):
+            utils.ws_id = utils.ws_name = None
+            utils.set_ws(alias)
+            assert (utils.ws_id, utils.ws_name) == (12345, "test_workspace")
+        assert fake_ws_client.get_workspace_info.call_count == 1
+
+    def test_cache_bounded(self, ws_utils_prov, fake_ws_client, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_ws_utils._WS_RESOLVE_CACHE_SIZE", 4)
+        fake_ws_client.get_workspace_info.side_effect = lambda ident: [
+            ident.get("id", 1), ident.get("workspace", "ws"),
+        ]
+        for name in ("a", "b", "c"):
+            ws_utils_prov.set_ws(name)
+            ws_utils_prov.ws_id
+        assert len(ws_utils_prov._ws_resolve_cache) <= 4
+        assert "c" in ws_utils_prov._ws_resolve_cache
+
+    @pytest.mark.parametrize("workspace, ident", [
+        ("42", {"id": 42}),
+        (42, {"id": 42}),
+        ("test_workspace", {"workspace": "test_workspace"}),
+        ("ws42", {"workspace": "ws42"}),
+    ])
+    def test_numeric_ids_resolved_by_id(self, ws_utils_prov, fake_ws_client, workspace, ident):
+        ws_utils_prov.set_ws(workspace)
+        ws_utils_prov.ws_id, ws_utils_prov.ws_name
+        fake_ws_client.get_workspace_info.assert_called_once_with(ident)
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    @pytest.mark.parametrize("workspace", ["42", 42])
+    def test_numeric_id_defers_name_lookup(
+        self, utils_fixture, fake_ws_client, request, workspace
+    ):
+        utils = request.getfixturevalue(utils_fixture)
+        utils.set_ws(workspace)
+        assert utils.ws_id == 42
+        fake_ws_client.get_workspace_info.assert_not_called()
+
+        utils.ws_name, utils.ws_name
+        assert fake_ws_client.get_workspace_info.call_count == 1
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_name_resolved_eagerly(self, utils_fixture, fake_ws_client, request):
+        utils = request.getfixturevalue(utils_fixture)
+        utils.set_ws("test_workspace")
+        fake_ws_client.get_workspace_info.assert_called_once_with(
+            {"workspace": "test_workspace"}
+        )
+        assert (utils.ws_id, utils.ws_name) == (12345, "test_workspace")
+        assert fake_ws_client.get_workspace_info.call_count == 1
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_unknown_workspace_error_timing(
+        self, utils_fixture, fake_ws_client, request, monkeypatch
+    ):
+        from kbutillib.installed_clients.baseclient import ServerError
+
+        monkeypatch.setattr("kbutillib.kb_ws_utils.time.sleep", lambda s: None)
+        utils = request.getfixturevalue(utils_fixture)
+        fake_ws_client.get_workspace_info.side_effect = ServerError(
+            "JSONRPCError", -32500, "No workspace with name nope exists"
+        )
+        # An unknown name fails in set_ws itself
+        with pytest.raises(ServerError):
+            utils.set_ws("nope")
+        # An unknown numeric ID only fails once its name is needed
+        utils.set_ws(999)
+        with pytest.raises(ServerError):
+            utils.ws_name
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_reset_clears_both(self, utils_fixture, fake_ws_client, request):
+        utils = request.getfixturevalue(utils_fixture)
+        utils.set_ws(42)
+        utils.reset_attributes()
+        assert (utils.ws_id, utils.ws_name) == (None, None)
+        fake_ws_client.get_workspace_info.assert_not_called()
+
+
+class TestProcessWsIds:
+    """process_ws_ids builds workspace object specs from refs, names and paths."""
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    @pytest.mark.parametrize("args, expected", [
+        (("1/2/3",), {"ref": "1/2/3"}),
+        (("obj", "ws"), {"workspace": "ws", "name": "obj"}),
+        (("obj", 7), {"wsid": 7, "name": "obj"}),
+        (("ws/obj/3", None, True), {"workspace": "ws", "name": "obj"}),
+        (("1/2/3;4/5/6",), {"to_obj_ref_path": ["1/2/3"], "ref": "4/5/6"}),
+        (("a/b;c/d;obj", "ws"), {
+            "to_obj_ref_path": ["a/b", "c/d"], "workspace": "ws", "name": "obj"
+        }),
+    ])
+    def test_specs(self, utils_fixture, args, expected, request):
+        utils = request.getfixturevalue(utils_fixture)
+        assert utils.process_ws_ids(*args) == expected
+
+
+class TestListWsObjects:
+    """list_ws_objects/iter_ws_objects page through workspace listings."""
+
+    @staticmethod
+    def _pager(total):
+        infos = [[i, f"obj{i}", "KBaseGenomes.Genome"] for i in range(1, total + 1)]
+        calls = []
+
+        def list_objects(params):
+            calls.append(dict(params))
+            after = int(params.get("startafter", "0/0").split("/")[1])
+            return [info for info in infos if info[0] > after][:2]
+
+        return list_objects, calls
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_pages_keyed_by_name(self, utils_fixture, request, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_ws_utils._WS_LIST_PAGE_SIZE", 2)
+        utils = request.getfixturevalue(utils_fixture)
+        utils._ws_client.list_objects.side_effect, calls = self._pager(5)
+
+        result = utils.list_ws_objects(12, type="KBaseGenomes.Genome")
+
+        assert list(result) == ["obj1", "obj2", "obj3", "obj4", "obj5"]
+        assert [c.get("startafter") for c in calls] == [None, "12/2", "12/4"]
+        assert all(c["ids"] == [12] and "workspaces" not in c for c in calls)
+        assert all(c["type"] == "KBaseGenomes.Genome" for c in calls)
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_iter_stops_early(self, utils_fixture, request, monkeypatch):
+        monkeypatch.setattr("kbutillib.kb_ws_utils._WS_LIST_PAGE_SIZE", 2)
+        utils = request.getfixturevalue(utils_fixture)
+        utils._ws_client.list_objects.side_effect, calls = self._pager(6)
+
+        first = next(utils.iter_ws_objects("myws", include_metadata=False))
+
+        assert first[1] == "obj1"
+        assert len(calls) == 1
+        assert calls[0]["workspaces"] == ["myws"]
+        assert calls[0]["includeMetadata"] == 0
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_empty_workspace(self, utils_fixture, request):
+        utils = request.getfixturevalue(utils_fixture)
+        utils._ws_client.list_objects.side_effect = None
+        utils._ws_client.list_objects.return_value = []
+        assert utils.list_ws_objects("myws") == {}
+
+
+class TestRefHelpers:
+    """create_ref and wsinfo_to_ref build workspace reference strings."""
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    @pytest.mark.parametrize("id_or_ref, ws, expected", [
+        ("1/2/3", "ignored", "1/2/3"),
+        ("obj", "myws", "myws/obj"),
+        (7, 12, "12/7"),
+        ("obj", 12, "12/obj"),
+    ])
+    def test_create_ref(self, utils_fixture, id_or_ref, ws, expected, request):
+        utils = request.getfixturevalue(utils_fixture)
+        assert utils.create_ref(id_or_ref, ws) == expected
+
+    @pytest.mark.parametrize("utils_fixture", ["ws_utils_prov", "ws_utils_impl_prov"])
+    def test_wsinfo_to_ref(self, utils_fixture, request):
+        utils = request.getfixturevalue(utils_fixture)
+        info = [5, "obj", "KBaseGenomes.Genome", "date", 3, "user", 12, "ws", "", 0, {}]
+        assert utils.wsinfo_to_ref(info) == "12/5/3"
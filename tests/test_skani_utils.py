@@ -0,0 +1,582 @@
+"""Tests for SKANIUtils (skani invocations are mocked)."""
+
+import gzip
+import io
+import json
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from kbutillib.skani_utils import SKANIUtils, _detect_skani
+
+SEARCH_HEADER = (
+    "Ref_file\tQuery_file\tANI\tAlign_fraction_ref\tAlign_fraction_query\t"
+    "Ref_name\tQuery_name\n"
+)
+
+
+def _fake_skani(output_text):
+    """Return a subprocess.run stand-in that writes ``output_text`` to ``-o``."""
+
+    def run(cmd, **kwargs):
+        if "-o" in cmd:
+            Path(cmd[cmd.index("-o") + 1]).write_text(output_text)
+        result = MagicMock()
+        result.returncode = 0
+        result.stderr = ""
+        return result
+
+    return run
+
+
+def _fake_popen(output_text, returncode=0, stderr=""):
+    """Return a subprocess.Popen stand-in whose stdout yields ``output_text``."""
+    calls = []
+
+    def popen(cmd, **kwargs):
+        calls.append(cmd)
+        err = kwargs.get("stderr")
+        if err is not None and stderr:
+            err.write(stderr.encode())
+        proc = MagicMock()
+        proc.stdout = io.BufferedReader(io.BytesIO(output_text.encode()))
+        proc.wait.return_value = returncode
+        return proc
+
+    popen.calls = calls
+    return popen
+
+
+@pytest.fixture
+def skani_utils(tmp_path):
+    """SKANIUtils with a temp cache file and skani marked available."""
+    with patch.object(SKANIUtils, "_check_skani_availability"):
+        utils = SKANIUtils(
+            cache_file=str(tmp_path / "skani_databases.json"),
+            config_file=False,
+            token_file=None,
+            kbase_token_file=None,
+        )
+    utils.skani_available = True
+    return utils
+
+
+@pytest.fixture
+def sketch_db(skani_utils, tmp_path):
+    """Register an (empty) sketch database named 'db'."""
+    db_dir = tmp_path / "db"
+    db_dir.mkdir()
+    skani_utils.add_skani_database("db", str(db_dir))
+    return db_dir
+
+
+@pytest.fixture
+def query_fasta(tmp_path):
+    path = tmp_path / "q1.fna"
+    path.write_text(">c1\nACGT\n")
+    return path
+
+
+class TestSketchGenomeDirectory:
+    def test_genomes_passed_as_list_file(self, skani_utils, tmp_path):
+        fasta_dir = tmp_path / "genomes"
+        fasta_dir.mkdir()
+        for name in ("g1.fna", "g2.fa", "g3.fasta.gz", "notes.txt"):
+            (fasta_dir / name).write_text(">x\nACGT\n")
+        (fasta_dir / "sub.fna").mkdir()
+        seen = {}
+
+        def run(cmd, **kwargs):
+            seen["cmd"] = cmd
+            seen["files"] = Path(cmd[cmd.index("-l") + 1]).read_text().split()
+            return _fake_skani("")(cmd, **kwargs)
+
+        with patch("subprocess.run", side_effect=run):
+            result = skani_utils.sketch_genome_directory(
+                str(fasta_dir),
+                database_name="g",
+                database_path=str(tmp_path / "db"),
+            )
+
+        assert result["success"] is True
+        assert result["genome_count"] == 3
+        assert [Path(f).name for f in seen["files"]] == [
+            "g1.fna", "g2.fa", "g3.fasta.gz"
+        ]
+        assert [g["id"] for g in result["genomes"]] == ["g1", "g2", "g3"]
+        assert not Path(seen["cmd"][seen["cmd"].index("-l") + 1]).exists()
+        assert skani_utils.get_database_info("g")["genome_count"] == 3
+
+
+    def test_unchanged_directory_is_not_resketched(self, skani_utils, tmp_path):
+        fasta_dir = tmp_path / "genomes"
+        fasta_dir.mkdir()
+        (fasta_dir / "g1.fna").write_text(">x\nACGT\n")
+        kwargs = {"database_name": "g", "database_path": str(tmp_path / "db")}
+
+        with patch("subprocess.run", side_effect=_fake_skani("")) as run:
+            first = skani_utils.sketch_genome_directory(str(fasta_dir), **kwargs)
+            second = skani_utils.sketch_genome_directory(str(fasta_dir), **kwargs)
+            # Touch without changing content: the MD5 keeps it unchanged.
+            os.utime(fasta_dir / "g1.fna", (1, 1))
+            third = skani_utils.sketch_genome_directory(str(fasta_dir), **kwargs)
+        assert first["rebuilt"] is True
+        assert second["rebuilt"] is False
+        assert third["rebuilt"] is False
+        assert run.call_count == 1
+
+        (fasta_dir / "g2.fna").write_text(">y\nACGT\n")
+        with patch("subprocess.run", side_effect=_fake_skani("")) as run:
+            fourth = skani_utils.sketch_genome_directory(str(fasta_dir), **kwargs)
+        assert fourth["rebuilt"] is True
+        assert fourth["genome_count"] == 2
+        assert run.call_count == 1
+
+    def test_returned_genomes_do_not_alias_cache(self, skani_utils, tmp_path):
+        fasta_dir = tmp_path / "genomes"
+        fasta_dir.mkdir()
+        (fasta_dir / "g1.fna").write_text(">x\nACGT\n")
+        kwargs = {"database_name": "g", "database_path": str(tmp_path / "db")}
+
+        with patch("subprocess.run", side_effect=_fake_skani("")):
+            for _ in range(2):
+                result = skani_utils.sketch_genome_directory(str(fasta_dir), **kwargs)
+                result["genomes"].append({"id": "bogus"})
+                result["genomes"][0]["id"] = "mutated"
+        assert [g["id"] for g in skani_utils.get_database_info("g")["genomes"]] == ["g1"]
+
+
+    def test_fragment_mode(self, skani_utils, tmp_path):
+        fasta_dir = tmp_path / "genomes"
+        fasta_dir.mkdir()
+        with gzip.open(fasta_dir / "mag.fna.gz", "wt") as f:
+            f.write(">c1 desc\nACGTA\nCGTAC\nG\n>c2\nTTT\n")
+        seen = {}
+
+        def run(cmd, **kwargs):
+            seen["cmd"] = cmd
+            seen["files"] = Path(cmd[cmd.index("-l") + 1]).read_text().split()
+            return _fake_skani("")(cmd, **kwargs)
+
+        with patch("subprocess.run", side_effect=run):
+            result = skani_utils.sketch_genome_directory(
+                str(fasta_dir),
+                database_name="frag",
+                database_path=str(tmp_path / "db"),
+                fragment_size=4,
+            )
+
+        assert result["success"] is True
+        assert "-i" in seen["cmd"]
+        fragment_file = tmp_path / "db" / "fragments" / "mag.fna"
+        assert seen["files"] == [str(fragment_file)]
+        assert fragment_file.read_text() == (
+            ">c1_frag1-4\nACGT\n"
+            ">c1_frag5-8\nACGT\n"
+            ">c1_frag9-11\nACG\n"
+            ">c2_frag1-3\nTTT\n"
+        )
+        assert result["genomes"][0]["id"] == "mag"
+
+
+class TestDatabaseMetadata:
+    def test_genomes_kept_out_of_cache_file(self, skani_utils, tmp_path):
+        fasta_dir = tmp_path / "genomes"
+        fasta_dir.mkdir()
+        (fasta_dir / "g1.fna").write_text(">x\nACGT\n")
+        with patch("subprocess.run", side_effect=_fake_skani("")):
+            skani_utils.sketch_genome_directory(
+                str(fasta_dir), database_name="g", database_path=str(tmp_path / "db")
+            )
+
+        cache = json.loads(skani_utils.cache_file.read_text())
+        assert "genomes" not in cache["g"]
+        assert Path(cache["g"]["genomes_file"]) == tmp_path / "db" / "genomes.json"
+        assert skani_utils.list_databases()[0]["genome_count"] == 1
+        info = skani_utils.get_database_info("g")
+        assert [g["id"] for g in info["genomes"]] == ["g1"]
+
+    def test_legacy_inline_genomes_are_split_on_write(self, skani_utils, tmp_path):
+        db_dir = tmp_path / "legacy"
+        db_dir.mkdir()
+        genomes = [{"id": "g1", "source_path": "/x/g1.fna"}]
+        skani_utils.cache_file.write_text(json.dumps(
+            {"legacy": {"path": str(db_dir), "genome_count": 1, "genomes": genomes}}
+        ))
+        assert skani_utils.get_database_info("legacy")["genomes"] == genomes
+
+        skani_utils.add_skani_database("other", str(tmp_path))
+
+        cache = json.loads(skani_utils.cache_file.read_text())
+        assert "genomes" not in cache["legacy"]
+        assert skani_utils.get_database_info("legacy")["genomes"] == genomes
+
+    def test_genome_list_parsed_once_until_changed(self, skani_utils, tmp_path):
+        db_dir = tmp_path / "db"
+        db_dir.mkdir()
+        genomes_file = db_dir / "genomes.json"
+        genomes_file.write_text(json.dumps([{"id": "g1"}]))
+        skani_utils.add_skani_database("db", str(db_dir))
+        cache = json.loads(skani_utils.cache_file.read_text())
+        cache["db"]["genomes_file"] = str(genomes_file)
+        skani_utils.cache_file.write_text(json.dumps(cache))
+
+        with patch("kbutillib.skani_utils.json.load", wraps=json.load) as load:
+            skani_utils.get_database_info("db")
+            info = skani_utils.get_database_info("db")
+            reads = [c for c in load.call_args_list if c.args[0].name == str(genomes_file)]
+            assert len(reads) == 1
+            info["genomes"][0]["id"] = "mutated"
+
+            genomes_file.write_text(json.dumps([{"id": "g1"}, {"id": "g2"}]))
+            info = skani_utils.get_database_info("db")
+        assert [g["id"] for g in info["genomes"]] == ["g1", "g2"]
+
+    def test_remove_database_deletes_files_in_background(self, skani_utils, tmp_path):
+        db_dir = tmp_path / "big_db"
+        (db_dir / "sketch_db" / "nested").mkdir(parents=True)
+        for i in range(20):
+            (db_dir / "sketch_db" / f"g{i}.sketch").write_text("x")
+        (db_dir / "sketch_db" / "nested" / "markers.bin").write_text("x")
+        (db_dir / "link").symlink_to(tmp_path)
+        skani_utils.add_skani_database("big", str(db_dir))
+
+        assert skani_utils.remove_database("big", delete_files=True) is True
+        assert not db_dir.exists()
+        for thread in skani_utils._delete_threads:
+            thread.join(timeout=10)
+        assert [p.name for p in tmp_path.iterdir() if "trash" in p.name] == []
+        assert skani_utils.get_database_info("big") is None
+
+    def test_remove_database_sweeps_stale_trash(self, skani_utils, tmp_path):
+        stale = tmp_path / f"db.trash-{'0123abcd' * 4}"
+        (stale / "sketch_db").mkdir(parents=True)
+        (stale / "sketch_db" / "g.sketch").write_text("x")
+        # Trash-like names that remove_database("db") did not create
+        unrelated = ["other_db.trash-" + "0" * 32, "db.trash-0123abcd", "db.trash-notes"]
+        for name in unrelated:
+            (tmp_path / name).mkdir()
+        db_dir = tmp_path / "db"
+        db_dir.mkdir()
+        skani_utils.add_skani_database("db", str(db_dir))
+
+        assert skani_utils.remove_database("db", delete_files=True) is True
+        assert not any(t.daemon for t in skani_utils._delete_threads)
+        for thread in skani_utils._delete_threads:
+            thread.join(timeout=10)
+        assert sorted(p.name for p in tmp_path.iterdir() if "trash" in p.name) == sorted(unrelated)
+        assert skani_utils._deleting == set()
+
+    def test_delete_tree_reports_unlink_failures(self, skani_utils, tmp_path):
+        tree = tmp_path / "db.trash-1"
+        tree.mkdir()
+        (tree / "a.sketch").write_text("x")
+        (tree / "b.sketch").write_text("x")
+
+        def unlink(path):
+            if path.endswith("a.sketch"):
+                raise PermissionError("denied")
+            os.remove(path)
+
+        with patch("kbutillib.skani_utils.os.unlink", side_effect=unlink), \
+                patch.object(skani_utils, "log_error") as log_error:
+            assert skani_utils._delete_tree(tree) is False
+        assert "1 file(s)" in log_error.call_args[0][0]
+        assert (tree / "a.sketch").exists()
+        assert not (tree / "b.sketch").exists()
+
+
+class TestSkaniAvailability:
+    def _make(self, tmp_path):
+        return SKANIUtils(
+            cache_file=str(tmp_path / "skani_databases.json"),
+            config_file=False,
+            token_file=None,
+            kbase_token_file=None,
+        )
+
+    def test_version_probe_runs_once(self, tmp_path):
+        _detect_skani.cache_clear()
+        result = MagicMock(returncode=0, stdout="skani 0.2.2\n")
+        with patch("kbutillib.skani_utils.subprocess.run", return_value=result) as run:
+            first = self._make(tmp_path)
+            second = self._make(tmp_path)
+            assert first.skani_available and second.skani_available
+            assert run.call_count == 1
+
+            second._check_skani_availability(refresh=True)
+            assert run.call_count == 2
+        _detect_skani.cache_clear()
+
+    def test_missing_executable(self, tmp_path):
+        _detect_skani.cache_clear()
+        with patch(
+            "kbutillib.skani_utils.subprocess.run", side_effect=FileNotFoundError
+        ):
+            utils = self._make(tmp_path)
+        assert utils.skani_available is False
+        _detect_skani.cache_clear()
+
+
+class TestQueryGenomes:
+    def test_parses_and_filters_hits(self, skani_utils, sketch_db, query_fasta):
+        output = SEARCH_HEADER + (
+            "/refs/r1.fna\t/q/q1.fna\t98.5\t90.0\t85.0\tr1\tq1\n"
+            "/refs/r2.fna\t/q/q1.fna\t99.5\t80.0\t75.0\tr2\tq1\n"
+            "/refs/r3.fna\t/q/q1.fna\t80.0\t10.0\t5.0\tr3\tq1\n"
+        )
+        popen = _fake_popen(output)
+        with patch("subprocess.Popen", side_effect=popen):
+            results = skani_utils.query_genomes(
+                str(query_fasta), database_name="db", min_ani=0.95
+            )
+
+        assert list(results) == ["q1"]
+        hits = results["q1"]
+        assert [h["reference"] for h in hits] == ["r2", "r1"]
+        assert hits[0]["ani"] == pytest.approx(0.995)
+        assert hits[0]["align_fraction_ref"] == pytest.approx(80.0)
+        assert hits[0]["align_fraction_query"] == pytest.approx(75.0)
+        assert hits[0]["reference_file"] == "/refs/r2.fna"
+        assert "-o" not in popen.calls[0]
+
+    def test_queries_passed_as_list_file(self, skani_utils, sketch_db, query_fasta):
+        listed = []
+
+        def popen(cmd, **kwargs):
+            listed.append(Path(cmd[cmd.index("--ql") + 1]).read_text().split())
+            return _fake_popen(SEARCH_HEADER)(cmd, **kwargs)
+
+        with patch("subprocess.Popen", side_effect=popen) as mock_popen:
+            skani_utils.query_genomes([str(query_fasta)] * 2, database_name="db")
+        cmd = mock_popen.call_args[0][0]
+        assert str(query_fasta) not in cmd
+        assert listed == [[str(query_fasta)] * 2]
+        assert not os.path.exists(cmd[cmd.index("--ql") + 1])
+
+    def test_explicit_threads_passed(self, skani_utils, sketch_db, query_fasta):
+        popen = _fake_popen(SEARCH_HEADER)
+        with patch("subprocess.Popen", side_effect=popen):
+            skani_utils.query_genomes(str(query_fasta), database_name="db", threads=3)
+        cmd = popen.calls[0]
+        assert cmd[cmd.index("-t") + 1] == "3"
+
+    def test_screen_derived_from_min_ani(self, skani_utils, sketch_db, query_fasta):
+        popen = _fake_popen(SEARCH_HEADER)
+        with patch("subprocess.Popen", side_effect=popen):
+            skani_utils.query_genomes(
+                str(query_fasta), database_name="db", min_ani=0.95, fast=True
+            )
+            skani_utils.query_genomes(str(query_fasta), database_name="db", min_ani=0.5)
+        high, low = popen.calls
+        assert high[high.index("-s") + 1] == "85"
+        assert "--fast" in high
+        assert "-s" not in low and "--fast" not in low
+
+    def test_large_output_read_in_blocks(self, skani_utils, tmp_path, monkeypatch):
+        monkeypatch.setattr("kbutillib.skani_utils._SKANI_READ_BLOCK_SIZE", 256)
+        rows = "".join(
+            f"/refs/r{i}.fna\t/q/q1.fna\t{90 + i % 10}.0\t90.0\t85.0\tr{i}\tq1\n"
+            for i in range(200)
+        )
+        output = tmp_path / "out.tsv"
+        output.write_text(SEARCH_HEADER + rows)
+        results = skani_utils._parse_skani_output(str(output), min_ani=0.99)
+        assert len(results["q1"]) == 20
+        assert all(h["ani"] == pytest.approx(0.99) for h in results["q1"])
+
+    def test_max_results(self, skani_utils, sketch_db, query_fasta):
+        output = SEARCH_HEADER + (
+            "/refs/r1.fna\t/q/q1.fna\t98.5\t90.0\t85.0\tr1\tq1\n"
+            "/refs/r2.fna\t/q/q1.fna\t99.5\t80.0\t75.0\tr2\tq1\n"
+        )
+        with patch("subprocess.Popen", side_effect=_fake_popen(output)):
+            results = skani_utils.query_genomes(
+                str(query_fasta), database_name="db", max_results=1
+            )
+        assert [h["reference"] for h in results["q1"]] == ["r2"]
+
+    def test_no_hits(self, skani_utils, sketch_db, query_fasta):
+        for output in ("", SEARCH_HEADER):
+            with patch("subprocess.Popen", side_effect=_fake_popen(output)):
+                assert skani_utils.query_genomes(
+                    str(query_fasta), database_name="db"
+                ) == {}
+
+    def test_failed_search_raises(self, skani_utils, sketch_db, query_fasta):
+        failed = _fake_popen("", returncode=1, stderr="boom")
+        with patch("subprocess.Popen", side_effect=failed):
+            with pytest.raises(RuntimeError, match="boom"):
+                skani_utils.query_genomes(str(query_fasta), database_name="db")
+
+
+class TestComputePairwiseDistances:
+    def test_parses_comparisons(self, skani_utils, tmp_path):
+        a = tmp_path / "a.fna"
+        b = tmp_path / "b.fna"
+        a.write_text(">a\nACGT\n")
+        b.write_text(">b\nACGT\n")
+        output = SEARCH_HEADER + (
+            f"{a}\t{b}\t97.0\t70.0\t60.0\ta\tb\n"
+        )
+        with patch("subprocess.run", side_effect=_fake_skani(output)):
+            comparisons = skani_utils.compute_pairwise_distances([str(a), str(b)])
+
+        assert comparisons == [
+            {
+                "genome1": "a",
+                "genome2": "b",
+                "genome1_file": str(a),
+                "genome2_file": str(b),
+                "ani": pytest.approx(0.97),
+                "align_fraction_1": 70.0,
+                "align_fraction_2": 60.0,
+            }
+        ]
+
+    def test_all_vs_all_uses_triangle(self, skani_utils, tmp_path):
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.fna"
+            path.write_text(f">{name}\nACGT\n")
+            paths.append(str(path))
+        seen = {}
+
+        def run(cmd, **kwargs):
+            seen["cmd"] = cmd
+            seen["genomes"] = Path(cmd[cmd.index("-l") + 1]).read_text().split()
+            return _fake_skani(SEARCH_HEADER)(cmd, **kwargs)
+
+        with patch("subprocess.run", side_effect=run):
+            skani_utils.compute_pairwise_distances(paths, all_vs_all=True)
+
+        assert seen["cmd"][1:3] == ["triangle", "-E"]
+        assert seen["genomes"] == paths
+        assert seen["cmd"][seen["cmd"].index("-t") + 1] == str(os.cpu_count() or 1)
+        assert not Path(seen["cmd"][seen["cmd"].index("-l") + 1]).exists()
+
+    def test_blocks_cover_every_pair_once(self, skani_utils, tmp_path):
+        paths = []
+        for name in ("a", "b", "c", "d", "e"):
+            path = tmp_path / f"{name}.fna"
+            path.write_text(f">{name}\nACGT\n")
+            paths.append(str(path))
+        pairs = []
+
+        def run(cmd, **kwargs):
+            def read(flag):
+                return Path(cmd[cmd.index(flag) + 1]).read_text().split()
+
+            rows = []
+            if cmd[1] == "triangle":
+                genomes = read("-l")
+                for i, ref in enumerate(genomes):
+                    for query in genomes[i + 1:]:
+                        rows.append((ref, query))
+            else:
+                rows = [(r, q) for q in read("--ql") for r in read("--rl")]
+            pairs.extend(rows)
+            output = SEARCH_HEADER + "".join(
+                f"{r}\t{q}\t99.0\t50.0\t50.0\tr\tq\n" for r, q in rows
+            )
+            return _fake_skani(output)(cmd, **kwargs)
+
+        with patch("subprocess.run", side_effect=run):
+            comparisons = skani_utils.compute_pairwise_distances(
+                paths, threads=4, block_size=2, all_vs_all=True
+            )
+
+        unordered = {frozenset(pair) for pair in pairs}
+        assert len(pairs) == len(unordered) == 10
+        assert len(comparisons) == 10
+
+    def test_default_compares_first_genome_with_the_rest(self, skani_utils, tmp_path):
+        paths = []
+        for name in ("a", "b", "c", "d"):
+            path = tmp_path / f"{name}.fna"
+            path.write_text(f">{name}\nACGT\n")
+            paths.append(str(path))
+        cmds = []
+
+        def run(cmd, **kwargs):
+            def read(flag):
+                return Path(cmd[cmd.index(flag) + 1]).read_text().split()
+
+            cmds.append(cmd[1])
+            output = SEARCH_HEADER + "".join(
+                f"{r}\t{q}\t99.0\t50.0\t50.0\tr\tq\n"
+                for q in read("--ql") for r in read("--rl")
+            )
+            return _fake_skani(output)(cmd, **kwargs)
+
+        with patch("subprocess.run", side_effect=run):
+            comparisons = skani_utils.compute_pairwise_distances(
+                paths, block_size=2
+            )
+
+        # As with ``skani dist a b c d``: a is the query, the rest references
+        assert cmds == ["dist", "dist"]
+        assert sorted(c["genome1"] for c in comparisons) == ["b", "c", "d"]
+        assert [c["genome2"] for c in comparisons] == ["a", "a", "a"]
+
+    def test_gzipped_genomes_use_sketch_ids(self, skani_utils, tmp_path):
+        a = tmp_path / "GCF_1.fna.gz"
+        b = tmp_path / "GCF_2.fna"
+        for path in (a, b):
+            path.write_bytes(b"")
+        output = SEARCH_HEADER + f"{b}\t{a}\t99.0\t50.0\t50.0\tr\tq\n"
+        with patch("subprocess.run", side_effect=_fake_skani(output)):
+            comparisons = skani_utils.compute_pairwise_distances([str(a), str(b)])
+
+        assert (comparisons[0]["genome1"], comparisons[0]["genome2"]) == ("GCF_2", "GCF_1")
+
+    def test_single_genome_has_no_pairs(self, skani_utils, tmp_path):
+        a = tmp_path / "a.fna"
+        a.write_text(">a\nACGT\n")
+        with patch("subprocess.run") as run:
+            assert skani_utils.compute_pairwise_distances([str(a)]) == []
+        run.assert_not_called()
+
+    def test_missing_file_raises(self, skani_utils, tmp_path):
+        present = tmp_path / "a.fna"
+        present.write_text(">a\nACGT\n")
+        missing = [str(tmp_path / "nope1.fna"), str(tmp_path / "nope2.fna")]
+        with pytest.raises(ValueError, match="File not found") as excinfo:
+            skani_utils.compute_pairwise_distances(
+                [missing[0], str(present), missing[1]]
+            )
+        assert all(path in str(excinfo.value) for path in missing)
+        assert str(present) not in str(excinfo.value)
+
+
+class TestRunSkaniStreaming:
+    """Exercise the real pipe handling with a stand-in shell script."""
+
+    @pytest.fixture
+    def script(self, tmp_path):
+        def make(body):
+            path = tmp_path / "fake_skani.sh"
+            path.write_text("#!/bin/sh\n" + body)
+            path.chmod(0o755)
+            return str(path)
+
+        return make
+
+    def test_streams_stdout_and_captures_stderr(self, skani_utils, script):
+        exe = script("printf 'a\\tb\\n'; echo warn >&2; exit 3\n")
+        result, lines = skani_utils._run_skani_streaming(
+            [exe], timeout=30, consume=lambda stream: stream.read().decode()
+        )
+        assert lines == "a\tb\n"
+        assert result.returncode == 3
+        assert result.stderr.strip() == "warn"
+
+    def test_timeout_kills_process(self, skani_utils, script):
+        exe = script("exec sleep 30\n")
+        with pytest.raises(subprocess.TimeoutExpired):
+            skani_utils._run_skani_streaming(
+                [exe], timeout=0.5, consume=lambda stream: stream.read()
+            )